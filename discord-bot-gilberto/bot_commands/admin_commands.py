@@ -7,10 +7,11 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from utils import db_stats, get_export_data
+from utils.maintenance import maintenance
 from utils.db_export import (
     build_export_csv_bytes,
     build_export_json_bytes,
-    get_export_data,
 )
 
 
@@ -51,7 +52,7 @@ def register_admin_commands(bot: commands.Bot) -> None:
 
         await interaction.response.defer(ephemeral=True)
 
-        data = get_export_data()
+        data = await get_export_data()
         if data is None:
             await interaction.followup.send(
                 "Banco de dados não encontrado. Verifique se o bot está configurado corretamente.",
@@ -86,3 +87,57 @@ def register_admin_commands(bot: commands.Bot) -> None:
             file=file,
             ephemeral=True,
         )
+
+    @bot.tree.command(
+        name="db_stats",
+        description="[Moderador] Fila e latência das operações no banco de solicitações.",
+    )
+    async def db_stats_command(interaction: discord.Interaction) -> None:
+        moderator_role = discord.utils.get(
+            interaction.guild.roles, name="Moderator"
+        )
+        if moderator_role is None:
+            await interaction.response.send_message(
+                "Configuração do servidor: role 'Moderator' não encontrada.",
+                ephemeral=True,
+            )
+            return
+        if moderator_role not in interaction.user.roles:
+            await interaction.response.send_message(
+                "Apenas moderadores podem usar este comando.",
+                ephemeral=True,
+            )
+            return
+
+        stats = db_stats()
+        embed = discord.Embed(
+            title="Banco de solicitações",
+            description=f"Operações na fila: {stats['queue_depth']}",
+            color=discord.Color.blue(),
+        )
+
+        for name, op in sorted(stats["operations"].items()):
+            embed.add_field(
+                name=name,
+                value=(
+                    f"{op['count']} chamada(s)\n"
+                    f"fila: {op['avg_wait_ms']} ms\n"
+                    f"média: {op['avg_ms']} ms · máx: {op['max_ms']} ms"
+                ),
+                inline=True,
+            )
+
+        last_run = maintenance.snapshot()["last_run"]
+        if last_run:
+            removed = ", ".join(f"{table}: {n}" for table, n in last_run["deleted"].items())
+            embed.add_field(
+                name="Última manutenção",
+                value=(
+                    f"<t:{int(last_run['started_at'])}:R> · {last_run['duration_ms']} ms\n"
+                    f"removidas: {removed} ({last_run['batches']} lote(s))\n"
+                    f"páginas livres: {last_run.get('freelist_before', '?')} → {last_run.get('freelist_after', '?')}"
+                ),
+                inline=False,
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -6,9 +6,10 @@ from utils import (
     save_request,
     update_response,
     get_request,
-    get_user_requests,
-    cleanup_old_migration_requests
+    cleanup_old_migration_requests,
+    migration_requests
 )
+from bot_commands.request_list import send_request_list
 from bot_commands.constants import (
     MIGRATION_CHANNEL_ID,
     MOD_MIGRATION_CHANNEL_ID,
@@ -45,7 +46,7 @@ def register_migration_commands(bot: commands.Bot) -> None:
         request_id = str(interaction.id)
         user_id = interaction.user.id
 
-        if save_request(request_id, user_id, mensagem):
+        if await save_request(request_id, user_id, mensagem):
             print(
                 f"[INFO] Solicitação de migração {request_id} salva no banco")
 
@@ -87,66 +88,21 @@ def register_migration_commands(bot: commands.Bot) -> None:
         """
           Comando para usuários verem todas as suas solicitações e status
         """
-
-        user_id = interaction.user.id
-        requests = get_user_requests(user_id)
-
-        if not requests:
-            await interaction.response.send_message(
-                "Você ainda não possui solicitações de migração.",
-                ephemeral=True
-            )
-            return
-
-        # Cria embed com lista de solicitações
-        embed = discord.Embed(
+        await send_request_list(
+            interaction,
+            migration_requests,
             title="Suas Solicitações de Migração",
-            description=f"Total: {len(requests)} solicitação(ões)",
-            color=OLIST_BLUE
+            empty_message="Você ainda não possui solicitações de migração.",
+            detail_command="/ver_solicitacao",
         )
 
-        # Limita a 10 mais recentes para não exceder limite do Discord
-        for req in requests[:10]:
-            status_emoji = "✅" if req["status"] == "ok" else "⏳"
-            status_text = "Respondida" if req["status"] == "ok" else "Pendente"
-
-            # Preview da mensagem (limita a 50 caracteres)
-            message_preview = req.get("message", "N/A")
-            if len(message_preview) > 50:
-                message_preview = message_preview[:50] + "..."
-
-            field_value = f"**Mensagem:** {message_preview}\n"
-            field_value += f"**Status:** {status_emoji} {status_text}\n"
-            field_value += f"**Criada em:** {req['created_at']}\n"
-
-            if req["answered_at"]:
-                field_value += f"**Respondida em:** {req['answered_at']}\n"
-
-            if req["response"]:
-                # Limita resposta a 100 caracteres no campo
-                response_preview = req["response"][:100] + \
-                    "..." if len(req["response"]) > 100 else req["response"]
-                field_value += f"**Resposta:** {response_preview}"
-
-            embed.add_field(
-                name=f"ID: `{req['request_id']}`",
-                value=field_value,
-                inline=False
-            )
-
-        if len(requests) > 10:
-            embed.set_footer(
-                text=f"Mostrando 10 de {len(requests)} solicitações. Use /ver_solicitacao <id> para ver detalhes completos.")
-
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
     @bot.tree.command(name="ver_solicitacao", description="Ver detalhes completos de uma solicitação específica")
     @app_commands.describe(request_id="ID da solicitação (use /ver_solicitacoes para ver os IDs)")
     async def ver_solicitacao(interaction: discord.Interaction, request_id: str) -> None:
         """
         Comando para usuários verem detalhes completos de uma solicitação específica
         """
-        request_data = get_request(request_id)
+        request_data = await get_request(request_id)
 
         if not request_data:
             await interaction.response.send_message(
@@ -243,7 +199,7 @@ def register_migration_commands(bot: commands.Bot) -> None:
         # Moderadores respondem as requests já concluidas
         status_value = status.value if isinstance(
             status, app_commands.Choice) else status
-        if update_response(request_id, resposta, status_value):
+        if await update_response(request_id, resposta, status_value):
             await interaction.response.send_message(
                 f"Resposta registrada para solicitação {request_id} com status '{status_value}'",
                 ephemeral=True
@@ -270,7 +226,7 @@ def register_migration_commands(bot: commands.Bot) -> None:
             )
             return
 
-        request_data = get_request(request_id)
+        request_data = await get_request(request_id)
 
         if request_data:
             embed = discord.Embed(
@@ -369,7 +325,7 @@ def register_migration_commands(bot: commands.Bot) -> None:
         status_list = [status_value]
 
         # Executa a limpeza
-        deleted = cleanup_old_migration_requests(
+        deleted = await cleanup_old_migration_requests(
             days=dias, status_list=status_list)
 
         # Cria embed com resultado
@@ -6,9 +6,10 @@ from utils import (
     save_reindex_request,
     update_reindex_response,
     get_reindex_request,
-    get_user_reindex_requests,
-    cleanup_old_reindex_requests
+    cleanup_old_reindex_requests,
+    reindex_requests
 )
+from bot_commands.request_list import send_request_list
 from bot_commands.constants import (
     REINDEX_CHANNEL_ID,
     MOD_REINDEX_CHANNEL_ID,
@@ -45,7 +46,7 @@ def register_reindex_commands(bot: commands.Bot) -> None:
         request_id = str(interaction.id)
         user_id = interaction.user.id
 
-        if save_reindex_request(request_id, user_id, mensagem):
+        if await save_reindex_request(request_id, user_id, mensagem):
             print(f"[INFO] Solicitação de reindex {request_id} salva no banco")
         else:
             print(
@@ -92,65 +93,21 @@ def register_reindex_commands(bot: commands.Bot) -> None:
         """
           Comando para usuários verem todas as suas solicitações de reindex e status
         """
-        user_id = interaction.user.id
-        requests = get_user_reindex_requests(user_id)
-
-        if not requests:
-            await interaction.response.send_message(
-                "Você ainda não possui solicitações de reindex.",
-                ephemeral=True
-            )
-            return
-
-        # Cria embed com lista de solicitações
-        embed = discord.Embed(
+        await send_request_list(
+            interaction,
+            reindex_requests,
             title="Suas Solicitações de Reindex",
-            description=f"Total: {len(requests)} solicitação(ões)",
-            color=OLIST_BLUE
+            empty_message="Você ainda não possui solicitações de reindex.",
+            detail_command="/ver_reindexacao",
         )
 
-        # Limita a 10 mais recentes para não exceder limite do Discord
-        for req in requests[:10]:
-            status_emoji = "✅" if req["status"] == "ok" else "⏳"
-            status_text = "Respondida" if req["status"] == "ok" else "Pendente"
-
-            # Preview da mensagem (limita a 50 caracteres)
-            message_preview = req.get("message", "N/A")
-            if len(message_preview) > 50:
-                message_preview = message_preview[:50] + "..."
-
-            field_value = f"**Mensagem:** {message_preview}\n"
-            field_value += f"**Status:** {status_emoji} {status_text}\n"
-            field_value += f"**Criada em:** {req['created_at']}\n"
-
-            if req["answered_at"]:
-                field_value += f"**Respondida em:** {req['answered_at']}\n"
-
-            if req["response"]:
-                # Limita resposta a 100 caracteres no campo
-                response_preview = req["response"][:100] + \
-                    "..." if len(req["response"]) > 100 else req["response"]
-                field_value += f"**Resposta:** {response_preview}"
-
-            embed.add_field(
-                name=f"ID: `{req['request_id']}`",
-                value=field_value,
-                inline=False
-            )
-
-        if len(requests) > 10:
-            embed.set_footer(
-                text=f"Mostrando 10 de {len(requests)} solicitações. Use /ver_reindexacao <id> para ver detalhes completos.")
-
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
     @bot.tree.command(name="ver_reindexacao", description="Ver detalhes completos de uma solicitação de reindex específica")
     @app_commands.describe(request_id="ID da solicitação (use /ver_reindexacoes para ver os IDs)")
     async def ver_reindexacao(interaction: discord.Interaction, request_id: str) -> None:
         """
         Comando para usuários verem detalhes completos de uma solicitação de reindex específica
         """
-        request_data = get_reindex_request(request_id)
+        request_data = await get_reindex_request(request_id)
 
         if not request_data:
             await interaction.response.send_message(
@@ -247,7 +204,7 @@ def register_reindex_commands(bot: commands.Bot) -> None:
         # Moderadores respondem as requests de reindex
         status_value = status.value if isinstance(
             status, app_commands.Choice) else status
-        if update_reindex_response(request_id, resposta, status_value):
+        if await update_reindex_response(request_id, resposta, status_value):
             await interaction.response.send_message(
                 f"Resposta registrada para solicitação de reindex {request_id} com status '{status_value}'",
                 ephemeral=True
@@ -274,7 +231,7 @@ def register_reindex_commands(bot: commands.Bot) -> None:
             )
             return
 
-        request_data = get_reindex_request(request_id)
+        request_data = await get_reindex_request(request_id)
 
         if request_data:
             embed = discord.Embed(
@@ -373,7 +330,7 @@ def register_reindex_commands(bot: commands.Bot) -> None:
         status_list = [status_value]
 
         # Executa a limpeza
-        deleted = cleanup_old_reindex_requests(
+        deleted = await cleanup_old_reindex_requests(
             days=dias, status_list=status_list)
 
         # Cria embed com resultado
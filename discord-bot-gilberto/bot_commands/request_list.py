@@ -0,0 +1,156 @@
+"""
+Listagem paginada das solicitações do usuário (/ver_solicitacoes e /ver_reindexacoes).
+Cada página é buscada sob demanda por keyset (RequestRepository.list_page); os botões
+Anterior/Próxima trazem só a página pedida, sem carregar o histórico inteiro. O número da
+página e o total vêm das contagens feitas junto com ela (não se perdem se linhas entrarem
+ou saírem entre um clique e outro).
+"""
+from contextlib import suppress
+from typing import Optional
+
+import discord
+
+from bot_commands.constants import OLIST_BLUE
+from utils.database import RequestPage
+from utils.repository import RequestRepository
+
+PAGE_SIZE = 10
+# Tempo (s) em que os botões continuam respondendo
+PAGE_TIMEOUT = 300
+
+
+def _request_field(req) -> str:
+    status_emoji = "✅" if req["status"] == "ok" else "⏳"
+    status_text = "Respondida" if req["status"] == "ok" else "Pendente"
+
+    # Preview da mensagem (limita a 50 caracteres)
+    message_preview = req.get("message", "N/A")
+    if len(message_preview) > 50:
+        message_preview = message_preview[:50] + "..."
+
+    field_value = f"**Mensagem:** {message_preview}\n"
+    field_value += f"**Status:** {status_emoji} {status_text}\n"
+    field_value += f"**Criada em:** {req['created_at']}\n"
+
+    if req["answered_at"]:
+        field_value += f"**Respondida em:** {req['answered_at']}\n"
+
+    if req["response"]:
+        # Limita resposta a 100 caracteres no campo
+        response_preview = req["response"][:100] + \
+            "..." if len(req["response"]) > 100 else req["response"]
+        field_value += f"**Resposta:** {response_preview}"
+
+    return field_value
+
+
+class RequestListView(discord.ui.View):
+    """
+      Embed de uma página e botões de navegação. Só quem abriu a listagem pode paginar.
+    """
+
+    def __init__(
+        self,
+        requests: RequestRepository,
+        user_id: int,
+        title: str,
+        detail_command: str,
+    ) -> None:
+        super().__init__(timeout=PAGE_TIMEOUT)
+        self.requests = requests
+        self.user_id = user_id
+        self.title = title
+        self.detail_command = detail_command
+        self.page: Optional[RequestPage] = None
+        # Interação do comando: a listagem é a resposta dela (editada no on_timeout)
+        self.interaction: Optional[discord.Interaction] = None
+
+    async def load(self, before: Optional[tuple] = None, after: Optional[tuple] = None) -> RequestPage:
+        self.page = await self.requests.list_page(self.user_id, PAGE_SIZE, before, after)
+        # Página vazia (linhas removidas entre cliques) não tem cursor para seguir
+        self.previous_page.disabled = not self.page.has_newer or self.page.first_key is None
+        self.next_page.disabled = not self.page.has_older or self.page.last_key is None
+        return self.page
+
+    def build_embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title=self.title,
+            description=f"Total: {self.page.total} solicitação(ões)",
+            color=OLIST_BLUE
+        )
+
+        for req in self.page.rows:
+            embed.add_field(
+                name=f"ID: `{req['request_id']}`",
+                value=_request_field(req),
+                inline=False
+            )
+
+        if self.page.total > PAGE_SIZE:
+            # Posição pelo cursor: mais recentes antes desta página e mais antigas depois dela
+            older = self.page.total - self.page.newer_count - len(self.page.rows)
+            page_number = -(-self.page.newer_count // PAGE_SIZE) + 1
+            pages = page_number + max(0, -(-older // PAGE_SIZE))
+            embed.set_footer(
+                text=f"Página {page_number} de {pages}. Use {self.detail_command} <id> para ver detalhes completos.")
+
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id == self.user_id:
+            return True
+
+        await interaction.response.send_message(
+            "Esta listagem pertence a outro usuário. Use o comando para ver as suas solicitações.",
+            ephemeral=True
+        )
+        return False
+
+    async def on_timeout(self) -> None:
+        # Botões expirados desabilitados, em vez de "Esta interação falhou" a cada clique
+        for item in self.children:
+            item.disabled = True
+
+        if self.interaction is not None:
+            with suppress(discord.HTTPException):
+                await self.interaction.edit_original_response(view=self)
+
+    async def _show(self, interaction: discord.Interaction, before=None, after=None) -> None:
+        await self.load(before, after)
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Anterior", emoji="⬅️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, after=self.page.first_key)
+
+    @discord.ui.button(label="Próxima", emoji="➡️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, before=self.page.last_key)
+
+
+async def send_request_list(
+    interaction: discord.Interaction,
+    requests: RequestRepository,
+    title: str,
+    empty_message: str,
+    detail_command: str,
+) -> None:
+    """
+      Responde (ephemeral) com a primeira página das solicitações do usuário.
+    """
+    view = RequestListView(requests, interaction.user.id, title, detail_command)
+    view.interaction = interaction
+    page = await view.load()
+
+    if not page.rows:
+        await interaction.response.send_message(empty_message, ephemeral=True)
+        view.stop()
+        return
+
+    # Uma página só: sem botões
+    if page.total <= PAGE_SIZE:
+        await interaction.response.send_message(embed=view.build_embed(), ephemeral=True)
+        view.stop()
+        return
+
+    await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
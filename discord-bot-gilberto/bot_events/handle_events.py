@@ -9,11 +9,8 @@ from discord import Message
 from discord.ext import commands
 
 # IMPORT UTILS TO MANAGE SQLITE3 DATABASE
-from utils import (
-    init_database,
-    cleanup_old_migration_requests,
-    cleanup_old_reindex_requests
-)
+from utils import init_database
+from utils.maintenance import maintenance
 
 # IDs dos canais onde apenas slash commands são permitidos
 SLASH_COMMANDS_ONLY_CHANNELS: Final[list[int]] = [
@@ -56,11 +53,10 @@ def set_events(bot: commands.Bot, *, log_file_path: Path | None = None) -> None:
         """
 
         # Inicializa banco de dados
-        init_database()
+        await init_database()
 
-        # Limpa solicitações antigas (30 dias atrás)
-        cleanup_old_migration_requests(30)
-        cleanup_old_reindex_requests(30)
+        # Limpeza periódica das solicitações antigas (em lotes, com optimize e vacuum incremental)
+        maintenance.start()
 
         print(f'{bot.user.name} está online!')
         print(f'Bot ID: {bot.user.id}')
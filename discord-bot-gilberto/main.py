@@ -11,6 +11,9 @@ from discord.ext import commands
 # MODULES IMPORTS
 from bot_events import handle_events
 from bot_commands import handle_commands
+from utils.database import close_connection
+from utils.db_worker import db_worker
+from utils.maintenance import maintenance
 
 # STEP 0: LOAD DISCORD TOKEN
 load_dotenv()
@@ -24,11 +27,20 @@ handler = logging.FileHandler(
     filename=str(log_file_path), encoding='utf-8', mode='a'
 )
 
+class GilbertoBot(commands.Bot):
+    async def close(self) -> None:
+        # Encerra a manutenção e processa o que restou na fila do banco antes de desligar
+        await maintenance.stop()
+        await db_worker.stop()
+        close_connection()
+        await super().close()
+
+
 # STEP 1: BOT SETUP
 intents: Intents = Intents.default()
 intents.message_content = True
 intents.members = True
-bot: commands.Bot = commands.Bot(
+bot: commands.Bot = GilbertoBot(
     command_prefix='!',  # Mantido para compatibilidade somente
     intents=intents,
 )
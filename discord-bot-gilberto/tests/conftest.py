@@ -6,6 +6,8 @@ from pathlib import Path
 
 import pytest
 
+from utils import database
+
 
 # Schema igual ao utils/database.py
 MIGRATION_REQUESTS_SCHEMA = """
@@ -33,6 +35,14 @@ CREATE TABLE IF NOT EXISTS reindex_requests (
 """
 
 
+@pytest.fixture(autouse=True)
+def _fresh_connection():
+    """A conexão do banco é persistente: cada teste começa e termina sem ela."""
+    database.close_connection()
+    yield
+    database.close_connection()
+
+
 @pytest.fixture
 def temp_db(tmp_path):
     """Banco SQLite temporário com as tabelas migration_requests e reindex_requests."""
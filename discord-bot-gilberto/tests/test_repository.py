@@ -0,0 +1,113 @@
+"""
+Testes da API assíncrona do banco (utils.repository sobre o DbWorker).
+"""
+import asyncio
+import sqlite3
+
+from utils import database, repository
+from utils.maintenance import Maintenance
+
+
+def test_operacoes_rodam_na_thread_do_banco(temp_db, monkeypatch):
+    monkeypatch.setattr(database, "DB_FILE", temp_db)
+
+    async def fluxo():
+        assert await repository.save_request("1", 42, "migrar loja")
+        assert await repository.update_response("1", "feito", "ok")
+        return await repository.get_request("1")
+
+    request = asyncio.run(fluxo())
+
+    assert request["status"] == "ok"
+    assert request["response"] == "feito"
+
+    stats = repository.db_stats()
+    assert stats["queue_depth"] == 0
+    assert {"migration_requests.save", "migration_requests.update_response",
+            "migration_requests.get"} <= set(stats["operations"])
+
+
+def test_novo_tipo_de_solicitacao_usa_o_mesmo_store(temp_db, monkeypatch):
+    monkeypatch.setattr(database, "DB_FILE", temp_db)
+    store = database.RequestStore("outras_requests", "solicitação de teste")
+
+    with database.get_connection() as conn:
+        store.create_table(conn)
+
+    assert store.save("1", 7, "primeira")
+    assert store.save("2", 7, "segunda")
+    assert store.update_response("1", "feita", "ok")
+    assert not store.update_response("1", "x", "invalido")
+
+    row = store.get("1")
+    assert isinstance(row, database.RequestRow)
+    assert (row["status"], row.response, row.get("user_id")) == ("ok", "feita", 7)
+    assert row.answered_at is not None
+    assert {r.request_id for r in store.list_page(7).rows} == {"1", "2"}
+    assert store.pending_count() == 1
+    assert store.delete("2") and store.get("2") is None
+
+
+def test_manutencao_remove_em_lotes_as_respondidas_antigas(temp_db, monkeypatch):
+    monkeypatch.setattr(database, "DB_FILE", temp_db)
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO migration_requests (request_id, user_id, message, status, answered_at) "
+        "VALUES (?, 1, 'm', ?, julianday('now', ?))",
+        [(f"old-{i}", "ok", "-40 days") for i in range(5)]
+        + [("recent", "ok", "-1 days"), ("pending-old", "pending", "-40 days")],
+    )
+    conn.commit()
+    conn.close()
+
+    maintenance = Maintenance(retention_days=30, batch_size=2, batch_pause=0)
+    last_run = asyncio.run(maintenance.run_once())
+
+    assert last_run["deleted"] == {"migration_requests": 5, "reindex_requests": 0}
+    assert last_run["batches"] == 3
+    assert "freelist_after" in last_run
+
+    conn = sqlite3.connect(temp_db)
+    remaining = {row[0] for row in conn.execute("SELECT request_id FROM migration_requests")}
+    conn.close()
+    assert remaining == {"recent", "pending-old"}
+
+
+def test_listagem_paginada_por_keyset(temp_db, monkeypatch):
+    monkeypatch.setattr(database, "DB_FILE", temp_db)
+    database.init_database()
+    conn = sqlite3.connect(temp_db)
+    conn.executemany(
+        "INSERT INTO reindex_requests (request_id, user_id, message, created_at) "
+        "VALUES (?, 7, 'm', julianday('now', ?))",
+        [(f"r{i:02d}", f"-{i} hours") for i in range(25)],
+    )
+    conn.execute("INSERT INTO reindex_requests (request_id, user_id, message) VALUES ('x', 8, 'm')")
+    conn.commit()
+    conn.close()
+
+    async def fluxo():
+        requests = repository.reindex_requests
+        first = await requests.list_page(7, 10)
+        second = await requests.list_page(7, 10, before=first.last_key)
+        third = await requests.list_page(7, 10, before=second.last_key)
+        back = await requests.list_page(7, 10, after=third.first_key)
+        return await requests.count_by_user(7), first, second, third, back
+
+    total, first, second, third, back = asyncio.run(fluxo())
+
+    assert total == 25
+    assert [r.request_id for r in first.rows] == [f"r{i:02d}" for i in range(10)]
+    assert (first.has_newer, first.has_older) == (False, True)
+    assert [r.request_id for r in third.rows] == [f"r{i:02d}" for i in range(20, 25)]
+    assert (third.has_newer, third.has_older) == (True, False)
+    assert [r.request_id for r in back.rows] == [r.request_id for r in second.rows]
+    assert (second.newer_count, third.newer_count, third.total) == (10, 20, 25)
+
+    with database.get_connection() as conn:
+        # Convertido uma vez no init_database (a manutenção só roda o incremental_vacuum)
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + database.REQUEST_STORES["reindex"]._older_page_sql,
+            (7, 0, "", 11)))
+    assert "idx_reindex_requests_user_created" in plan
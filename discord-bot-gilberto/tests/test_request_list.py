@@ -0,0 +1,64 @@
+"""
+Testes da listagem paginada (/ver_solicitacoes e /ver_reindexacoes).
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from bot_commands.request_list import RequestListView
+from utils.database import RequestPage, RequestRow
+
+
+def _interaction(user_id):
+    interaction = MagicMock()
+    interaction.user.id = user_id
+    interaction.response.send_message = AsyncMock()
+    interaction.edit_original_response = AsyncMock()
+    return interaction
+
+
+def test_outro_usuario_recebe_aviso_e_botoes_expiram_desabilitados():
+    async def fluxo():
+        requests = MagicMock()
+        requests.list_page = AsyncMock(return_value=RequestPage(
+            [RequestRow("1", 7, "m", "pending", None, "2026-01-01", None)],
+            (1.0, "1"), (1.0, "1"), False, True))
+
+        view = RequestListView(requests, 7, "Título", "/ver_solicitacao")
+        view.interaction = _interaction(7)
+        await view.load()
+
+        other = _interaction(8)
+        allowed = await view.interaction_check(other)
+
+        await view.on_timeout()
+        return view, other, allowed
+
+    view, other, allowed = asyncio.run(fluxo())
+
+    assert allowed is False
+    assert other.response.send_message.call_args.kwargs["ephemeral"] is True
+    assert all(item.disabled for item in view.children)
+    view.interaction.edit_original_response.assert_awaited_once_with(view=view)
+
+
+def test_pagina_vem_do_cursor_e_pagina_vazia_nao_pagina():
+    async def fluxo():
+        rows = [RequestRow(str(i), 7, "m", "ok", None, "2026-01-01", None) for i in range(10)]
+        requests = MagicMock()
+        requests.list_page = AsyncMock(side_effect=[
+            # Segunda página de 26 (uma linha nova entrou antes do clique)
+            RequestPage(rows, (2.0, "0"), (1.0, "9"), True, True, newer_count=11, total=26),
+            RequestPage([], None, None, True, False, newer_count=0, total=26),
+        ])
+
+        view = RequestListView(requests, 7, "Título", "/ver_solicitacao")
+        await view.load(before=(3.0, "x"))
+        footer = view.build_embed().footer.text
+
+        await view.load(before=(1.0, "9"))
+        return view, footer
+
+    view, footer = asyncio.run(fluxo())
+
+    assert footer.startswith("Página 3 de 4.")
+    assert view.previous_page.disabled and view.next_page.disabled
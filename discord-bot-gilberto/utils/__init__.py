@@ -1,9 +1,12 @@
-from utils.database import (
+# API assíncrona (executa utils.database na thread do DbWorker); os callers fazem await
+from utils.repository import (
     init_database,
+    migration_requests,
+    reindex_requests,
     save_request,
     update_response,
     get_request,
-    get_user_requests,
+    count_user_requests,
     delete_request,
     cleanup_old_migration_requests,
     get_pending_requests_count,
@@ -11,17 +14,21 @@ from utils.database import (
     save_reindex_request,
     update_reindex_response,
     get_reindex_request,
-    get_user_reindex_requests,
+    count_user_reindex_requests,
     delete_reindex_request,
-    cleanup_old_reindex_requests
+    cleanup_old_reindex_requests,
+    get_export_data,
+    db_stats
 )
 
 __all__ = [
     'init_database',
+    'migration_requests',
+    'reindex_requests',
     'save_request',
     'update_response',
     'get_request',
-    'get_user_requests',
+    'count_user_requests',
     'delete_request',
     'cleanup_old_migration_requests',
     'get_pending_requests_count',
@@ -29,7 +36,9 @@ __all__ = [
     'save_reindex_request',
     'update_reindex_response',
     'get_reindex_request',
-    'get_user_reindex_requests',
+    'count_user_reindex_requests',
     'delete_reindex_request',
-    'cleanup_old_reindex_requests'
+    'cleanup_old_reindex_requests',
+    'get_export_data',
+    'db_stats'
 ]
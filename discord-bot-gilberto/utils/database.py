@@ -4,6 +4,7 @@ from typing import Optional, Dict
 from datetime import datetime, timedelta
 import contextlib
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,552 +13,501 @@ DB_FILE = Path(os.getenv("BOT_DB_PATH", "bot_data.db"))
 DB_TIMEOUT = 5.0  # Timeout de 5 segundos para evitar locks
 
 
-@contextlib.contextmanager
-def get_connection():
-    """
-    Context manager que garante fechamento da conexão mesmo em caso de erro.
-    Faz commit automático em caso de sucesso e rollback em caso de exceção.
-    """
-    conn = sqlite3.connect(DB_FILE, timeout=DB_TIMEOUT)
-    try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+# Statements preparados mantidos pela conexão (todas as tabelas de solicitações reutilizam os mesmos SQL)
+DB_STATEMENT_CACHE = 64
 
+# Conexão única do processo (aberta no primeiro uso); o lock garante um único escritor por vez
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[Path] = None
+_lock = threading.RLock()
 
-def init_database() -> None:
-    """
-      Inicializa o banco de dados criando as tabelas se não existirem.
-      Deve ser chamado no evento on_ready.
-    """
-    try:
-        with get_connection() as conn:
-            # Tabela para solicitações de migração (Launcher)
-            conn.execute("""
-              CREATE TABLE IF NOT EXISTS migration_requests (
-                request_id TEXT PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                message TEXT NOT NULL,
-                status TEXT DEFAULT 'pending',
-                response TEXT,
-                created_at REAL DEFAULT (julianday('now')),
-                answered_at REAL
-              )
-            """)
-
-            # Tabela para solicitações de reindex
-            conn.execute("""
-              CREATE TABLE IF NOT EXISTS reindex_requests (
-                request_id TEXT PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                message TEXT NOT NULL,
-                status TEXT DEFAULT 'pending',
-                response TEXT,
-                created_at REAL DEFAULT (julianday('now')),
-                answered_at REAL
-              )
-            """)
-
-        print(f"[DATABASE] banco de dados inicializado: {DB_FILE}")
-
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao inicializar banco: {e}")
 
+def _open_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        DB_FILE,
+        timeout=DB_TIMEOUT,
+        check_same_thread=False,
+        cached_statements=DB_STATEMENT_CACHE,
+    )
+    # WAL: leituras não bloqueiam a escrita; NORMAL só faz fsync no checkpoint
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
 
-# ============================================================================
-# FUNÇÕES PARA MIGRATION REQUESTS
-# ============================================================================
 
-def get_request(request_id: str) -> Optional[Dict]:
+@contextlib.contextmanager
+def get_connection():
     """
-      Busca uma solicitação pelo ID.
-
-      Args:
-          request_id: ID da solicitação
-
-      Returns:
-          Dicionário com dados da solicitação ou None se não encontrada
+    Context manager sobre a conexão persistente (WAL, synchronous=NORMAL).
+    Serializa o acesso entre threads, faz commit automático em caso de sucesso
+    e rollback em caso de exceção. A conexão não é fechada ao sair.
     """
-    try:
-        with get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT user_id, message, status, response FROM migration_requests WHERE request_id = ?",
-                (request_id,)
-            )
-            row = cursor.fetchone()
-
-            if row:
-                return {
-                    "user_id": row["user_id"],
-                    "message": row["message"],
-                    "status": row["status"],
-                    "response": row["response"]
-                }
-            return None
+    global _conn, _conn_path
 
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao buscar solicitação: {e}")
-        return None
+    with _lock:
+        # DB_FILE trocado (testes, script de export): reabre no novo arquivo
+        if _conn is not None and _conn_path != DB_FILE:
+            close_connection()
 
+        if _conn is None:
+            _conn = _open_connection()
+            _conn_path = DB_FILE
 
-def get_user_requests(user_id: int) -> list[Dict]:
-    """
-      Busca todas as solicitações de um usuário específico.
+        try:
+            yield _conn
+            _conn.commit()
+        except Exception:
+            _conn.rollback()
+            raise
 
-      Args:
-          user_id: ID do usuário
 
-      Returns:
-          Lista de dicionários com dados das solicitações, ordenadas por data (mais recente primeiro)
+def close_connection() -> None:
     """
-    try:
-        with get_connection() as conn:
-            conn.row_factory = sqlite3.Row  # Permite acesso por nome
-            cursor = conn.execute(
-                """
-              SELECT
-                request_id,
-                message,
-                status,
-                response,
-                datetime(created_at, 'localtime') as created_at,
-                datetime(answered_at, 'localtime') as answered_at
-              FROM migration_requests
-              WHERE user_id = ?
-              ORDER BY created_at DESC
-            """,
-                (user_id,)
-            )
-
-            rows = cursor.fetchall()
+      Fecha a conexão persistente (chamado no encerramento do bot).
+    """
+    global _conn, _conn_path
 
-            return [
-                {
-                    "request_id": row["request_id"],
-                    "message": row["message"],
-                    "status": row["status"],
-                    "response": row["response"],
-                    "created_at": row["created_at"],
-                    "answered_at": row["answered_at"]
-                }
-                for row in rows
-            ]
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+            _conn_path = None
 
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao buscar solicitações do usuário: {e}")
-        return []
 
-
-def delete_request(request_id: str) -> bool:
+class RequestRow:
     """
-      Remove uma solicitação do banco de dados.
-      Útil quando o usuário já verificou a resposta.
-
-      Args:
-          request_id: ID da solicitação
-
-      Returns:
-          True se removeu com sucesso, False caso contrário
+      Linha de uma tabela de solicitações. Aceita acesso por chave (row["status"], row.get(...))
+      como os dicts usados antes pelos comandos.
     """
-    try:
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "DELETE FROM migration_requests WHERE request_id = ?",
-                (request_id,)
-            )
-            deleted = cursor.rowcount > 0
-            return deleted
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao deletar a solicitação: {e}")
-        return False
+    __slots__ = ("request_id", "user_id", "message", "status", "response", "created_at", "answered_at")
 
+    def __init__(self, request_id, user_id, message, status, response, created_at, answered_at) -> None:
+        self.request_id = request_id
+        self.user_id = user_id
+        self.message = message
+        self.status = status
+        self.response = response
+        self.created_at = created_at
+        self.answered_at = answered_at
 
-def save_request(request_id: str, user_id: int, message: str) -> bool:
-    """
-      Salva uma nova solicitação no banco de dados.
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
 
-      Args:
-        request_id: ID único da solicitação (geralmente interaction.id)
-        user_id: ID do usuário que criou a solicitação
-        message: Mensagem da solicitação enviada pelo usuário
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
 
-      Returns:
-        True se salvou com sucesso, False caso contrário
-    """
-    try:
-        with get_connection() as conn:
-            conn.execute(
-                "INSERT INTO migration_requests (request_id, user_id, message, status) VALUES (?, ?, ?, 'pending')",
-                (request_id, user_id, message)
-            )
-        return True
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
 
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao salvar solicitação: {e}")
-        return False
+    def __repr__(self) -> str:
+        return f"RequestRow({self.as_dict()!r})"
 
 
-def get_pending_requests_count() -> int:
+class RequestPage:
     """
-      Retorna o número de solicitações pendentes.
+      Uma página da listagem de um usuário (paginação por keyset). first_key/last_key são
+      (created_at, request_id) da primeira e da última linha: passe last_key como `before`
+      para a página seguinte (mais antigas) e first_key como `after` para a anterior.
+      newer_count e total são contados junto com a página: a posição dela na listagem
+      vem do cursor, não de um contador de cliques.
+    """
+    __slots__ = ("rows", "first_key", "last_key", "has_newer", "has_older", "newer_count", "total")
+
+    def __init__(
+        self,
+        rows: list[RequestRow],
+        first_key,
+        last_key,
+        has_newer: bool,
+        has_older: bool,
+        newer_count: int = 0,
+        total: int = 0,
+    ) -> None:
+        self.rows = rows
+        self.first_key = first_key
+        self.last_key = last_key
+        self.has_newer = has_newer
+        self.has_older = has_older
+        self.newer_count = newer_count
+        self.total = total
+
+
+# Mesmo formato para a busca por ID e a listagem; datas já no fuso local
+_ROW_COLUMNS = """
+  request_id,
+  user_id,
+  message,
+  status,
+  response,
+  datetime(created_at, 'localtime') AS created_at,
+  datetime(answered_at, 'localtime') AS answered_at
+"""
+
+# Condição de idade usada na limpeza: respondidas pela data de resposta, as demais pela de criação
+_OLDER_THAN = """(
+  (answered_at IS NOT NULL AND answered_at < julianday('now', '-' || ? || ' days'))
+  OR
+  (answered_at IS NULL AND created_at < julianday('now', '-' || ? || ' days'))
+)"""
+
+
+class RequestStore:
+    """
+      Operações de uma tabela de solicitações (migration_requests, reindex_requests, ...).
+      Todas têm o mesmo schema; os SQL são montados uma vez e reaproveitados pelo cache
+      de statements da conexão. Para um novo tipo de solicitação, basta registrar um
+      RequestStore em REQUEST_STORES.
     """
-    try:
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "SELECT COUNT(*) FROM migration_requests WHERE status = 'pending'"
-            )
-            count = cursor.fetchone()[0]
-            return count
-
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao contar as solicitações: {e}")
-        return 0
 
+    def __init__(self, table: str, label: str) -> None:
+        self.table = table
+        self.label = label
+
+        self._schema_sql = f"""
+          CREATE TABLE IF NOT EXISTS {table} (
+            request_id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            status TEXT DEFAULT 'pending',
+            response TEXT,
+            created_at REAL DEFAULT (julianday('now')),
+            answered_at REAL
+          )
+        """
+        self._get_sql = f"SELECT {_ROW_COLUMNS} FROM {table} WHERE request_id = ?"
+        # Listagem por keyset sobre o índice (user_id, created_at, request_id); a chave de cada
+        # linha vem junto (created_at cru, request_id) para montar o cursor da próxima página
+        page_columns = f"{_ROW_COLUMNS}, {table}.created_at"
+        self._index_sql = (
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_user_created "
+            f"ON {table} (user_id, created_at, request_id)"
+        )
+        self._first_page_sql = (
+            f"SELECT {page_columns} FROM {table} WHERE user_id = ? "
+            f"ORDER BY {table}.created_at DESC, request_id DESC LIMIT ?"
+        )
+        self._older_page_sql = (
+            f"SELECT {page_columns} FROM {table} WHERE user_id = ? AND ({table}.created_at, request_id) < (?, ?) "
+            f"ORDER BY {table}.created_at DESC, request_id DESC LIMIT ?"
+        )
+        self._newer_page_sql = (
+            f"SELECT {page_columns} FROM {table} WHERE user_id = ? AND ({table}.created_at, request_id) > (?, ?) "
+            f"ORDER BY {table}.created_at ASC, request_id ASC LIMIT ?"
+        )
+        self._count_sql = f"SELECT COUNT(*) FROM {table} WHERE user_id = ?"
+        self._count_newer_sql = (
+            f"SELECT COUNT(*) FROM {table} WHERE user_id = ? AND (created_at, request_id) > (?, ?)"
+        )
+        self._delete_sql = f"DELETE FROM {table} WHERE request_id = ?"
+        self._save_sql = f"INSERT INTO {table} (request_id, user_id, message, status) VALUES (?, ?, ?, 'pending')"
+        self._pending_sql = f"SELECT COUNT(*) FROM {table} WHERE status = 'pending'"
+        self._answer_sql = f"UPDATE {table} SET response = ?, status = ?, answered_at = julianday('now') WHERE request_id = ?"
+        self._update_sql = f"UPDATE {table} SET response = ?, status = ? WHERE request_id = ?"
+        self._cleanup_all_sql = f"DELETE FROM {table} WHERE {_OLDER_THAN}"
+
+    def create_table(self, conn: sqlite3.Connection) -> None:
+        conn.execute(self._schema_sql)
+        conn.execute(self._index_sql)
+
+    def get(self, request_id: str) -> Optional[RequestRow]:
+        """
+          Busca uma solicitação pelo ID.
+
+          Returns:
+              RequestRow ou None se não encontrada
+        """
+        try:
+            with get_connection() as conn:
+                row = conn.execute(self._get_sql, (request_id,)).fetchone()
+                return RequestRow(*row) if row else None
+
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro ao buscar {self.label}: {e}")
+            return None
 
-def update_response(request_id: str, response: str, status: str = 'ok') -> bool:
-    """
-      Atualiza uma solicitação com a resposta do moderador.
+    def list_page(
+        self,
+        user_id: int,
+        limit: int = 10,
+        before: Optional[tuple] = None,
+        after: Optional[tuple] = None,
+    ) -> RequestPage:
+        """
+          Uma página das solicitações de um usuário, da mais recente para a mais antiga.
+          Lê só limit + 1 linhas pelo índice (a extra indica se há mais páginas nessa direção).
+
+          Args:
+              user_id: ID do usuário
+              limit: Linhas por página
+              before: last_key da página atual, para a próxima (mais antigas)
+              after: first_key da página atual, para a anterior (mais recentes)
+        """
+        try:
+            with get_connection() as conn:
+                if after is not None:
+                    rows = conn.execute(self._newer_page_sql, (user_id, *after, limit + 1)).fetchall()
+                elif before is not None:
+                    rows = conn.execute(self._older_page_sql, (user_id, *before, limit + 1)).fetchall()
+                else:
+                    rows = conn.execute(self._first_page_sql, (user_id, limit + 1)).fetchall()
+
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+
+                if after is not None:
+                    rows.reverse()
+
+                # Contagens pelo mesmo índice, na mesma leitura da página
+                total = conn.execute(self._count_sql, (user_id,)).fetchone()[0]
+                newer_count = conn.execute(
+                    self._count_newer_sql, (user_id, rows[0][7], rows[0][0])
+                ).fetchone()[0] if rows else 0
+
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro ao buscar {self.label} do usuário: {e}")
+            return RequestPage([], None, None, False, False)
+
+        if after is not None:
+            has_newer, has_older = has_more, True
+        else:
+            has_newer, has_older = before is not None, has_more
+
+        if not rows:
+            return RequestPage([], None, None, has_newer, has_older, 0, total)
+
+        return RequestPage(
+            [RequestRow(*row[:7]) for row in rows],
+            (rows[0][7], rows[0][0]),
+            (rows[-1][7], rows[-1][0]),
+            has_newer,
+            has_older,
+            newer_count,
+            total,
+        )
+
+    def count_by_user(self, user_id: int) -> int:
+        """
+          Total de solicitações de um usuário (rodapé da listagem), contado pelo índice.
+        """
+        try:
+            with get_connection() as conn:
+                return conn.execute(self._count_sql, (user_id,)).fetchone()[0]
+
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro ao contar {self.label} do usuário: {e}")
+            return 0
+
+    def delete(self, request_id: str) -> bool:
+        """
+          Remove uma solicitação. Retorna True se removeu.
+        """
+        try:
+            with get_connection() as conn:
+                return conn.execute(self._delete_sql, (request_id,)).rowcount > 0
+
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro ao deletar {self.label}: {e}")
+            return False
 
-      Args:
-          request_id: ID da solicitação
-          response: Resposta do moderador
-          status: Status da solicitação ('pending', 'ok', 'review'). Padrão: 'ok'
+    def save(self, request_id: str, user_id: int, message: str) -> bool:
+        """
+          Salva uma nova solicitação pendente.
+
+          Args:
+            request_id: ID único da solicitação (geralmente interaction.id)
+            user_id: ID do usuário que criou a solicitação
+            message: Mensagem da solicitação enviada pelo usuário
+
+          Returns:
+            True se salvou com sucesso, False caso contrário
+        """
+        try:
+            with get_connection() as conn:
+                conn.execute(self._save_sql, (request_id, user_id, message))
+            return True
+
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro ao salvar {self.label}: {e}")
+            return False
 
-      Returns:
-          True se atualizou com sucesso, False caso contrário
-    """
-    try:
+    def pending_count(self) -> int:
+        """
+          Retorna o número de solicitações pendentes.
+        """
+        try:
+            with get_connection() as conn:
+                return conn.execute(self._pending_sql).fetchone()[0]
+
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro ao contar {self.label}: {e}")
+            return 0
+
+    def update_response(self, request_id: str, response: str, status: str = 'ok') -> bool:
+        """
+          Atualiza uma solicitação com a resposta do moderador.
+
+          Args:
+              request_id: ID da solicitação
+              response: Resposta do moderador
+              status: Status da solicitação ('pending', 'ok', 'review'). Padrão: 'ok'
+
+          Returns:
+              True se atualizou com sucesso, False caso contrário
+        """
         # Valida o status
         if status not in ('pending', 'ok', 'review'):
             print(
                 f"[DATABASE ERROR] Status inválido: {status}. Deve ser 'pending', 'ok' ou 'review'")
             return False
 
-        with get_connection() as conn:
-            # Se o status for 'ok', atualiza também o answered_at
-            if status == 'ok':
-                cursor = conn.execute(
-                    """
-                      UPDATE migration_requests
-                      SET response = ?, status = ?, answered_at = julianday('now')
-                      WHERE request_id = ?""",
-                    (response, status, request_id)
-                )
-            else:
-                cursor = conn.execute(
-                    """
-                      UPDATE migration_requests
-                      SET response = ?, status = ?
-                      WHERE request_id = ?""",
-                    (response, status, request_id)
-                )
-
-            updated = cursor.rowcount > 0
-            return updated
-
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao atualizar resposta: {e}")
-        return False
+        try:
+            with get_connection() as conn:
+                # Se o status for 'ok', atualiza também o answered_at
+                sql = self._answer_sql if status == 'ok' else self._update_sql
+                return conn.execute(sql, (response, status, request_id)).rowcount > 0
 
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro ao atualizar resposta de {self.label}: {e}")
+            return False
 
-def cleanup_old_migration_requests(days: int = 30, status_list: list[str] = None) -> int:
-    """
-      Remove solicitações antigas do banco de dados.
-
-      Args:
-          days: Número de dias para considerar uma solicitação como "antiga".
-          status_list: Lista de status para filtrar. Se contem "ALL", remove todos.
-                       Se None ou vazio, usa OK como padrão para compatibilidade.
-
-      Returns:
-          Número de solicitações removidas
-    """
-
-    if status_list is None or len(status_list) == 0:
-        status_list = ['ok']
-
-    try:
-        with get_connection() as conn:
-            # Se "ALL" remove todos independente do status
-            if 'ALL' in status_list:
-                query = """
-                    DELETE FROM migration_requests
-                    WHERE (
-                        (answered_at IS NOT NULL AND answered_at < julianday('now', '-' || ? || ' days'))
-                        OR
-                        (answered_at IS NULL AND created_at < julianday('now', '-' || ? || ' days' ))
-                    )
-                """
-                cursor = conn.execute(query, (days, days))
-            else:
-                # Remove apenas registros com os status fornecidos
-                placeholders = ','.join(['?' for _ in status_list])
-
-                query = f"""
-                    DELETE FROM migration_requests
-                    WHERE status IN ({placeholders})
-                    AND (
-                        (answered_at IS NOT NULL AND answered_at < julianday('now', '-' || ? || ' days'))
-                        OR
-                        (answered_at IS NULL AND created_at < julianday('now', '-' || ? || ' days'))
+    def retention_rule(self, days: int) -> tuple[str, str, tuple]:
+        """
+          (tabela, condição, parâmetros) das solicitações removidas pela manutenção periódica
+          (utils.maintenance, via purge_batch): o mesmo critério do padrão de cleanup, status 'ok'.
+        """
+        return self.table, f"status = 'ok' AND {_OLDER_THAN}", (days, days)
+
+    def cleanup(self, days: int = 30, status_list: list[str] = None) -> int:
+        """
+          Remove solicitações antigas.
+
+          Args:
+              days: Número de dias para considerar uma solicitação como "antiga"
+              status_list: Lista de status para filtrar. Se contém "ALL", remove todos independente do status.
+                          Se None ou vazio, usa ['ok'] como padrão para compatibilidade.
+
+          Returns:
+              Número de solicitações removidas
+        """
+        if not status_list:
+            status_list = ['ok']
+
+        try:
+            with get_connection() as conn:
+                if "ALL" in status_list:
+                    cursor = conn.execute(self._cleanup_all_sql, (days, days))
+                else:
+                    placeholders = ','.join('?' for _ in status_list)
+                    cursor = conn.execute(
+                        f"DELETE FROM {self.table} WHERE status IN ({placeholders}) AND {_OLDER_THAN}",
+                        (*status_list, days, days)
                     )
-                """
-                cursor = conn.execute(query, (*status_list, days, days))
 
-            deleted = cursor.rowcount
+                deleted = cursor.rowcount
 
             if deleted > 0:
-                status_str = "ALL" if "ALL" in status_list else ", ".join(
-                    status_list)
+                status_str = "ALL" if "ALL" in status_list else ", ".join(status_list)
                 print(
-                    f"[DATABASE] Limpeza: removidas {deleted} solicitações antigas (status: {status_str})")
+                    f"[DATABASE] Limpeza: removidas {deleted} linhas antigas de {self.table} (status: {status_str})")
 
             return deleted
 
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro na limpeza: {e}")
-        return 0
-
-
-# ============================================================================
-# FUNÇÕES PARA REINDEX REQUESTS
-# ============================================================================
+        except Exception as e:
+            print(f"[DATABASE ERROR] Erro na limpeza de {self.table}: {e}")
+            return 0
 
-def get_reindex_request(request_id: str) -> Optional[Dict]:
-    """
-      Busca uma solicitação de reindex pelo ID.
-
-      Args:
-          request_id: ID da solicitação
-
-      Returns:
-          Dicionário com dados da solicitação ou None se não encontrada
-    """
-    try:
-        with get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT user_id, message, status, response FROM reindex_requests WHERE request_id = ?",
-                (request_id,)
-            )
-            row = cursor.fetchone()
-
-            if row:
-                return {
-                    "user_id": row["user_id"],
-                    "message": row["message"],
-                    "status": row["status"],
-                    "response": row["response"]
-                }
-            return None
 
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao buscar solicitação de reindex: {e}")
-        return None
+# Tipos de solicitação do bot: um RequestStore por tabela
+REQUEST_STORES: Dict[str, RequestStore] = {
+    "migration": RequestStore("migration_requests", "solicitação"),
+    "reindex": RequestStore("reindex_requests", "solicitação de reindex"),
+}
 
 
-def get_user_reindex_requests(user_id: int) -> list[Dict]:
+def init_database() -> None:
     """
-      Busca todas as solicitações de reindex de um usuário específico.
-
-      Args:
-          user_id: ID do usuário
-
-      Returns:
-          Lista de dicionários com dados das solicitações, ordenadas por data (mais recente primeiro)
+      Inicializa o banco de dados criando as tabelas se não existirem.
+      Deve ser chamado no evento on_ready.
     """
     try:
         with get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                """
-              SELECT
-                request_id,
-                message,
-                status,
-                response,
-                datetime(created_at, 'localtime') as created_at,
-                datetime(answered_at, 'localtime') as answered_at
-              FROM reindex_requests
-              WHERE user_id = ?
-              ORDER BY created_at DESC
-            """,
-                (user_id,)
-            )
+            for store in REQUEST_STORES.values():
+                store.create_table(conn)
 
-            rows = cursor.fetchall()
+        # auto_vacuum=INCREMENTAL só vale após um VACUUM completo (fora de transação): feito uma vez
+        # aqui, na inicialização, e não na manutenção periódica (que só roda o incremental_vacuum)
+        with get_connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
 
-            return [
-                {
-                    "request_id": row["request_id"],
-                    "message": row["message"],
-                    "status": row["status"],
-                    "response": row["response"],
-                    "created_at": row["created_at"],
-                    "answered_at": row["answered_at"]
-                }
-                for row in rows
-            ]
+        print(f"[DATABASE] banco de dados inicializado: {DB_FILE}")
 
     except Exception as e:
-        print(
-            f"[DATABASE ERROR] Erro ao buscar solicitações de reindex do usuário: {e}")
-        return []
-
-
-def delete_reindex_request(request_id: str) -> bool:
-    """
-      Remove uma solicitação de reindex do banco de dados.
-
-      Args:
-          request_id: ID da solicitação
+        print(f"[DATABASE ERROR] Erro ao inicializar banco: {e}")
 
-      Returns:
-          True se removeu com sucesso, False caso contrário
-    """
-    try:
-        with get_connection() as conn:
-            cursor = conn.execute(
-                "DELETE FROM reindex_requests WHERE request_id = ?",
-                (request_id,)
-            )
-            deleted = cursor.rowcount > 0
-            return deleted
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao deletar solicitação de reindex: {e}")
-        return False
 
+# ============================================================================
+# MANUTENÇÃO
+# ============================================================================
 
-def save_reindex_request(request_id: str, user_id: int, message: str) -> bool:
+def purge_batch(table: str, where: str, params: tuple, after_rowid: int, limit: int) -> tuple[int, Optional[int]]:
     """
-      Salva uma nova solicitação de reindex no banco de dados.
+      Remove um lote da limpeza periódica: as próximas `limit` linhas de `table` (rowid > after_rowid)
+      que atendem `where`, apagadas por intervalo de rowid numa transação curta.
 
       Args:
-        request_id: ID único da solicitação (geralmente interaction.id)
-        user_id: ID do usuário que criou a solicitação
-        message: Mensagem da solicitação enviada pelo usuário
+          table: Tabela a limpar
+          where: Condição SQL das linhas a remover (com placeholders)
+          params: Valores dos placeholders de `where`
+          after_rowid: Último rowid do lote anterior (0 no primeiro)
+          limit: Tamanho do lote
 
       Returns:
-        True se salvou com sucesso, False caso contrário
+          (linhas removidas, último rowid do lote); rowid None quando não há mais o que remover
     """
     try:
         with get_connection() as conn:
-            conn.execute(
-                "INSERT INTO reindex_requests (request_id, user_id, message, status) VALUES (?, ?, ?, 'pending')",
-                (request_id, user_id, message)
-            )
-        return True
-
-    except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao salvar solicitação de reindex: {e}")
-        return False
-
-
-def update_reindex_response(request_id: str, response: str, status: str = 'ok') -> bool:
-    """
-      Atualiza uma solicitação de reindex com a resposta do moderador.
+            rowids = [row[0] for row in conn.execute(
+                f"SELECT rowid FROM {table} WHERE rowid > ? AND ({where}) ORDER BY rowid LIMIT ?",
+                (after_rowid, *params, limit)
+            )]
 
-      Args:
-          request_id: ID da solicitação
-          response: Resposta do moderador
-          status: Status da solicitação ('pending', 'ok', 'review'). Padrão: 'ok'
-
-      Returns:
-          True se atualizou com sucesso, False caso contrário
-    """
-    try:
-        # Valida o status
-        if status not in ('pending', 'ok', 'review'):
-            print(
-                f"[DATABASE ERROR] Status inválido: {status}. Deve ser 'pending', 'ok' ou 'review'")
-            return False
+            if not rowids:
+                return 0, None
 
-        with get_connection() as conn:
-            # Se o status for 'ok', atualiza também o answered_at
-            if status == 'ok':
-                cursor = conn.execute(
-                    """
-                      UPDATE reindex_requests
-                      SET response = ?, status = ?, answered_at = julianday('now')
-                      WHERE request_id = ?""",
-                    (response, status, request_id)
-                )
-            else:
-                cursor = conn.execute(
-                    """
-                      UPDATE reindex_requests
-                      SET response = ?, status = ?
-                      WHERE request_id = ?""",
-                    (response, status, request_id)
-                )
-
-            updated = cursor.rowcount > 0
-            return updated
+            cursor = conn.execute(
+                f"DELETE FROM {table} WHERE rowid BETWEEN ? AND ? AND ({where})",
+                (rowids[0], rowids[-1], *params)
+            )
+            return cursor.rowcount, rowids[-1]
 
     except Exception as e:
-        print(f"[DATABASE ERROR] Erro ao atualizar resposta de reindex: {e}")
-        return False
+        print(f"[DATABASE ERROR] Erro na limpeza de {table}: {e}")
+        return 0, None
 
 
-def cleanup_old_reindex_requests(days: int = 30, status_list: list[str] = None) -> int:
+def optimize_database(vacuum_pages: int) -> Dict[str, int]:
     """
-      Remove solicitações de reindex antigas do banco de dados.
-
-      Args:
-          days: Número de dias para considerar uma solicitação como "antiga"
-          status_list: Lista de status para filtrar. Se contém "ALL", remove todos independente do status.
-                      Se None ou vazio, usa ['ok'] como padrão para compatibilidade.
+      PRAGMA optimize e devolução de até `vacuum_pages` páginas livres ao disco (incremental_vacuum).
+      O auto_vacuum=INCREMENTAL é ativado no init_database; aqui nunca há VACUUM completo.
 
       Returns:
-          Número de solicitações removidas
+          Páginas livres antes e depois do incremental_vacuum
     """
-
-    if status_list is None or len(status_list) == 0:
-        # Padrão para compatibilidade com código existente
-        status_list = ['ok']
-
     try:
         with get_connection() as conn:
-            # Se "ALL" está na lista, remove todos independente do status
-            if "ALL" in status_list:
-                query = """
-                  DELETE FROM reindex_requests
-                  WHERE (
-                    (answered_at IS NOT NULL AND answered_at < julianday('now', '-' || ? || ' days'))
-                    OR
-                    (answered_at IS NULL AND created_at < julianday('now', '-' || ? || ' days'))
-                  )
-                """
-                cursor = conn.execute(query, (days, days))
-            else:
-                # Remove apenas registros com os status especificados
-                placeholders = ','.join(['?' for _ in status_list])
-                query = f"""
-                  DELETE FROM reindex_requests
-                  WHERE status IN ({placeholders})
-                  AND (
-                    (answered_at IS NOT NULL AND answered_at < julianday('now', '-' || ? || ' days'))
-                    OR
-                    (answered_at IS NULL AND created_at < julianday('now', '-' || ? || ' days'))
-                  )
-                """
-                cursor = conn.execute(query, (*status_list, days, days))
-
-            deleted = cursor.rowcount
+            conn.execute("PRAGMA optimize")
 
-            if deleted > 0:
-                status_str = "ALL" if "ALL" in status_list else ", ".join(
-                    status_list)
-                print(
-                    f"[DATABASE] Limpeza: removidas {deleted} solicitações de reindex antigas (status: {status_str})")
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})").fetchall()
+            after = conn.execute("PRAGMA freelist_count").fetchone()[0]
 
-            return deleted
+            return {"freelist_before": before, "freelist_after": after}
 
     except Exception as e:
-        print(f"[DATABASE ERROR] Erro na limpeza de reindex: {e}")
-        return 0
+        print(f"[DATABASE ERROR] Erro ao otimizar o banco: {e}")
+        return {}
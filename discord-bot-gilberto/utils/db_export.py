@@ -8,9 +8,9 @@ import json
 import sqlite3
 from pathlib import Path
 
-from utils.database import DB_FILE, get_connection
+from utils.database import DB_FILE, REQUEST_STORES, get_connection
 
-TABLES = ("migration_requests", "reindex_requests")
+TABLES = tuple(store.table for store in REQUEST_STORES.values())
 DATE_COLUMNS = ("created_at", "answered_at")
 
 
@@ -44,12 +44,11 @@ def get_export_data() -> dict[str, list] | None:
     if not DB_FILE.exists():
         return None
     with get_connection() as conn:
-        conn.row_factory = sqlite3.Row
         data = {}
         for table in TABLES:
             try:
                 rows = _fetch_table(conn, table)
-                data[table] = [dict(r) for r in rows]
+                data[table] = rows
             except sqlite3.OperationalError:
                 data[table] = []
         return data
@@ -0,0 +1,141 @@
+"""
+    Thread dedicada ao SQLite: as funções de utils.database entram numa fila FIFO e rodam
+    uma de cada vez fora do event loop; a coroutine que pediu aguarda o resultado.
+    Mantém profundidade da fila e latência (espera na fila e execução) por operação.
+    Mesmo desenho do utils/db_worker.py do discord-bot-sebastiao (os bots são implantados separadamente,
+    sem pacote comum): correções em um devem ser replicadas no outro.
+"""
+import asyncio
+import queue
+import threading
+import time
+from contextlib import suppress
+from typing import Any, Callable
+
+# Tempo máximo (s) para a thread esvaziar a fila no encerramento do bot
+DB_WORKER_STOP_TIMEOUT = 10.0
+
+
+class _OpStats:
+    __slots__ = ("count", "wait_total", "run_total", "run_max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.wait_total = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+
+def _op_name(fn: Callable[..., Any]) -> str:
+    # Métodos de um RequestStore aparecem por tabela (ex.: "reindex_requests.save")
+    table = getattr(getattr(fn, "__self__", None), "table", None)
+    return f"{table}.{fn.__name__}" if table else fn.__name__
+
+
+def _resolve(future: asyncio.Future, result: Any, error: BaseException | None) -> None:
+    # A coroutine pode ter sido cancelada enquanto a operação estava na fila
+    if future.cancelled():
+        return
+
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class DbWorker:
+    """
+        Executa chamadas bloqueantes ao banco numa única thread (um escritor só, sem travar o gateway).
+        Uso: await db_worker.call(database.get_thread, thread_id).
+    """
+
+    def __init__(self, name: str = "db-worker") -> None:
+        self.name = name
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: dict[str, _OpStats] = {}
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    async def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+            Enfileira fn(*args, **kwargs) e aguarda o resultado (exceções são repassadas).
+        """
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((fn, args, kwargs, loop, future, time.perf_counter()))
+
+        return await future
+
+    async def stop(self, timeout: float = DB_WORKER_STOP_TIMEOUT) -> None:
+        """
+            Processa o que já está na fila e encerra a thread.
+        """
+        thread = self._thread
+
+        if thread is None or not thread.is_alive():
+            return
+
+        self._queue.put(None)
+        await asyncio.to_thread(thread.join, timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+
+            if item is None:
+                return
+
+            fn, args, kwargs, loop, future, enqueued_at = item
+            started = time.perf_counter()
+            result, error = None, None
+
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+
+            finished = time.perf_counter()
+            self._record(_op_name(fn), started - enqueued_at, finished - started)
+
+            # Loop já fechado (bot encerrando): não há mais quem aguarde o resultado
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(_resolve, future, result, error)
+
+    def _record(self, name: str, wait: float, run: float) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(name, _OpStats())
+            stats.count += 1
+            stats.wait_total += wait
+            stats.run_total += run
+            stats.run_max = max(stats.run_max, run)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+            Profundidade atual da fila e, por operação: chamadas, espera média na fila,
+            execução média e máxima (ms).
+        """
+        with self._stats_lock:
+            operations = {
+                name: {
+                    "count": s.count,
+                    "avg_wait_ms": round(s.wait_total / s.count * 1000, 3),
+                    "avg_ms": round(s.run_total / s.count * 1000, 3),
+                    "max_ms": round(s.run_max * 1000, 3),
+                }
+                for name, s in self._stats.items()
+            }
+
+        return {"queue_depth": self._queue.qsize(), "operations": operations}
+
+
+db_worker = DbWorker()
@@ -0,0 +1,128 @@
+"""
+    API assíncrona do banco de solicitações usada pelos eventos e comandos do bot.
+    Cada função executa a equivalente de utils.database na thread do DbWorker,
+    então um banco travado não bloqueia o event loop do discord.py.
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+from utils import database, db_export
+from utils.db_worker import db_worker
+
+
+async def init_database() -> None:
+    await db_worker.call(database.init_database)
+
+
+class RequestRepository:
+    """
+        Versão assíncrona de um database.RequestStore (uma tabela de solicitações).
+    """
+
+    def __init__(self, store: database.RequestStore) -> None:
+        self.store = store
+
+    async def get(self, request_id: str) -> Optional[database.RequestRow]:
+        return await db_worker.call(self.store.get, request_id)
+
+    async def list_page(
+        self,
+        user_id: int,
+        limit: int = 10,
+        before: Optional[tuple] = None,
+        after: Optional[tuple] = None,
+    ) -> database.RequestPage:
+        return await db_worker.call(self.store.list_page, user_id, limit, before, after)
+
+    async def count_by_user(self, user_id: int) -> int:
+        return await db_worker.call(self.store.count_by_user, user_id)
+
+    async def delete(self, request_id: str) -> bool:
+        return await db_worker.call(self.store.delete, request_id)
+
+    async def save(self, request_id: str, user_id: int, message: str) -> bool:
+        return await db_worker.call(self.store.save, request_id, user_id, message)
+
+    async def pending_count(self) -> int:
+        return await db_worker.call(self.store.pending_count)
+
+    async def update_response(self, request_id: str, response: str, status: str = 'ok') -> bool:
+        return await db_worker.call(self.store.update_response, request_id, response, status)
+
+    async def cleanup(self, days: int = 30, status_list: list[str] = None) -> int:
+        return await db_worker.call(self.store.cleanup, days, status_list)
+
+
+REQUESTS: Dict[str, RequestRepository] = {
+    kind: RequestRepository(store) for kind, store in database.REQUEST_STORES.items()
+}
+
+migration_requests = REQUESTS["migration"]
+reindex_requests = REQUESTS["reindex"]
+
+
+# ============================================================================
+# MIGRATION REQUESTS
+# ============================================================================
+
+get_request = migration_requests.get
+count_user_requests = migration_requests.count_by_user
+delete_request = migration_requests.delete
+save_request = migration_requests.save
+get_pending_requests_count = migration_requests.pending_count
+update_response = migration_requests.update_response
+cleanup_old_migration_requests = migration_requests.cleanup
+
+
+# ============================================================================
+# REINDEX REQUESTS
+# ============================================================================
+
+get_reindex_request = reindex_requests.get
+count_user_reindex_requests = reindex_requests.count_by_user
+delete_reindex_request = reindex_requests.delete
+save_reindex_request = reindex_requests.save
+update_reindex_response = reindex_requests.update_response
+cleanup_old_reindex_requests = reindex_requests.cleanup
+
+
+# ============================================================================
+# MANUTENÇÃO
+# ============================================================================
+
+async def purge_in_batches(
+    table: str, where: str, params: tuple, batch_size: int, pause: float
+) -> tuple[int, int]:
+    """
+        Limpeza periódica em lotes (database.purge_batch), com pausa entre eles para
+        as demais operações do bot passarem na fila do banco. Retorna (removidas, lotes).
+    """
+    deleted, batches, after_rowid = 0, 0, 0
+
+    while True:
+        removed, after_rowid = await db_worker.call(
+            database.purge_batch, table, where, params, after_rowid, batch_size)
+
+        if after_rowid is None:
+            break
+
+        deleted += removed
+        batches += 1
+        await asyncio.sleep(pause)
+
+    return deleted, batches
+
+
+async def optimize_database(vacuum_pages: int) -> Dict[str, int]:
+    return await db_worker.call(database.optimize_database, vacuum_pages)
+
+
+async def get_export_data() -> dict[str, list] | None:
+    return await db_worker.call(db_export.get_export_data)
+
+
+def db_stats() -> dict[str, Any]:
+    """
+        Profundidade da fila do banco e latência por operação (ver DbWorker.snapshot).
+    """
+    return db_worker.snapshot()
@@ -4,12 +4,12 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from utils.database import cleanup_old_threads
 from utils.db_export import (
     build_export_csv_bytes,
     build_export_json_bytes,
-    get_export_data,
 )
+from utils.maintenance import maintenance
+from utils.repository import cleanup_old_threads, db_stats, get_export_data
 
 
 def register_admin_commands(bot: commands.Bot) -> None:
@@ -70,7 +70,7 @@ def register_admin_commands(bot: commands.Bot) -> None:
         status_list = [status_value]
 
         # Executa a limpeza
-        deleted = cleanup_old_threads(days=dias, status_list=status_list)
+        deleted = await cleanup_old_threads(days=dias, status_list=status_list)
 
         # Cria embed com resultado
         status_display = "Todos" if status_value == "ALL" else status.name
@@ -128,7 +128,7 @@ def register_admin_commands(bot: commands.Bot) -> None:
 
         await interaction.response.defer(ephemeral=True)
 
-        data = get_export_data()
+        data = await get_export_data()
         if data is None:
             await interaction.followup.send(
                 "Banco de dados não encontrado. Verifique se o bot está configurado corretamente.",
@@ -159,3 +159,70 @@ def register_admin_commands(bot: commands.Bot) -> None:
             file=file,
             ephemeral=True,
         )
+
+    @bot.tree.command(
+        name="db_stats",
+        description="[Moderador/Admin] Fila e latência das operações no banco de threads.",
+    )
+    async def db_stats_command(interaction: discord.Interaction) -> None:
+        moderator_role = discord.utils.get(
+            interaction.guild.roles, name="Moderator"
+        )
+        admin_role = discord.utils.get(
+            interaction.guild.roles, name="Admin"
+        )
+        has_permission = (
+            (moderator_role and moderator_role in interaction.user.roles)
+            or (admin_role and admin_role in interaction.user.roles)
+        )
+        if not has_permission:
+            await interaction.response.send_message(
+                "Apenas moderadores ou admins podem usar este comando.",
+                ephemeral=True,
+            )
+            return
+
+        stats = db_stats()
+        embed = discord.Embed(
+            title="Banco de threads",
+            description=f"Operações na fila: {stats['queue_depth']}",
+            color=discord.Color.blue()
+        )
+
+        for name, op in sorted(stats["operations"].items()):
+            embed.add_field(
+                name=name,
+                value=(
+                    f"{op['count']} chamada(s)\n"
+                    f"fila: {op['avg_wait_ms']} ms\n"
+                    f"média: {op['avg_ms']} ms · máx: {op['max_ms']} ms"
+                ),
+                inline=True
+            )
+
+        cache = stats["thread_cache"]
+        embed.add_field(
+            name="Cache de threads",
+            value=(
+                f"{cache['entries']}/{cache['max_entries']} em memória\n"
+                f"acertos: {cache['hits']} · faltas: {cache['misses']}"
+            ),
+            inline=False
+        )
+
+        last_run = maintenance.snapshot()["last_run"]
+        if last_run:
+            removed = ", ".join(f"{table}: {n}" for table, n in last_run["deleted"].items())
+            embed.add_field(
+                name="Última manutenção",
+                value=(
+                    f"<t:{int(last_run['started_at'])}:R> · {last_run['duration_ms']} ms
+"
+                    f"removidas: {removed} ({last_run['batches']} lote(s))
+"
+                    f"páginas livres: {last_run.get('freelist_before', '?')} → {last_run.get('freelist_after', '?')}"
+                ),
+                inline=False
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -7,20 +7,29 @@ import discord
 from discord import Message
 from discord.ext import commands
 
-from bot_events.constants import WEBHOOK_CHANNEL_ID, SUPPORT_CHANNEL_ID
+from bot_events.constants import WEBHOOK_CHANNEL_ID
 from bot_events.handlers import (
+    FEEDBACK_CHOICES,
+    apply_feedback,
+    archival_worker,
+    enqueue_question,
     handle_n8n_webhook_response,
-    handle_with_n8n,
-    handle_with_orchestrator,
+    job_kind,
+    resolve_owner_id,
+    resume_jobs,
+    run_question_job,
 )
-from utils.database import (
-    cleanup_old_threads,
-    close_thread,
+from utils.maintenance import maintenance
+from utils.question_scheduler import question_scheduler
+from utils.repository import (
+    complete_job,
     delete_thread,
     get_thread,
     init_database,
-    update_thread,
+    load_prompt_index,
+    warm_thread_cache,
 )
+from utils.thread_cache import prompt_index
 
 
 def set_events(bot: commands.Bot, *, log_file_path: Path | None = None) -> None:
@@ -53,10 +62,20 @@ def set_events(bot: commands.Bot, *, log_file_path: Path | None = None) -> None:
         """
 
         # Inicializa banco de dados
-        init_database()
+        await init_database()
 
-        # Limpa solicitações antigas (30 dias atrás)
-        cleanup_old_threads(30)
+        # Carrega as threads em aberto no cache (eventos seguintes não vão ao SQLite)
+        warmed = await warm_thread_cache()
+        prompts = await load_prompt_index()
+        print(f'[DATABASE] {warmed} threads em aberto carregadas no cache, {prompts} mensagens aguardando reação')
+
+        # Limpeza periódica do banco (threads fechadas antigas, optimize, vacuum incremental)
+        maintenance.start()
+
+        # Retoma as perguntas interrompidas por um restart (threads que ficariam bloqueadas)
+        resumed = await resume_jobs(bot)
+        if resumed:
+            print(f'[JOBS] {resumed} perguntas retomadas')
 
         print(f'{bot.user.name} está online!')
         print(f'Bot ID: {bot.user.id}')
@@ -83,33 +102,55 @@ def set_events(bot: commands.Bot, *, log_file_path: Path | None = None) -> None:
     async def on_message(message: Message) -> None:
         if isinstance(message.channel, discord.Thread) and message.author != bot.user:
             thread = message.channel
-            thread_db = get_thread(thread.id)
+            thread_db = await get_thread(thread.id)
 
             if thread_db and (
                 thread_db["status"] == "closed" or thread_db["status"] == "pending_support"
             ):
                 return
 
-            await thread.send("Solicitação recebida")
-            await thread.edit(locked=True)
-
             # Verifica no .env qual o fluxo está "ativo"
-            orchestrator_url = os.getenv("ORCHESTRATOR_URL")
-            webhook_url = os.getenv("N8N_WEBHOOK_URL")
+            kind = job_kind()
+
+            if kind is None:
+                await thread.send("Solicitação recebida")
+                return
+
+            # Pergunta gravada na fila durável: se o bot reiniciar, é retomada no on_ready
+            job = await enqueue_question(thread, message, kind)
 
-            # MCP
-            if orchestrator_url:
-                await handle_with_orchestrator(
-                    bot, thread, message, orchestrator_url, thread_db
+            if job is None:
+                await thread.send(
+                    f"Erro ao processar sua solicitação. Tente novamente. {message.author.mention}"
                 )
                 return
 
-            # N8N
-            if webhook_url:
-                await handle_with_n8n(thread, message, webhook_url)
+            # A resposta só começa depois do aviso de recebimento e do bloqueio da thread
+            acknowledged = asyncio.Event()
+
+            async def answer() -> None:
+                await acknowledged.wait()
+                await run_question_job(bot, job, message)
+
+            position = question_scheduler.submit(thread.id, message.author.id, answer)
+
+            if position is None:
+                await complete_job(job["job_id"])
+                await thread.send(
+                    f"Estou com muitas solicitações no momento. Tente novamente em alguns minutos. {message.author.mention}"
+                )
                 return
 
-            await thread.edit(locked=False)
+            try:
+                if position == 0:
+                    await thread.send("Solicitação recebida")
+                else:
+                    await thread.send(f"Solicitação recebida, você está na fila, posição {position}.")
+
+                await thread.edit(locked=True)
+            finally:
+                acknowledged.set()
+
             return
 
         # No fluxo N8N a resposta é enviada a um canal de respostas
@@ -118,97 +159,59 @@ def set_events(bot: commands.Bot, *, log_file_path: Path | None = None) -> None:
 
     @bot.event
     async def on_thread_update(before, after) -> None:
-        # Quando uma thread é arquivada, fixa uma mensagem do bot e altera o status no banco para "closed"
+        # Quando uma thread é arquivada, o worker de arquivamento fixa "Atendimento encerrado"
+        # (se ainda não houver) e altera o status no banco para "closed"
         if before.archived == False and after.archived == True:
-            pins = await after.pins()
-
-            if not any(pin.author == bot.user and "Atendimento encerrado" in pin.content for pin in pins):
-                resolved_message = await after.send("**Atendimento encerrado**")
-                await resolved_message.pin()
-
-            await after.edit(archived=True, locked=True)
-
-            thread_db = get_thread(after.id)
-
-            if thread_db:
-                close_thread(after.id)
+            archival_worker.submit(after)
 
     @bot.event
-    async def on_reaction_add(reaction: discord.Reaction, user: discord.User):
-        if user.bot:
+    async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
+        # Perguntas antigas, enviadas com reações antes dos botões (FeedbackView)
+        # Evento "raw": dispara mesmo para mensagens fora do cache de mensagens (ex.: após restart)
+        if payload.user_id == bot.user.id or (payload.member is not None and payload.member.bot):
             return
 
-        message = reaction.message
+        # Só interessa reação na mensagem "Isso resolveu seu problema?" de uma thread em aberto
+        thread_id = prompt_index.thread_for(payload.message_id)
 
-        # Só interessa se estiver dentro de uma thread
-        if not isinstance(message.channel, discord.Thread):
+        if thread_id is None:
             return
 
-        thread = message.channel
-
-        starter = await thread.fetch_message(thread.id)
+        # Só aceita emojis válidos
+        emoji = str(payload.emoji)
 
-        # Só considera a reação do autor da thread
-        if user.id != starter.author.id:
+        if emoji not in FEEDBACK_CHOICES:
             return
 
-        thread_db = get_thread(thread.id)
+        thread_db = await get_thread(thread_id)
 
-        if not thread_db:
-            print(f'A thread: {thread.id} não existe no banco.')
-            return
-
-        if thread_db["status"] == 'closed' or message.id != thread_db["message_id"]:
+        if not thread_db or thread_db["status"] == 'closed' or payload.message_id != thread_db["message_id"]:
             return  # ignora threads fechadas ou reação em mensagens diferentes
 
-        # Só aceita emojis válidos
-        if str(reaction.emoji) not in ("✅", "❌", "💬"):
-            return
+        thread = bot.get_channel(payload.channel_id)
 
-        # Decisão do usuário
-        if str(reaction.emoji) == "✅":
-            resolved_message = await thread.send("**Atendimento encerrado**")
-            await resolved_message.pin()
-            close_thread(thread.id)
-
-        # Reabre a thread, para que o usuário possa responder
-        elif str(reaction.emoji) == "❌":
-            await thread.send("Ok 👍 Pode mandar mais detalhes que continuo te ajudando.")
-            await thread.edit(locked=False)
-
-        elif str(reaction.emoji) == "💬":
-            await thread.send("Ok 👍 Vou sinalizar a equipe sobre o seu caso.")
-            update_thread(
-                thread.id, thread_db["message_id"], "pending_support")
-            channel = bot.get_channel(SUPPORT_CHANNEL_ID)
-
-            if channel is None:
-                try:
-                    channel = await bot.fetch_channel(SUPPORT_CHANNEL_ID)
-                except Exception as e:
-                    print(f"Erro ao buscar canal {SUPPORT_CHANNEL_ID}: {e}")
-                    return
-
-            # Envia mensagem em outro canal, indicando a thread que precisa de atendimento
-            embed = discord.Embed(
-                title="Solicitação de atendimento",
-                description=(
-                    f"Thread: <#{thread_db['thread_id']}>\n"
-                    f"Usuário: <@{user.id}>\n"
-                )
-            )
+        if thread is None:
+            try:
+                thread = await bot.fetch_channel(payload.channel_id)
+            except Exception as e:
+                print(f"Erro ao buscar a thread {payload.channel_id}: {e}")
+                return
+
+        # Só considera a reação do autor da thread
+        if payload.user_id != await resolve_owner_id(thread, thread_db):
+            return
 
-            await channel.send(embed=embed)
+        await apply_feedback(bot, thread, thread_db, emoji, payload.user_id)
 
     @bot.event
     async def on_thread_delete(thread: discord.Thread):
         # Evento para remover do banco as threads que forem deletadas manualmente
-        thread_db = get_thread(thread.id)
+        thread_db = await get_thread(thread.id)
 
         if not thread_db:
             return
 
-        deleted = delete_thread(thread.id)
+        deleted = await delete_thread(thread.id)
 
         if deleted:
             print(f'Thread: {thread.id} excluída com sucesso')
@@ -1,14 +1,42 @@
 """
-    Handlers para fluxos de resposta do bot (MCP/orquestrador, N8N).
+    Handlers para fluxos de resposta do bot (MCP/orquestrador, N8N), da fila durável de perguntas,
+    da pergunta de feedback e do arquivamento de threads.
 """
+from bot_events.handlers.archival import ArchivalWorker, archival_worker
+from bot_events.handlers.feedback import (
+    FEEDBACK_CHOICES,
+    FeedbackView,
+    apply_feedback,
+    feedback_view,
+    resolve_owner_id,
+    with_feedback_prompt,
+)
 from bot_events.handlers.mcp_handler import handle_with_orchestrator
 from bot_events.handlers.n8n_handler import (
     handle_with_n8n,
     handle_n8n_webhook_response,
 )
+from bot_events.handlers.question_jobs import (
+    enqueue_question,
+    job_kind,
+    resume_jobs,
+    run_question_job,
+)
 
 __all__ = [
+    "ArchivalWorker",
+    "archival_worker",
+    "FEEDBACK_CHOICES",
+    "FeedbackView",
+    "apply_feedback",
+    "feedback_view",
+    "resolve_owner_id",
+    "with_feedback_prompt",
     "handle_with_orchestrator",
     "handle_with_n8n",
     "handle_n8n_webhook_response",
+    "enqueue_question",
+    "job_kind",
+    "resume_jobs",
+    "run_question_job",
 ]
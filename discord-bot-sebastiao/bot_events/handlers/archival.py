@@ -0,0 +1,129 @@
+"""
+    Arquivamento de threads fora do evento: on_thread_update só enfileira a thread e um worker
+    processa em lotes de ARCHIVE_BATCH_SIZE (uma consulta e uma transação por lote), com pausa
+    de ARCHIVE_INTERVAL segundos entre threads para não estourar o rate limit no arquivamento
+    automático em massa. Se a thread já tem closed_message_id no banco, não há nada a enviar;
+    sem ele, os fixados são conferidos antes de enviar outra mensagem.
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from contextlib import suppress
+
+import discord
+
+from utils.repository import close_threads, get_threads
+
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "25"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "0.5"))
+
+CLOSED_MESSAGE = "**Atendimento encerrado**"
+
+
+class ArchivalWorker:
+    """
+        Uso: archival_worker.submit(thread) no on_thread_update. Threads repetidas
+        enquanto esperam na fila são processadas uma vez só.
+    """
+
+    def __init__(self, batch_size: int = ARCHIVE_BATCH_SIZE, interval: float = ARCHIVE_INTERVAL) -> None:
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self._pending: OrderedDict[int, discord.Thread] = OrderedDict()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, thread: discord.Thread) -> None:
+        self._pending[thread.id] = thread
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._pending:
+                batch = [self._pending.popitem(last=False)[1]
+                         for _ in range(min(self.batch_size, len(self._pending)))]
+
+                try:
+                    await self.process(batch)
+                except Exception as e:
+                    logging.getLogger(__name__).exception(
+                        "Erro ao arquivar lote de %s threads: %s", len(batch), e)
+
+    async def process(self, batch: list[discord.Thread]) -> None:
+        """
+            Fecha no Discord as threads do lote e grava o fechamento de todas de uma vez.
+        """
+        rows = await get_threads([thread.id for thread in batch])
+        closings: list[tuple[str, int | None]] = []
+
+        for i, thread in enumerate(batch):
+            row = rows.get(str(thread.id))
+
+            if i:
+                await asyncio.sleep(self.interval)
+
+            try:
+                closed_message_id = await self._close_on_discord(thread, row)
+            except discord.HTTPException as e:
+                print(f"Erro ao arquivar a thread {thread.id}: {e}")
+                closed_message_id = None
+
+            if row is not None:
+                closings.append((str(thread.id), closed_message_id))
+
+        await close_threads(closings)
+
+    async def _close_on_discord(self, thread: discord.Thread, row: dict | None) -> int | None:
+        """
+            Envia e fixa "Atendimento encerrado" (se ainda não houver) e mantém a thread arquivada
+            e bloqueada. Retorna o id da mensagem fixada (enviada ou encontrada nos fixados).
+        """
+        if row is not None and row["closed_message_id"]:
+            if not thread.locked:
+                await thread.edit(archived=True, locked=True)
+            return None
+
+        # Thread fora do banco ou fechada antes da coluna existir: pode já ter a mensagem,
+        # confere as fixadas. Thread ainda aberta no banco nunca foi encerrada: envia direto
+        if row is None or row["status"] == "closed":
+            pins = await thread.pins()
+
+            for pin in pins:
+                if pin.author == thread.guild.me and "Atendimento encerrado" in pin.content:
+                    if not thread.locked:
+                        await thread.edit(archived=True, locked=True)
+                    return pin.id
+
+        resolved_message = await thread.send(CLOSED_MESSAGE)
+        await resolved_message.pin()
+        await thread.edit(archived=True, locked=True)
+
+        return resolved_message.id
+
+    async def stop(self) -> None:
+        """
+            Descarta o que está na fila e encerra o worker (encerramento do bot).
+        """
+        self._pending.clear()
+
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+archival_worker = ArchivalWorker()
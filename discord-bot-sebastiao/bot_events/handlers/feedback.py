@@ -0,0 +1,153 @@
+"""
+    Pergunta "Isso resolveu seu problema?" entregue como botões na própria mensagem da resposta
+    (uma mensagem em vez de resposta + pergunta + 2 ou 3 reações) e a decisão do usuário.
+    A decisão também vale para reações nas perguntas antigas (on_raw_reaction_add).
+"""
+import asyncio
+
+import discord
+from discord.ext import commands
+
+from bot_events.constants import SUPPORT_CHANNEL_ID
+from utils.repository import close_thread, get_thread, update_thread
+
+FEEDBACK_PROMPT = "Isso resolveu seu problema?"
+FEEDBACK_SUFFIX = f"\n\n**{FEEDBACK_PROMPT}**"
+FEEDBACK_CHOICES = ("✅", "❌", "💬")
+
+# Limite do Discord para o texto de uma mensagem
+_MAX_MESSAGE_LENGTH = 2000
+
+
+def with_feedback_prompt(content: str) -> str:
+    """
+        Acrescenta a pergunta ao fim da resposta quando cabe no limite da mensagem.
+    """
+    if len(content) + len(FEEDBACK_SUFFIX) > _MAX_MESSAGE_LENGTH:
+        return content
+    return content + FEEDBACK_SUFFIX
+
+
+class _FeedbackButton(discord.ui.Button):
+    def __init__(self, choice: str, label: str, style: discord.ButtonStyle, custom_id: str) -> None:
+        super().__init__(label=label, emoji=choice, style=style, custom_id=custom_id)
+        self.choice = choice
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await handle_feedback_interaction(interaction, self.choice)
+
+
+class FeedbackView(discord.ui.View):
+    """
+        Botões persistentes (timeout=None, custom_id fixo): registrados com bot.add_view
+        na subida, continuam funcionando nas mensagens enviadas antes de um restart.
+    """
+
+    def __init__(self, with_support: bool = True) -> None:
+        super().__init__(timeout=None)
+        self.add_item(_FeedbackButton(
+            "✅", "Sim", discord.ButtonStyle.success, "feedback:yes"))
+        self.add_item(_FeedbackButton(
+            "❌", "Não", discord.ButtonStyle.secondary, "feedback:no"))
+
+        if with_support:
+            self.add_item(_FeedbackButton(
+                "💬", "Preciso de ajuda", discord.ButtonStyle.primary, "feedback:support"))
+
+
+def feedback_view(thread_db: dict | None) -> FeedbackView:
+    """
+        "Preciso de ajuda" só aparece a partir da terceira resposta na thread.
+    """
+    return FeedbackView(with_support=bool(thread_db and thread_db.get("iteration_count", 0) >= 2))
+
+
+async def resolve_owner_id(thread: discord.Thread, thread_db: dict) -> int:
+    """
+        Autor da thread: salvo no banco; owner_id da thread como reserva; API só em último caso.
+    """
+    owner_id = thread_db["user_id"] or thread.owner_id
+
+    if owner_id is None:
+        starter = await thread.fetch_message(thread.id)
+        owner_id = starter.author.id
+
+    return owner_id
+
+
+async def _support_channel(bot: commands.Bot):
+    channel = bot.get_channel(SUPPORT_CHANNEL_ID)
+
+    if channel is None:
+        try:
+            channel = await bot.fetch_channel(SUPPORT_CHANNEL_ID)
+        except Exception as e:
+            print(f"Erro ao buscar canal {SUPPORT_CHANNEL_ID}: {e}")
+            return None
+
+    return channel
+
+
+async def apply_feedback(
+    bot: commands.Bot,
+    thread: discord.Thread,
+    thread_db: dict,
+    choice: str,
+    user_id: int,
+) -> None:
+    """
+        Executa a decisão do autor da thread. Chamadas independentes (rotas diferentes da API,
+        portanto buckets de rate limit diferentes, ou só banco) rodam em paralelo.
+    """
+    if choice == "✅":
+        resolved_message = await thread.send("**Atendimento encerrado**")
+        # closed_message_id: no arquivamento, a mensagem não é enviada de novo
+        await asyncio.gather(resolved_message.pin(), close_thread(thread.id, resolved_message.id))
+
+    # Reabre a thread, para que o usuário possa responder
+    elif choice == "❌":
+        await asyncio.gather(
+            thread.send("Ok 👍 Pode mandar mais detalhes que continuo te ajudando."),
+            thread.edit(locked=False),
+        )
+
+    elif choice == "💬":
+        calls = [
+            thread.send("Ok 👍 Vou sinalizar a equipe sobre o seu caso."),
+            update_thread(thread.id, thread_db["message_id"], "pending_support"),
+        ]
+        channel = await _support_channel(bot)
+
+        if channel is not None:
+            # Envia mensagem em outro canal, indicando a thread que precisa de atendimento
+            embed = discord.Embed(
+                title="Solicitação de atendimento",
+                description=(
+                    f"Thread: <#{thread_db['thread_id']}>\n"
+                    f"Usuário: <@{user_id}>\n"
+                )
+            )
+            calls.append(channel.send(embed=embed))
+
+        await asyncio.gather(*calls)
+
+
+async def handle_feedback_interaction(interaction: discord.Interaction, choice: str) -> None:
+    """
+        Clique num botão da pergunta: valida thread, mensagem e autor e aplica a decisão.
+    """
+    thread = interaction.channel
+    thread_db = await get_thread(thread.id)
+
+    if not thread_db or thread_db["status"] == "closed" or interaction.message.id != thread_db["message_id"]:
+        await interaction.response.send_message(
+            "Esta pergunta não está mais ativa.", ephemeral=True)
+        return
+
+    if interaction.user.id != await resolve_owner_id(thread, thread_db):
+        await interaction.response.send_message(
+            "Só quem abriu a thread pode responder a esta pergunta.", ephemeral=True)
+        return
+
+    await interaction.response.defer()
+    await apply_feedback(interaction.client, thread, thread_db, choice, interaction.user.id)
@@ -1,15 +1,32 @@
 """
-    Handler do fluxo MCP: chamada síncrona ao orquestrador.
+    Handler do fluxo MCP: chamada ao orquestrador via cliente HTTP assíncrono compartilhado.
+    Com ORCHESTRATOR_STREAMING, usa /answer/stream e vai editando uma única mensagem da thread
+    conforme a resposta chega (no máximo uma edição a cada STREAM_EDIT_INTERVAL segundos).
+    A mensagem final já leva a pergunta de feedback e os botões (FeedbackView).
 """
+import asyncio
 import io
 import logging
+import os
+import time
+from contextlib import suppress
 
+import aiohttp
 import discord
-import requests
 from discord import Message
 from discord.ext import commands
 
-from utils.database import save_thread, update_thread
+from bot_events.handlers.feedback import FEEDBACK_SUFFIX, feedback_view, with_feedback_prompt
+from utils.repository import get_thread_history, record_exchange, save_thread, update_thread
+from utils.http_client import ORCHESTRATOR_TIMEOUT, post_json, stream_ndjson
+from utils.thread_history import HISTORY_MAX_EXCHANGES
+
+ORCHESTRATOR_STREAMING = os.getenv(
+    "ORCHESTRATOR_STREAMING", "true").lower() in ("1", "true", "yes")
+# Intervalo mínimo entre edições da mensagem em streaming (rate limit do Discord)
+STREAM_EDIT_INTERVAL = float(os.getenv("STREAM_EDIT_INTERVAL", "1.0"))
+# Limite do Discord para o texto de uma mensagem
+_MAX_MESSAGE_LENGTH = 2000
 
 # Frases que o bot envia e que não fazem parte do histórico de respostas
 _BOT_SYSTEM_PHRASES = (
@@ -22,10 +39,11 @@ _BOT_SYSTEM_PHRASES = (
 
 
 async def _build_history_from_thread(
-    thread: discord.Thread, current_message_id: int, max_exchanges: int = 2
+    thread: discord.Thread, current_message_id: int, max_exchanges: int = HISTORY_MAX_EXCHANGES
 ) -> list[dict[str, str]]:
     """
         Monta o histórico (últimas N trocas user/assistant) a partir das mensagens da thread.
+        Só usado quando o histórico não está em memória nem no banco (ex.: threads antigas).
     """
     collected: list[dict[str, str]] = []
 
@@ -37,7 +55,7 @@ async def _build_history_from_thread(
             if msg.content and len(msg.content) > 20:
                 if not any(p in msg.content[:60] for p in _BOT_SYSTEM_PHRASES):
                     collected.append(
-                        {"role": "assistant", "content": msg.content})
+                        {"role": "assistant", "content": msg.content.removesuffix(FEEDBACK_SUFFIX)})
         else:
             if msg.content:
                 collected.append({"role": "user", "content": msg.content})
@@ -45,6 +63,94 @@ async def _build_history_from_thread(
     return collected[-(max_exchanges * 2):]
 
 
+class _StreamingReply:
+    """
+        Mensagem de resposta na thread. Em streaming é criada no primeiro trecho e editada
+        conforme o texto cresce; finish() grava o conteúdo final (ou envia, se nada foi criado).
+    """
+
+    def __init__(self, thread: discord.Thread) -> None:
+        self.thread = thread
+        self.message: discord.Message | None = None
+        self.text = ""
+        self._shown = ""
+        self._last_edit = 0.0
+
+    async def append(self, text: str) -> None:
+        self.text += text
+        live = self.text
+        if len(live) > _MAX_MESSAGE_LENGTH:
+            live = live[:_MAX_MESSAGE_LENGTH - 1] + "…"
+
+        if not live.strip() or live == self._shown:
+            return
+
+        now = time.monotonic()
+        if self.message is None:
+            self.message = await self.thread.send(live)
+        elif now - self._last_edit >= STREAM_EDIT_INTERVAL:
+            await self.message.edit(content=live)
+        else:
+            return
+
+        self._shown = live
+        self._last_edit = now
+
+    async def finish(
+        self, content: str, files: list[discord.File], view: discord.ui.View | None = None
+    ) -> discord.Message:
+        """
+            Grava o conteúdo final (com os botões de feedback, se houver) e devolve a mensagem.
+        """
+        extra = {"view": view} if view is not None else {}
+
+        if self.message is None:
+            if files:
+                self.message = await self.thread.send(content=content, files=files, **extra)
+            else:
+                self.message = await self.thread.send(content, **extra)
+        elif files:
+            await self.message.edit(content=content, attachments=files, **extra)
+        elif content != self._shown or view is not None:
+            await self.message.edit(content=content, **extra)
+
+        return self.message
+
+    async def discard(self) -> None:
+        """
+            Apaga a resposta parcial (stream interrompido ou reiniciado) para não ficar meia
+            resposta na thread; o próximo trecho começa uma mensagem nova.
+        """
+        if self.message is not None:
+            with suppress(discord.HTTPException):
+                await self.message.delete()
+            self.message = None
+
+        self.text = ""
+        self._shown = ""
+
+
+async def _stream_answer(url: str, data: dict, reply: _StreamingReply) -> dict:
+    """
+        Consome o /answer/stream repassando os trechos para reply e devolve o evento "done"
+        (mesmos campos da resposta do /answer).
+    """
+    async for event in stream_ndjson(url, data, timeout=ORCHESTRATOR_TIMEOUT):
+        kind = event.get("type")
+
+        if kind == "delta":
+            await reply.append(event.get("content", ""))
+        elif kind == "reset":
+            # Texto já repassado era de uma rodada que virou tool call
+            await reply.discard()
+        elif kind == "done":
+            return event
+        elif kind == "error":
+            raise aiohttp.ClientPayloadError(event.get("detail", "erro no stream"))
+
+    raise aiohttp.ClientPayloadError("stream encerrado sem resposta final")
+
+
 async def handle_with_orchestrator(
     bot: commands.Bot,
     thread: discord.Thread,
@@ -53,11 +159,14 @@ async def handle_with_orchestrator(
     thread_db: dict | None,
 ) -> None:
     """
-        Chama o orquestrador (MCP), recebe resposta síncrona e envia na thread.
+        Chama o orquestrador (MCP) sem bloquear o event loop e envia a resposta na thread.
     """
     url = orchestrator_url.rstrip("/") + "/answer"
     user_message = str(message.content)
-    history = await _build_history_from_thread(thread, message.id)
+    history = await get_thread_history(thread.id)
+
+    if history is None:
+        history = await _build_history_from_thread(thread, message.id)
 
     data = {
         "message": user_message,
@@ -74,17 +183,24 @@ async def handle_with_orchestrator(
         "history": history,
     }
 
+    reply = _StreamingReply(thread)
+
     try:
-        response = requests.post(url, json=data, timeout=120)
-        response.raise_for_status()
-        result = response.json()
+        if ORCHESTRATOR_STREAMING:
+            try:
+                result = await _stream_answer(url + "/stream", data, reply)
+            except BaseException:
+                await reply.discard()
+                raise
+        else:
+            result = await post_json(url, data, timeout=ORCHESTRATOR_TIMEOUT)
 
         content = result.get("content", "")
         attachment_content = result.get("attachment_content")
         guardrail_triggered = result.get("guardrail_triggered", False)
 
         if guardrail_triggered:
-            await thread.send(content)
+            await reply.finish(content, [])
             await thread.edit(archived=True, locked=True)
             return
 
@@ -97,36 +213,27 @@ async def handle_with_orchestrator(
                 )
             ]
 
-        if files_to_send:
-            await thread.send(content=content, files=files_to_send)
-        else:
-            await thread.send(content)
-
-        bot_message = "Isso resolveu seu problema?\n ✅ Sim  ❌ Não\n\n"
-        if thread_db and thread_db.get("iteration_count", 0) >= 2:
-            bot_message = "Isso resolveu seu problema?\n ✅ Sim  ❌ Não  💬 Preciso de ajuda\n\n"
-
-        reaction_msg = await thread.send(bot_message)
-        await reaction_msg.add_reaction("✅")
-        await reaction_msg.add_reaction("❌")
-        if thread_db and thread_db.get("iteration_count", 0) >= 2:
-            await reaction_msg.add_reaction("💬")
+        # Resposta e pergunta "Isso resolveu?" numa mensagem só, com botões no lugar das reações
+        answer_msg = await reply.finish(
+            with_feedback_prompt(content), files_to_send, view=feedback_view(thread_db))
 
         if thread_db:
-            update_thread(str(thread.id), reaction_msg.id)
+            await update_thread(str(thread.id), answer_msg.id)
         else:
-            save_thread(
+            await save_thread(
                 str(thread.id),
                 int(thread.owner_id or message.author.id),
-                reaction_msg.id,
+                answer_msg.id,
             )
 
-    except requests.exceptions.Timeout:
+        await record_exchange(str(thread.id), history, user_message, content)
+
+    except asyncio.TimeoutError:
         await thread.send(
             f"Sua solicitação levou tempo demais para ser processada. Tente novamente. {message.author.mention}"
         )
         await thread.edit(locked=False)
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         logging.getLogger(__name__).exception(
             "Erro ao chamar orquestrador: %s", e)
         await thread.send(
@@ -2,14 +2,14 @@
     Handler do fluxo N8N: trigger via webhook e processamento de resposta no canal.
 """
 import asyncio
-import io
 
 import discord
-import requests
 from discord import Message
 from discord.ext import commands
 
-from utils.database import get_thread, save_thread, update_thread
+from bot_events.handlers.feedback import feedback_view, with_feedback_prompt
+from utils.repository import get_thread, save_thread, update_thread
+from utils.http_client import download_to_file, post_webhook
 
 
 async def handle_with_n8n(
@@ -36,16 +36,16 @@ async def handle_with_n8n(
     }
 
     try:
-        response = requests.post(webhook_url, json=data, timeout=10)
+        status = await post_webhook(webhook_url, data)
 
-        if response.status_code == 200:
+        if status == 200:
             await thread.send("Processando sua solicitação!")
         else:
             await thread.send(
                 f"Não foi possível analisar sua pergunta, por favor tente novamente! {message.author.mention}"
             )
             await thread.edit(locked=False)
-    except requests.exceptions.Timeout:
+    except asyncio.TimeoutError:
         await thread.send(
             f"Sua solicitação levou tempo de mais para ser processada, por favor tente novamente! {message.author.mention}"
         )
@@ -89,7 +89,7 @@ async def handle_n8n_webhook_response(bot: commands.Bot, message: Message) -> No
     if not isinstance(thread, discord.Thread):
         return
 
-    thread_db = get_thread(thread.id)
+    thread_db = await get_thread(thread.id)
 
     if thread_db and (
         thread_db["status"] == "closed" or thread_db["status"] == "pending_support"
@@ -102,42 +102,41 @@ async def handle_n8n_webhook_response(bot: commands.Bot, message: Message) -> No
         await thread.edit(archived=True, locked=True)
         return
 
-    bot_message_text = "Isso resolveu seu problema?\n ✅ Sim  ❌ Não\n\n"
-    if thread_db and thread_db.get("iteration_count", 0) >= 2:
-        bot_message_text = "Isso resolveu seu problema?\n ✅ Sim  ❌ Não  💬 Preciso de ajuda\n\n"
-
     files_to_send = []
     if message.attachments:
         attachment = message.attachments[0]
         try:
-            response = await asyncio.to_thread(
-                requests.get, attachment.url, timeout=30
-            )
-            response.raise_for_status()
+            fp = await download_to_file(attachment.url)
             filename = attachment.filename
             if filename.endswith(".txt"):
                 filename = filename[:-4] + ".md"
-            files_to_send = [
-                discord.File(fp=io.BytesIO(
-                    response.content), filename=filename)
-            ]
+            files_to_send = [discord.File(fp=fp, filename=filename)]
         except Exception as e:
             print(f"Erro ao baixar anexo para thread {thread.id}: {e}")
 
-    if files_to_send:
-        await thread.send(content=message.content, files=files_to_send)
-    else:
-        await thread.send(message.content)
+    # Resposta e pergunta "Isso resolveu?" numa mensagem só, com botões no lugar das reações
+    content = with_feedback_prompt(message.content)
+    view = feedback_view(thread_db)
 
-    bot_message = await thread.send(bot_message_text)
-    await bot_message.add_reaction("✅")
-    await bot_message.add_reaction("❌")
+    try:
+        if files_to_send:
+            answer_msg = await thread.send(content=content, files=files_to_send, view=view)
+        else:
+            answer_msg = await thread.send(content, view=view)
+
+    finally:
+        # discord.File não fecha arquivos abertos por quem chama: libera o temporário do anexo
+        for file in files_to_send:
+            file.close()
+            file.fp.close()
 
     if thread_db:
-        update_thread(thread.id, bot_message.id)
-        if thread_db.get("iteration_count", 0) >= 2:
-            await bot_message.add_reaction("💬")
+        await update_thread(thread.id, answer_msg.id)
+    else:
+        owner_id = thread.owner_id
+
+        if owner_id is None:
+            starter = await thread.fetch_message(thread.id)
+            owner_id = starter.author.id
 
-    if not thread_db:
-        starter = await thread.fetch_message(thread.id)
-        save_thread(thread_id, starter.author.id, bot_message.id)
+        await save_thread(thread_id, owner_id, answer_msg.id)
@@ -0,0 +1,175 @@
+"""
+    Perguntas como jobs duráveis: cada pergunta é gravada na tabela jobs antes de entrar no
+    question_scheduler e só sai dela quando o fluxo (orquestrador/N8N) termina. Se o bot
+    reiniciar no meio, o on_ready retoma os jobs que ficaram para trás (pelo menos uma vez).
+    Cada execução reserva o job por JOB_LEASE_SECONDS; após JOB_MAX_ATTEMPTS tentativas o job
+    é dado como falho, o usuário é avisado e a thread desbloqueada.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from typing import Dict
+
+import discord
+from discord import Message
+from discord.ext import commands
+
+from bot_events.handlers.mcp_handler import handle_with_orchestrator
+from bot_events.handlers.n8n_handler import handle_with_n8n
+from utils.question_scheduler import question_scheduler
+from utils.repository import (
+    complete_job,
+    enqueue_job,
+    fail_job,
+    get_resumable_jobs,
+    get_thread,
+    lease_job,
+    mark_job_failed,
+)
+
+# Maior que ORCHESTRATOR_TIMEOUT: o lease não vence com a chamada ainda em andamento
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# Identifica este processo nos leases: jobs em execução por outro processo foram interrompidos
+_OWNER = uuid.uuid4().hex
+
+_FAILED_MESSAGE = "Não foi possível processar sua solicitação. Tente novamente."
+
+# on_ready roda de novo a cada reconexão do gateway: a retomada só vale para o primeiro
+_resumed = False
+
+
+def job_kind() -> str | None:
+    """
+        Fluxo ativo no .env: 'orchestrator' (MCP) tem prioridade sobre 'n8n'.
+    """
+    if os.getenv("ORCHESTRATOR_URL"):
+        return "orchestrator"
+    if os.getenv("N8N_WEBHOOK_URL"):
+        return "n8n"
+    return None
+
+
+async def enqueue_question(thread: discord.Thread, message: Message, kind: str) -> Dict | None:
+    return await enqueue_job(str(thread.id), message.id, message.author.id, kind)
+
+
+async def _resolve_thread(bot: commands.Bot, thread_id: int) -> discord.Thread:
+    thread = bot.get_channel(thread_id)
+
+    if thread is None:
+        thread = await bot.fetch_channel(thread_id)
+
+    return thread
+
+
+async def _give_up(thread: discord.Thread | None, user_id: int) -> None:
+    if thread is None:
+        return
+
+    with_mention = f"{_FAILED_MESSAGE} <@{user_id}>"
+    await asyncio.gather(thread.send(with_mention), thread.edit(locked=False))
+
+
+async def run_question_job(
+    bot: commands.Bot,
+    job: Dict,
+    message: Message | None = None,
+) -> None:
+    """
+        Executa o job: reserva, responde pela thread e remove da fila. message vem do on_message;
+        em jobs retomados é buscada pelo message_id.
+    """
+    job_id = job["job_id"]
+
+    if not await lease_job(job_id, _OWNER, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS):
+        return
+
+    thread = None
+
+    try:
+        thread = await _resolve_thread(bot, int(job["thread_id"]))
+
+        if message is None:
+            message = await thread.fetch_message(job["message_id"])
+
+        # Thread respondida ou encaminhada ao suporte enquanto o job esperava
+        thread_db = await get_thread(thread.id)
+
+        if thread_db and thread_db["status"] in ("closed", "pending_support"):
+            await complete_job(job_id)
+            return
+
+        if job["kind"] == "orchestrator":
+            await handle_with_orchestrator(
+                bot, thread, message, os.environ["ORCHESTRATOR_URL"], thread_db
+            )
+        else:
+            await handle_with_n8n(thread, message, os.environ["N8N_WEBHOOK_URL"])
+
+    except discord.NotFound:
+        # Thread ou pergunta apagada: não há o que responder
+        await complete_job(job_id)
+        return
+
+    except Exception as e:
+        logging.getLogger(__name__).exception(
+            "Erro no job %s da thread %s: %s", job_id, job["thread_id"], e)
+        status = await fail_job(job_id, repr(e), JOB_MAX_ATTEMPTS)
+
+        if status == "queued":
+            position = question_scheduler.submit(
+                job["thread_id"], job["user_id"], lambda: run_question_job(bot, job, message))
+
+            if position is not None:
+                return
+
+            # Fila cheia: sem lugar para a nova tentativa, o job não pode ficar esquecido no banco
+            await mark_job_failed(job_id, "fila cheia na nova tentativa")
+            status = "failed"
+
+        if status == "failed":
+            await _give_up(thread, job["user_id"])
+        return
+
+    await complete_job(job_id)
+
+
+async def resume_jobs(bot: commands.Bot) -> int:
+    """
+        Recoloca no question_scheduler os jobs interrompidos por um restart (chamado no on_ready).
+        Jobs sem tentativas restantes são dados como falhos. Retorna quantos foram retomados.
+        Só roda uma vez por processo: numa reconexão os jobs já estão no scheduler.
+    """
+    global _resumed
+
+    if _resumed:
+        return 0
+
+    _resumed = True
+    resumed = 0
+
+    for job in await get_resumable_jobs(_OWNER):
+        if job["attempts"] >= JOB_MAX_ATTEMPTS:
+            await mark_job_failed(job["job_id"], "tentativas esgotadas")
+
+            try:
+                thread = await _resolve_thread(bot, int(job["thread_id"]))
+            except discord.HTTPException:
+                thread = None
+
+            await _give_up(thread, job["user_id"])
+            continue
+
+        position = question_scheduler.submit(
+            job["thread_id"], job["user_id"],
+            lambda job=job: run_question_job(bot, job),
+        )
+
+        # Fila cheia: o job continua no banco e volta no próximo on_ready
+        if position is not None:
+            resumed += 1
+
+    return resumed
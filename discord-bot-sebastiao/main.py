@@ -11,6 +11,12 @@ from discord.ext import commands
 # MODULES IMPORTS
 from bot_events import handle_events
 from bot_commands import handle_questions
+from bot_events.handlers import FeedbackView, archival_worker
+from utils.database import close_connection
+from utils.db_worker import db_worker
+from utils.http_client import close_http_session
+from utils.maintenance import maintenance
+from utils.question_scheduler import question_scheduler
 
 # STEP 0: LOAD OUR DISCORD TOKEN FROM A SOMEWHERE SAFE
 load_dotenv()
@@ -23,11 +29,28 @@ log_file_path = project_root / 'discord.log'
 handler = logging.FileHandler(
     filename=str(log_file_path), encoding='utf-8', mode='a')
 
+
+class SebastiaoBot(commands.Bot):
+    async def setup_hook(self) -> None:
+        # Botões de feedback persistentes: continuam respondendo nas mensagens anteriores ao restart
+        self.add_view(FeedbackView())
+
+    async def close(self) -> None:
+        # Cancela perguntas, arquivamentos e manutenção em andamento e fecha o pool HTTP, a fila do banco e a conexão
+        await question_scheduler.stop()
+        await archival_worker.stop()
+        await maintenance.stop()
+        await close_http_session()
+        await db_worker.stop()
+        close_connection()
+        await super().close()
+
+
 # STEP 1: BOT SETUP
 intents: Intents = Intents.default()
 intents.message_content = True  # NOQA
 intents.members = True  # NOQA
-bot: commands.Bot = commands.Bot(
+bot: commands.Bot = SebastiaoBot(
     command_prefix='!',
     intents=intents,
     help_command=None  # Desabilita comando help padrão
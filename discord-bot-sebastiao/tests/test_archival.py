@@ -0,0 +1,87 @@
+"""
+    Testes do worker de arquivamento (lotes, pins() só para threads fora do banco ou fechadas sem closed_message_id).
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bot_events.handlers import archival
+from bot_events.handlers.archival import ArchivalWorker
+
+
+def _thread(thread_id, locked=False):
+    thread = MagicMock()
+    thread.id = thread_id
+    thread.locked = locked
+    thread.send = AsyncMock(return_value=MagicMock(id=thread_id * 10, pin=AsyncMock()))
+    thread.edit = AsyncMock()
+    thread.pins = AsyncMock(return_value=[])
+    return thread
+
+
+def _row(thread_id, closed_message_id=None):
+    return {"thread_id": str(thread_id), "user_id": 1, "message_id": 5, "iteration_count": 0,
+            "status": "closed" if closed_message_id else "pending",
+            "closed_message_id": closed_message_id}
+
+
+class TestArchivalWorker:
+    @pytest.mark.asyncio
+    async def test_lote_consulta_e_grava_uma_vez(self):
+        done, pending, unknown = _thread(1, locked=True), _thread(2), _thread(3)
+        rows = {"1": _row(1, closed_message_id=99), "2": _row(2)}
+
+        with (
+            patch.object(archival, "get_threads", new=AsyncMock(return_value=rows)) as mock_get,
+            patch.object(archival, "close_threads", new_callable=AsyncMock) as mock_close,
+        ):
+            await ArchivalWorker(interval=0).process([done, pending, unknown])
+
+        mock_get.assert_awaited_once_with([1, 2, 3])
+        mock_close.assert_awaited_once_with([("1", None), ("2", 20)])
+
+        # Encerramento já registrado: nenhuma chamada à API
+        done.pins.assert_not_called()
+        done.send.assert_not_called()
+        done.edit.assert_not_called()
+
+        # Registrada e ainda aberta: envia, fixa e bloqueia sem consultar os fixados
+        pending.pins.assert_not_called()
+        pending.send.assert_awaited_once_with("**Atendimento encerrado**")
+        pending.edit.assert_awaited_once_with(archived=True, locked=True)
+
+        # Fora do banco: também confere os fixados
+        unknown.pins.assert_awaited_once()
+        unknown.send.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fechada_antes_da_coluna_nao_recebe_outra_mensagem(self):
+        legacy = _thread(4)
+        pin = MagicMock(id=77, author=legacy.guild.me, content="**Atendimento encerrado**")
+        legacy.pins = AsyncMock(return_value=[pin])
+        rows = {"4": {**_row(4), "status": "closed"}}
+
+        with (
+            patch.object(archival, "get_threads", new=AsyncMock(return_value=rows)),
+            patch.object(archival, "close_threads", new_callable=AsyncMock) as mock_close,
+        ):
+            await ArchivalWorker(interval=0).process([legacy])
+
+        legacy.send.assert_not_called()
+        legacy.edit.assert_awaited_once_with(archived=True, locked=True)
+        mock_close.assert_awaited_once_with([("4", 77)])
+
+    @pytest.mark.asyncio
+    async def test_arquivamentos_repetidos_viram_um_item(self):
+        worker = ArchivalWorker(batch_size=10, interval=0)
+        thread = _thread(1)
+
+        with patch.object(worker, "process", new_callable=AsyncMock) as mock_process:
+            worker.submit(thread)
+            worker.submit(thread)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+        mock_process.assert_awaited_once_with([thread])
+        await worker.stop()
@@ -0,0 +1,135 @@
+"""
+    Testes da camada SQLite (conexão persistente em WAL, migrações do schema).
+"""
+import sqlite3
+
+import pytest
+
+from utils import database
+from utils.migrations import SCHEMA_VERSION, migrate
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Aponta o módulo para um banco temporário com a tabela criada."""
+    database.close_connection()
+    monkeypatch.setattr(database, "DB_FILE", tmp_path / "threads.db")
+    database.init_database()
+    yield database
+    database.close_connection()
+
+
+def test_conexao_persistente_em_wal(db):
+    with db.get_connection() as first:
+        mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+        sync = first.execute("PRAGMA synchronous").fetchone()[0]
+
+    with db.get_connection() as second:
+        assert second is first
+
+    assert mode == "wal"
+    assert sync == 1  # NORMAL
+
+
+def test_ciclo_de_vida_da_thread(db):
+    assert db.save_thread("111", 12345, 999)
+    assert db.get_thread("111")["iteration_count"] == 0
+
+    assert db.update_thread("111", 1000, "pending_support")
+    thread = db.get_thread("111")
+    assert thread["message_id"] == 1000
+    assert thread["status"] == "pending_support"
+    assert thread["iteration_count"] == 1
+
+    assert db.close_thread("111")
+    assert db.get_thread("111")["status"] == "closed"
+    assert db.delete_thread("111")
+    assert db.get_thread("111") is None
+
+
+def test_rollback_em_erro_mantem_conexao_utilizavel(db):
+    with pytest.raises(RuntimeError):
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO threads (thread_id, user_id, message_id, iteration_count) VALUES ('1', 1, 1, 0)")
+            raise RuntimeError("falha")
+
+    assert db.get_thread("1") is None
+    assert db.save_thread("1", 1, 1)
+
+
+def test_job_reservado_uma_vez_e_retomado_apos_restart(db):
+    job = db.enqueue_job("111", 999, 12345, "orchestrator")
+    assert job["status"] == "queued"
+
+    assert db.lease_job(job["job_id"], "proc-a", 300, 3)
+    # Mesmo processo, lease válido: não reserva de novo
+    assert not db.lease_job(job["job_id"], "proc-a", 300, 3)
+    assert db.get_resumable_jobs("proc-a") == []
+
+    # Outro processo (bot reiniciado) retoma o job interrompido
+    [resumed] = db.get_resumable_jobs("proc-b")
+    assert resumed["job_id"] == job["job_id"]
+    assert db.lease_job(job["job_id"], "proc-b", 300, 3)
+
+    assert db.complete_job(job["job_id"])
+    assert db.get_resumable_jobs("proc-c") == []
+
+
+def test_job_falha_depois_das_tentativas(db):
+    job = db.enqueue_job("111", 999, 12345, "n8n")
+
+    assert db.lease_job(job["job_id"], "proc", 300, 2)
+    assert db.fail_job(job["job_id"], "erro 1", 2) == "queued"
+    assert db.lease_job(job["job_id"], "proc", 300, 2)
+    assert db.fail_job(job["job_id"], "erro 2", 2) == "failed"
+    assert not db.lease_job(job["job_id"], "proc", 300, 2)
+
+
+def test_fechamento_em_lote_guarda_a_mensagem_de_encerramento(db):
+    db.save_thread("1", 10, 100)
+    db.save_thread("2", 20, 200)
+    assert db.close_thread("1", 555)
+
+    rows = db.close_threads([("1", None), ("2", 777), ("3", 999)])
+
+    closed = {row["thread_id"]: row for row in rows}
+    assert set(closed) == {"1", "2"}
+    assert closed["1"]["closed_message_id"] == 555  # None não apaga a mensagem já registrada
+    assert closed["2"]["closed_message_id"] == 777
+    assert all(row["status"] == "closed" for row in rows)
+
+
+def test_migra_banco_antigo_sem_perder_dados(tmp_path, monkeypatch):
+    """Banco de antes do versionamento (user_version 0, sem colunas novas) é migrado no init."""
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute("""
+      CREATE TABLE threads (
+        thread_id TEXT PRIMARY KEY, user_id INTEGER NOT NULL, message_id INTEGER NOT NULL,
+        iteration_count INTEGER NOT NULL, status TEXT DEFAULT 'pending', closed_at REAL)
+    """)
+    legacy.execute("INSERT INTO threads VALUES ('1', 10, 100, 2, 'closed', 2460000.5)")
+    legacy.commit()
+    legacy.close()
+
+    database.close_connection()
+    monkeypatch.setattr(database, "DB_FILE", path)
+    database.init_database()
+
+    try:
+        with database.get_connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+            # Convertido pela migração (VACUUM na inicialização, não na manutenção)
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            row = conn.execute("SELECT * FROM threads WHERE thread_id = '1'").fetchone()
+            plan = " ".join(r[-1] for r in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM threads WHERE status = 'pending' OR status = 'pending_support'"))
+
+        assert (row["iteration_count"], row["created_at"]) == (2, 2460000.5)
+        assert "idx_threads_status_closed_at" in plan
+
+        # Segunda inicialização não reaplica nada
+        assert migrate(database._conn) == (SCHEMA_VERSION, SCHEMA_VERSION)
+    finally:
+        database.close_connection()
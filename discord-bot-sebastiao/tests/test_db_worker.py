@@ -0,0 +1,63 @@
+"""
+    Testes da fila do banco (DbWorker) e da API assíncrona (utils.repository).
+"""
+import threading
+
+import pytest
+
+from utils import database, repository
+from utils.thread_cache import thread_cache
+from utils.db_worker import DbWorker
+
+
+@pytest.mark.asyncio
+async def test_operacoes_rodam_em_ordem_fora_do_event_loop():
+    worker = DbWorker()
+    seen = []
+
+    def op(value):
+        seen.append((value, threading.current_thread().name))
+        return value * 2
+
+    try:
+        results = [await worker.call(op, i) for i in range(3)]
+    finally:
+        await worker.stop()
+
+    assert results == [0, 2, 4]
+    assert [v for v, _ in seen] == [0, 1, 2]
+    assert all(name == "db-worker" for _, name in seen)
+
+
+@pytest.mark.asyncio
+async def test_excecao_e_repassada_e_estatisticas_registradas():
+    worker = DbWorker()
+
+    def falha():
+        raise ValueError("banco travado")
+
+    try:
+        with pytest.raises(ValueError):
+            await worker.call(falha)
+    finally:
+        await worker.stop()
+
+    stats = worker.snapshot()
+    assert stats["queue_depth"] == 0
+    assert stats["operations"]["falha"]["count"] == 1
+    assert stats["operations"]["falha"]["max_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_repository_usa_o_banco(tmp_path, monkeypatch):
+    database.close_connection()
+    monkeypatch.setattr(database, "DB_FILE", tmp_path / "threads.db")
+
+    try:
+        await repository.init_database()
+        assert await repository.save_thread("111", 12345, 999)
+        assert (await repository.get_thread("111"))["message_id"] == 999
+        assert repository.db_stats()["operations"]["save_thread"]["count"] >= 1
+    finally:
+        thread_cache.clear()
+        database.close_connection()
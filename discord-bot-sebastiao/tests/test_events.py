@@ -0,0 +1,142 @@
+"""
+    Testes dos eventos do bot (set_events) com um bot falso que guarda os handlers registrados.
+"""
+import builtins
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bot_events import handle_events
+from bot_events.handlers import feedback
+from utils.thread_cache import prompt_index
+
+
+class FakeBot:
+    """Substitui commands.Bot: @bot.event só registra a coroutine pelo nome."""
+
+    def __init__(self):
+        self.events = {}
+        self.user = MagicMock()
+        self.get_channel = MagicMock()
+        self.fetch_channel = AsyncMock()
+
+    def event(self, coro):
+        self.events[coro.__name__] = coro
+        return coro
+
+
+@pytest.fixture
+def bot():
+    fake = FakeBot()
+    handle_events.set_events(fake)
+    return fake
+
+
+@pytest.fixture
+def prompt(bot, mock_thread):
+    """Registra a mensagem 555 como prompt da thread 111 e deixa a thread no cache do bot."""
+    prompt_index.set("111", 555)
+    bot.get_channel.return_value = mock_thread
+    yield
+    prompt_index.clear()
+
+
+def _payload(emoji, user_id=12345, message_id=555):
+    member = MagicMock()
+    member.bot = False
+    return SimpleNamespace(
+        message_id=message_id,
+        channel_id=111,
+        user_id=user_id,
+        member=member,
+        emoji=emoji,
+    )
+
+
+builtins_isinstance = builtins.isinstance
+
+THREAD_DB = {"thread_id": "111", "user_id": 12345, "message_id": 555,
+             "iteration_count": 1, "status": "pending"}
+
+
+class TestOnRawReactionAdd:
+    @pytest.mark.asyncio
+    async def test_autor_confirma_sem_chamar_a_api(self, bot, mock_thread, prompt):
+        mock_thread.fetch_message = AsyncMock()
+
+        with (
+            patch.object(handle_events, "get_thread", new=AsyncMock(return_value=THREAD_DB)),
+            patch.object(feedback, "close_thread", new_callable=AsyncMock) as mock_close,
+        ):
+            await bot.events["on_raw_reaction_add"](_payload("✅"))
+
+        mock_thread.fetch_message.assert_not_called()
+        bot.fetch_channel.assert_not_called()
+        mock_close.assert_awaited_once_with(111, mock_thread.send.return_value.id)
+
+    @pytest.mark.asyncio
+    async def test_reacao_fora_do_indice_nao_consulta_o_banco(self, bot, prompt):
+        with patch.object(handle_events, "get_thread", new_callable=AsyncMock) as mock_get:
+            await bot.events["on_raw_reaction_add"](_payload("✅", message_id=1))
+            await bot.events["on_raw_reaction_add"](_payload("👍"))
+
+        mock_get.assert_not_called()
+        bot.get_channel.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reacao_de_outro_usuario_e_ignorada(self, bot, mock_thread, prompt):
+        with (
+            patch.object(handle_events, "get_thread", new=AsyncMock(return_value=THREAD_DB)),
+            patch.object(feedback, "close_thread", new_callable=AsyncMock) as mock_close,
+        ):
+            await bot.events["on_raw_reaction_add"](_payload("✅", user_id=999))
+
+        mock_thread.send.assert_not_called()
+        mock_close.assert_not_called()
+
+
+class TestOnMessage:
+    @pytest.fixture(autouse=True)
+    def _mensagem_na_thread(self, mock_thread, mock_message, monkeypatch):
+        """Mensagem postada na thread mockada, com o fluxo MCP ativo."""
+        monkeypatch.setenv("ORCHESTRATOR_URL", "http://orchestrator.local")
+        mock_message.channel = mock_thread
+        with (
+            patch.object(handle_events, "isinstance", create=True,
+                         new=lambda obj, cls: obj is mock_thread or builtins_isinstance(obj, cls)),
+            patch.object(handle_events, "enqueue_question", new=AsyncMock(return_value={"job_id": 7})),
+        ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_pergunta_na_fila_recebe_posicao(self, bot, mock_thread, mock_message):
+        scheduler = MagicMock()
+        scheduler.submit.return_value = 3
+
+        with (
+            patch.object(handle_events, "get_thread", new=AsyncMock(return_value=None)),
+            patch.object(handle_events, "question_scheduler", new=scheduler),
+        ):
+            await bot.events["on_message"](mock_message)
+
+        assert scheduler.submit.call_args.args[:2] == (111, mock_message.author.id)
+        mock_thread.send.assert_called_once_with(
+            "Solicitação recebida, você está na fila, posição 3.")
+        mock_thread.edit.assert_called_once_with(locked=True)
+
+    @pytest.mark.asyncio
+    async def test_fila_cheia_nao_bloqueia_a_thread(self, bot, mock_thread, mock_message):
+        scheduler = MagicMock()
+        scheduler.submit.return_value = None
+
+        with (
+            patch.object(handle_events, "get_thread", new=AsyncMock(return_value=None)),
+            patch.object(handle_events, "question_scheduler", new=scheduler),
+            patch.object(handle_events, "complete_job", new_callable=AsyncMock) as mock_complete,
+        ):
+            await bot.events["on_message"](mock_message)
+
+        assert "muitas solicitações" in mock_thread.send.call_args.args[0]
+        mock_thread.edit.assert_not_called()
+        mock_complete.assert_awaited_once_with(7)
@@ -0,0 +1,98 @@
+"""
+    Testes da pergunta de feedback em botões (FeedbackView) e da decisão do autor da thread.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bot_events.handlers import feedback
+from bot_events.handlers.feedback import (
+    FeedbackView,
+    apply_feedback,
+    feedback_view,
+    handle_feedback_interaction,
+    with_feedback_prompt,
+)
+
+THREAD_DB = {"thread_id": "111", "user_id": 12345, "message_id": 555,
+             "iteration_count": 2, "status": "pending"}
+
+
+def _interaction(mock_thread, user_id=12345, message_id=555):
+    interaction = MagicMock()
+    interaction.channel = mock_thread
+    interaction.user.id = user_id
+    interaction.message.id = message_id
+    interaction.response.send_message = AsyncMock()
+    interaction.response.defer = AsyncMock()
+    return interaction
+
+
+class TestFeedbackView:
+    @pytest.mark.asyncio
+    async def test_botao_de_ajuda_so_a_partir_da_terceira_resposta(self):
+        assert [b.custom_id for b in feedback_view(None).children] == [
+            "feedback:yes", "feedback:no"]
+        assert [b.custom_id for b in feedback_view(THREAD_DB).children] == [
+            "feedback:yes", "feedback:no", "feedback:support"]
+        assert FeedbackView().is_persistent()
+
+    def test_pergunta_so_entra_se_couber_na_mensagem(self):
+        assert with_feedback_prompt("Oi").endswith("**Isso resolveu seu problema?**")
+        assert with_feedback_prompt("x" * 1990) == "x" * 1990
+
+
+class TestHandleFeedbackInteraction:
+    @pytest.mark.asyncio
+    async def test_outro_usuario_recebe_aviso_efemero(self, mock_thread):
+        interaction = _interaction(mock_thread, user_id=999)
+
+        with (
+            patch.object(feedback, "get_thread", new=AsyncMock(return_value=THREAD_DB)),
+            patch.object(feedback, "apply_feedback", new_callable=AsyncMock) as mock_apply,
+        ):
+            await handle_feedback_interaction(interaction, "✅")
+
+        assert interaction.response.send_message.call_args.kwargs["ephemeral"] is True
+        mock_apply.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_pergunta_antiga_nao_e_aplicada(self, mock_thread):
+        interaction = _interaction(mock_thread, message_id=1)
+
+        with (
+            patch.object(feedback, "get_thread", new=AsyncMock(return_value=THREAD_DB)),
+            patch.object(feedback, "apply_feedback", new_callable=AsyncMock) as mock_apply,
+        ):
+            await handle_feedback_interaction(interaction, "✅")
+
+        interaction.response.send_message.assert_called_once()
+        mock_apply.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_autor_confirma(self, mock_thread):
+        interaction = _interaction(mock_thread)
+
+        with (
+            patch.object(feedback, "get_thread", new=AsyncMock(return_value=THREAD_DB)),
+            patch.object(feedback, "close_thread", new_callable=AsyncMock) as mock_close,
+        ):
+            await handle_feedback_interaction(interaction, "✅")
+
+        interaction.response.defer.assert_awaited_once()
+        mock_close.assert_awaited_once_with(111, mock_thread.send.return_value.id)
+
+
+class TestApplyFeedback:
+    @pytest.mark.asyncio
+    async def test_pedido_de_ajuda_avisa_thread_banco_e_suporte(self, mock_bot, mock_thread):
+        support = MagicMock()
+        support.send = AsyncMock()
+        mock_bot.get_channel = MagicMock(return_value=support)
+
+        with patch.object(feedback, "update_thread", new_callable=AsyncMock) as mock_update:
+            await apply_feedback(mock_bot, mock_thread, THREAD_DB, "💬", 12345)
+
+        assert mock_thread.send.call_args.args[0].startswith("Ok 👍 Vou sinalizar")
+        mock_update.assert_awaited_once_with(111, 555, "pending_support")
+        assert "<#111>" in support.send.call_args.kwargs["embed"].description
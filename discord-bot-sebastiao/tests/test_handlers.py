@@ -1,13 +1,17 @@
 """
     Testes unitários dos handlers MCP e N8N.
 """
+import asyncio
 import builtins
+import tempfile
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import discord
 import pytest
 
+from bot_events.handlers.feedback import FeedbackView
 from bot_events.handlers.mcp_handler import handle_with_orchestrator
 from bot_events.handlers.n8n_handler import handle_n8n_webhook_response, handle_with_n8n
 
@@ -22,9 +26,24 @@ def _patched_isinstance(obj, cls):
     return _original_isinstance(obj, cls)
 
 
+@pytest.fixture(autouse=True)
+def _historico_sem_banco():
+    """Handler MCP: histórico sempre remontado da thread e gravação simulada."""
+    with (
+        patch("bot_events.handlers.mcp_handler.get_thread_history", new=AsyncMock(return_value=None)),
+        patch("bot_events.handlers.mcp_handler.record_exchange", new_callable=AsyncMock),
+    ):
+        yield
+
+
 class TestMcpHandler:
     """Testes do handler MCP (orquestrador)."""
 
+    @pytest.fixture(autouse=True)
+    def _sem_streaming(self):
+        with patch("bot_events.handlers.mcp_handler.ORCHESTRATOR_STREAMING", False):
+            yield
+
     @pytest.mark.asyncio
     async def test_handle_with_orchestrator_sucesso(
         self, mock_bot, mock_thread, mock_message, mock_reaction_msg
@@ -32,25 +51,26 @@ class TestMcpHandler:
         """Resposta normal: envia conteúdo na thread e registra no banco."""
         with (
             patch(
-                "bot_events.handlers.mcp_handler.requests.post",
-                return_value=MagicMock(
-                    raise_for_status=MagicMock(),
-                    json=lambda: {
-                        "content": "Para configurar o frete, acesse...",
-                        "attachment_content": None,
-                        "guardrail_triggered": False,
-                    },
-                ),
+                "bot_events.handlers.mcp_handler.post_json",
+                new=AsyncMock(return_value={
+                    "content": "Para configurar o frete, acesse...",
+                    "attachment_content": None,
+                    "guardrail_triggered": False,
+                }),
             ),
-            patch("bot_events.handlers.mcp_handler.update_thread") as mock_update,
-            patch("bot_events.handlers.mcp_handler.save_thread") as mock_save,
+            patch("bot_events.handlers.mcp_handler.update_thread", new_callable=AsyncMock) as mock_update,
+            patch("bot_events.handlers.mcp_handler.save_thread", new_callable=AsyncMock) as mock_save,
         ):
             thread_db = {"thread_id": "111", "iteration_count": 1}
             await handle_with_orchestrator(
                 mock_bot, mock_thread, mock_message, "http://orchestrator.local", thread_db
             )
 
-            mock_thread.send.assert_called()
+            # Resposta, pergunta e botões numa única mensagem
+            mock_thread.send.assert_called_once()
+            assert mock_thread.send.call_args.args[0].endswith("**Isso resolveu seu problema?**")
+            assert isinstance(mock_thread.send.call_args.kwargs["view"], FeedbackView)
+            mock_reaction_msg.add_reaction.assert_not_called()
             mock_update.assert_called_once_with("111", mock_reaction_msg.id)
             mock_save.assert_not_called()
 
@@ -61,18 +81,15 @@ class TestMcpHandler:
         """Primeira mensagem: salva thread no banco (não atualiza)."""
         with (
             patch(
-                "bot_events.handlers.mcp_handler.requests.post",
-                return_value=MagicMock(
-                    raise_for_status=MagicMock(),
-                    json=lambda: {
-                        "content": "Resposta curta",
-                        "attachment_content": None,
-                        "guardrail_triggered": False,
-                    },
-                ),
+                "bot_events.handlers.mcp_handler.post_json",
+                new=AsyncMock(return_value={
+                    "content": "Resposta curta",
+                    "attachment_content": None,
+                    "guardrail_triggered": False,
+                }),
             ),
-            patch("bot_events.handlers.mcp_handler.update_thread") as mock_update,
-            patch("bot_events.handlers.mcp_handler.save_thread") as mock_save,
+            patch("bot_events.handlers.mcp_handler.update_thread", new_callable=AsyncMock) as mock_update,
+            patch("bot_events.handlers.mcp_handler.save_thread", new_callable=AsyncMock) as mock_save,
         ):
             await handle_with_orchestrator(
                 mock_bot, mock_thread, mock_message, "http://orchestrator.local", None
@@ -88,15 +105,12 @@ class TestMcpHandler:
     ):
         """Guardrail disparado: envia mensagem e arquiva a thread."""
         with patch(
-            "bot_events.handlers.mcp_handler.requests.post",
-            return_value=MagicMock(
-                raise_for_status=MagicMock(),
-                json=lambda: {
-                    "content": "Sua mensagem foi bloqueada.",
-                    "attachment_content": None,
-                    "guardrail_triggered": True,
-                },
-            ),
+            "bot_events.handlers.mcp_handler.post_json",
+            new=AsyncMock(return_value={
+                "content": "Sua mensagem foi bloqueada.",
+                "attachment_content": None,
+                "guardrail_triggered": True,
+            }),
         ):
             await handle_with_orchestrator(
                 mock_bot, mock_thread, mock_message, "http://orchestrator.local", None
@@ -110,11 +124,9 @@ class TestMcpHandler:
         self, mock_bot, mock_thread, mock_message
     ):
         """Timeout: envia mensagem de erro e desbloqueia a thread."""
-        import requests
-
         with patch(
-            "bot_events.handlers.mcp_handler.requests.post",
-            side_effect=requests.exceptions.Timeout(),
+            "bot_events.handlers.mcp_handler.post_json",
+            new=AsyncMock(side_effect=asyncio.TimeoutError()),
         ):
             await handle_with_orchestrator(
                 mock_bot, mock_thread, mock_message, "http://orchestrator.local", None
@@ -124,21 +136,38 @@ class TestMcpHandler:
             assert "tempo demais" in mock_thread.send.call_args[0][0].lower()
             mock_thread.edit.assert_called_once_with(locked=False)
 
+    @pytest.mark.asyncio
+    async def test_handle_with_orchestrator_erro_http(
+        self, mock_bot, mock_thread, mock_message
+    ):
+        """Erro HTTP/conexão: envia mensagem de falha e desbloqueia a thread."""
+        with patch(
+            "bot_events.handlers.mcp_handler.post_json",
+            new=AsyncMock(side_effect=aiohttp.ClientError("falha")),
+        ):
+            await handle_with_orchestrator(
+                mock_bot, mock_thread, mock_message, "http://orchestrator.local", None
+            )
+
+            assert "Não foi possível" in mock_thread.send.call_args[0][0]
+            mock_thread.edit.assert_called_once_with(locked=False)
+
     @pytest.mark.asyncio
     async def test_handle_with_orchestrator_payload_correto(
         self, mock_bot, mock_thread, mock_message
     ):
         """Verifica se o payload enviado ao orquestrador está correto."""
         with (
-            patch("bot_events.handlers.mcp_handler.requests.post") as mock_post,
-            patch("bot_events.handlers.mcp_handler.update_thread"),
+            patch(
+                "bot_events.handlers.mcp_handler.post_json",
+                new=AsyncMock(return_value={
+                    "content": "OK",
+                    "attachment_content": None,
+                    "guardrail_triggered": False,
+                }),
+            ) as mock_post,
+            patch("bot_events.handlers.mcp_handler.update_thread", new_callable=AsyncMock),
         ):
-            mock_post.return_value.raise_for_status = MagicMock()
-            mock_post.return_value.json.return_value = {
-                "content": "OK",
-                "attachment_content": None,
-                "guardrail_triggered": False,
-            }
             thread_db = {"thread_id": "111"}
             await handle_with_orchestrator(
                 mock_bot,
@@ -149,9 +178,7 @@ class TestMcpHandler:
             )
 
             mock_post.assert_called_once()
-            call_kwargs = mock_post.call_args[1]
-            assert "json" in call_kwargs
-            data = call_kwargs["json"]
+            data = mock_post.call_args[0][1]
             assert data["message"] == "Como configuro o frete?"
             assert data["discord"]["thread_id"] == "111"
             assert data["discord"]["channel_id"] == "222"
@@ -159,6 +186,161 @@ class TestMcpHandler:
             assert data["history"] == []
             assert mock_post.call_args[0][0] == "https://api.example.com/answer"
 
+    @pytest.mark.asyncio
+    async def test_historico_em_cache_nao_le_a_thread(
+        self, mock_bot, mock_thread, mock_message
+    ):
+        """Com histórico em memória/banco, não pagina thread.history e grava a nova troca."""
+        cached = [
+            {"role": "user", "content": "Como configuro o frete?"},
+            {"role": "assistant", "content": "Acesse Configurações > Frete."},
+        ]
+        with (
+            patch(
+                "bot_events.handlers.mcp_handler.post_json",
+                new=AsyncMock(return_value={
+                    "content": "Use a tabela de frete.",
+                    "attachment_content": None,
+                    "guardrail_triggered": False,
+                }),
+            ) as mock_post,
+            patch("bot_events.handlers.mcp_handler.get_thread_history", new=AsyncMock(return_value=cached)),
+            patch("bot_events.handlers.mcp_handler.record_exchange", new_callable=AsyncMock) as mock_record,
+            patch("bot_events.handlers.mcp_handler.update_thread", new_callable=AsyncMock),
+        ):
+            await handle_with_orchestrator(
+                mock_bot, mock_thread, mock_message, "http://orchestrator.local", {"thread_id": "111"}
+            )
+
+        mock_thread.history.assert_not_called()
+        assert mock_post.call_args[0][1]["history"] == cached
+        mock_record.assert_awaited_once_with(
+            "111", cached, "Como configuro o frete?", "Use a tabela de frete.")
+
+
+def _stream_of(*events):
+    """Substituto de stream_ndjson que gera os eventos dados."""
+    async def fake_stream(url, data, timeout):
+        for event in events:
+            yield event
+    return MagicMock(side_effect=fake_stream)
+
+
+class TestMcpHandlerStreaming:
+    """Testes do handler MCP consumindo /answer/stream."""
+
+    @pytest.fixture(autouse=True)
+    def _com_streaming(self):
+        with (
+            patch("bot_events.handlers.mcp_handler.ORCHESTRATOR_STREAMING", True),
+            patch("bot_events.handlers.mcp_handler.STREAM_EDIT_INTERVAL", 0),
+        ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_edita_uma_mensagem_conforme_o_texto_chega(
+        self, mock_bot, mock_thread, mock_message, mock_reaction_msg
+    ):
+        """Primeiro trecho cria a mensagem; os seguintes a editam; a edição final traz pergunta e botões."""
+        stream = _stream_of(
+            {"type": "delta", "content": "Para configurar"},
+            {"type": "delta", "content": " o frete, acesse..."},
+            {"type": "done", "content": "Para configurar o frete, acesse...",
+             "attachment_content": None, "guardrail_triggered": False},
+        )
+        with (
+            patch("bot_events.handlers.mcp_handler.stream_ndjson", new=stream),
+            patch("bot_events.handlers.mcp_handler.update_thread", new_callable=AsyncMock) as mock_update,
+        ):
+            await handle_with_orchestrator(
+                mock_bot, mock_thread, mock_message, "http://orchestrator.local/", {"thread_id": "111"}
+            )
+
+        assert stream.call_args[0][0] == "http://orchestrator.local/answer/stream"
+        mock_thread.send.assert_called_once_with("Para configurar")
+        final = mock_reaction_msg.edit.call_args
+        assert final.kwargs["content"] == "Para configurar o frete, acesse...\n\n**Isso resolveu seu problema?**"
+        assert isinstance(final.kwargs["view"], FeedbackView)
+        mock_update.assert_called_once_with("111", mock_reaction_msg.id)
+
+    @pytest.mark.asyncio
+    async def test_reset_apaga_o_texto_ja_enviado(
+        self, mock_bot, mock_thread, mock_message, mock_reaction_msg
+    ):
+        stream = _stream_of(
+            {"type": "delta", "content": "Vou consultar a documentação."},
+            {"type": "reset"},
+            {"type": "delta", "content": "Para configurar o frete"},
+            {"type": "done", "content": "Para configurar o frete",
+             "attachment_content": None, "guardrail_triggered": False},
+        )
+        with (
+            patch("bot_events.handlers.mcp_handler.stream_ndjson", new=stream),
+            patch("bot_events.handlers.mcp_handler.update_thread", new_callable=AsyncMock),
+        ):
+            await handle_with_orchestrator(
+                mock_bot, mock_thread, mock_message, "http://orchestrator.local", {"thread_id": "111"}
+            )
+
+        mock_reaction_msg.delete.assert_called_once()
+        assert [c.args[0] for c in mock_thread.send.call_args_list] == [
+            "Vou consultar a documentação.", "Para configurar o frete"]
+
+    @pytest.mark.asyncio
+    async def test_resposta_longa_vira_preview_com_anexo_na_mesma_mensagem(
+        self, mock_bot, mock_thread, mock_message, mock_reaction_msg
+    ):
+        stream = _stream_of(
+            {"type": "delta", "content": "x" * 2500},
+            {"type": "done", "content": "preview", "attachment_content": "x" * 2500,
+             "guardrail_triggered": False},
+        )
+        with (
+            patch("bot_events.handlers.mcp_handler.stream_ndjson", new=stream),
+            patch("bot_events.handlers.mcp_handler.save_thread", new_callable=AsyncMock),
+        ):
+            await handle_with_orchestrator(
+                mock_bot, mock_thread, mock_message, "http://orchestrator.local", None
+            )
+
+        assert len(mock_thread.send.call_args_list[0].args[0]) == 2000
+        final = mock_reaction_msg.edit.call_args
+        assert final.kwargs["content"].startswith("preview")
+        assert len(final.kwargs["attachments"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_erro_no_stream_apaga_resposta_parcial(
+        self, mock_bot, mock_thread, mock_message, mock_reaction_msg
+    ):
+        stream = _stream_of(
+            {"type": "delta", "content": "Resposta pela metade"},
+            {"type": "error", "detail": "OpenAI caiu"},
+        )
+        with patch("bot_events.handlers.mcp_handler.stream_ndjson", new=stream):
+            await handle_with_orchestrator(
+                mock_bot, mock_thread, mock_message, "http://orchestrator.local", None
+            )
+
+        mock_reaction_msg.delete.assert_called_once()
+        assert "Não foi possível" in mock_thread.send.call_args[0][0]
+        mock_thread.edit.assert_called_once_with(locked=False)
+
+    @pytest.mark.asyncio
+    async def test_guardrail_no_stream_arquiva_thread(
+        self, mock_bot, mock_thread, mock_message
+    ):
+        stream = _stream_of(
+            {"type": "done", "content": "Sua mensagem foi bloqueada.",
+             "attachment_content": None, "guardrail_triggered": True},
+        )
+        with patch("bot_events.handlers.mcp_handler.stream_ndjson", new=stream):
+            await handle_with_orchestrator(
+                mock_bot, mock_thread, mock_message, "http://orchestrator.local", None
+            )
+
+        mock_thread.send.assert_called_once_with("Sua mensagem foi bloqueada.")
+        mock_thread.edit.assert_called_once_with(archived=True, locked=True)
+
 
 class TestN8nHandler:
     """Testes do handler N8N."""
@@ -167,8 +349,8 @@ class TestN8nHandler:
     async def test_handle_with_n8n_sucesso(self, mock_thread, mock_message):
         """Webhook retorna 200: envia 'Processando sua solicitação!'."""
         with patch(
-            "bot_events.handlers.n8n_handler.requests.post",
-            return_value=MagicMock(status_code=200),
+            "bot_events.handlers.n8n_handler.post_webhook",
+            new=AsyncMock(return_value=200),
         ):
             await handle_with_n8n(
                 mock_thread, mock_message, "https://n8n.example.com/webhook"
@@ -180,8 +362,8 @@ class TestN8nHandler:
     async def test_handle_with_n8n_erro_http(self, mock_thread, mock_message):
         """Webhook retorna erro: envia mensagem de falha e desbloqueia."""
         with patch(
-            "bot_events.handlers.n8n_handler.requests.post",
-            return_value=MagicMock(status_code=500),
+            "bot_events.handlers.n8n_handler.post_webhook",
+            new=AsyncMock(return_value=500),
         ):
             await handle_with_n8n(
                 mock_thread, mock_message, "https://n8n.example.com/webhook"
@@ -194,11 +376,9 @@ class TestN8nHandler:
     @pytest.mark.asyncio
     async def test_handle_with_n8n_timeout(self, mock_thread, mock_message):
         """Timeout no webhook: desbloqueia a thread."""
-        import requests
-
         with patch(
-            "bot_events.handlers.n8n_handler.requests.post",
-            side_effect=requests.exceptions.Timeout(),
+            "bot_events.handlers.n8n_handler.post_webhook",
+            new=AsyncMock(side_effect=asyncio.TimeoutError()),
         ):
             await handle_with_n8n(
                 mock_thread, mock_message, "https://n8n.example.com/webhook"
@@ -210,14 +390,14 @@ class TestN8nHandler:
     async def test_handle_with_n8n_payload(self, mock_thread, mock_message):
         """Verifica payload enviado ao webhook N8N."""
         with patch(
-            "bot_events.handlers.n8n_handler.requests.post",
+            "bot_events.handlers.n8n_handler.post_webhook",
+            new=AsyncMock(return_value=200),
         ) as mock_post:
-            mock_post.return_value.status_code = 200
             await handle_with_n8n(
                 mock_thread, mock_message, "https://n8n.example.com/webhook"
             )
 
-            data = mock_post.call_args[1]["json"]
+            data = mock_post.call_args[0][1]
             assert data["message"] == "Como configuro o frete?"
             assert data["discord"]["thread_id"] == "111"
             assert data["author"]["display_name"] == "Usuario Teste"
@@ -265,10 +445,10 @@ class TestN8nHandler:
         with (
             patch(
                 "bot_events.handlers.n8n_handler.get_thread",
-                return_value={"thread_id": "111", "status": "pending"},
+                new=AsyncMock(return_value={"thread_id": "111", "status": "pending"}),
             ),
-            patch("bot_events.handlers.n8n_handler.update_thread") as mock_update,
-            patch("bot_events.handlers.n8n_handler.save_thread") as mock_save,
+            patch("bot_events.handlers.n8n_handler.update_thread", new_callable=AsyncMock) as mock_update,
+            patch("bot_events.handlers.n8n_handler.save_thread", new_callable=AsyncMock) as mock_save,
             patch.object(builtins, "isinstance", _patched_isinstance),
         ):
             await handle_n8n_webhook_response(mock_bot, message)
@@ -277,6 +457,41 @@ class TestN8nHandler:
             mock_update.assert_called_once()
             mock_save.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_anexo_baixado_e_fechado_apos_o_envio(
+        self, mock_bot, mock_thread, mock_reaction_msg
+    ):
+        """Arquivo temporário do anexo é fechado depois do envio, mesmo se o envio falhar."""
+        embed = MagicMock()
+        embed.fields = [
+            SimpleNamespace(name="source", value="n8n"),
+            SimpleNamespace(name="thread_id", value="111"),
+        ]
+        message = MagicMock()
+        message.embeds = [embed]
+        message.attachments = [SimpleNamespace(url="http://cdn/resposta.txt", filename="resposta.txt")]
+        message.content = "Resposta do assistente"
+
+        fp = tempfile.SpooledTemporaryFile()
+        fp.write(b"conteudo")
+        fp.seek(0)
+        mock_thread.send = AsyncMock(side_effect=discord.HTTPException(MagicMock(status=500), "erro"))
+        mock_bot.get_channel.return_value = mock_thread
+
+        with (
+            patch("bot_events.handlers.n8n_handler.download_to_file", new=AsyncMock(return_value=fp)),
+            patch(
+                "bot_events.handlers.n8n_handler.get_thread",
+                new=AsyncMock(return_value={"thread_id": "111", "status": "pending"}),
+            ),
+            patch.object(builtins, "isinstance", _patched_isinstance),
+        ):
+            with pytest.raises(discord.HTTPException):
+                await handle_n8n_webhook_response(mock_bot, message)
+
+        assert mock_thread.send.call_args.kwargs["files"][0].filename == "resposta.md"
+        assert fp.closed
+
     @pytest.mark.asyncio
     async def test_handle_n8n_webhook_response_guardrail(
         self, mock_bot, mock_thread
@@ -297,7 +512,7 @@ class TestN8nHandler:
         mock_bot.get_channel.return_value = mock_thread
 
         with (
-            patch("bot_events.handlers.n8n_handler.get_thread", return_value=None),
+            patch("bot_events.handlers.n8n_handler.get_thread", new=AsyncMock(return_value=None)),
             patch.object(builtins, "isinstance", _patched_isinstance),
         ):
             await handle_n8n_webhook_response(mock_bot, message)
@@ -0,0 +1,144 @@
+"""
+    Testes do cliente HTTP compartilhado (retentativas do webhook, download em blocos e NDJSON).
+"""
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+
+from utils import http_client
+
+
+class _FakeResponse:
+    """Resposta aiohttp mínima usada como async context manager."""
+
+    def __init__(self, status: int = 200, chunks: list[bytes] | None = None):
+        self.status = status
+        self.content = MagicMock()
+        self.content.iter_chunked = lambda size: self._iter(chunks or [])
+        self.content.iter_any = lambda: self._iter(chunks or [])
+
+    async def _iter(self, chunks):
+        for chunk in chunks:
+            yield chunk
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(MagicMock(), (), status=self.status)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _session_with(post=None, get=None):
+    session = MagicMock()
+    session.timeout = aiohttp.ClientTimeout(sock_connect=http_client.HTTP_CONNECT_TIMEOUT)
+    session.post = MagicMock(side_effect=post)
+    session.get = MagicMock(side_effect=get)
+    return session
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff():
+    with patch.object(http_client, "WEBHOOK_BACKOFF", 0):
+        yield
+
+
+class TestPostWebhook:
+    @pytest.mark.asyncio
+    async def test_repete_em_503_ate_sucesso(self):
+        session = _session_with(post=[_FakeResponse(503), _FakeResponse(200)])
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            status = await http_client.post_webhook("http://n8n", {"a": 1})
+
+        assert status == 200
+        assert session.post.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_devolve_ultimo_status_quando_esgota_tentativas(self):
+        session = _session_with(post=[_FakeResponse(503)] * 3)
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            status = await http_client.post_webhook("http://n8n", {}, retries=2)
+
+        assert status == 503
+        assert session.post.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_nao_repete_erro_do_cliente(self):
+        session = _session_with(post=[_FakeResponse(400)])
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            status = await http_client.post_webhook("http://n8n", {})
+
+        assert status == 400
+        assert session.post.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_repete_falha_de_conexao(self):
+        session = _session_with(post=[
+            aiohttp.ClientConnectionError("reset"),
+            _FakeResponse(200),
+        ])
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            status = await http_client.post_webhook("http://n8n", {})
+
+        assert status == 200
+
+
+class TestDownloadToFile:
+    @pytest.mark.asyncio
+    async def test_grava_blocos_no_arquivo(self):
+        session = _session_with(get=[_FakeResponse(200, [b"abc", b"def"])])
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            fp = await http_client.download_to_file("http://cdn/anexo.txt")
+
+        assert fp.read() == b"abcdef"
+        fp.close()
+
+    @pytest.mark.asyncio
+    async def test_erro_http_propaga(self):
+        session = _session_with(get=[_FakeResponse(404)])
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await http_client.download_to_file("http://cdn/anexo.txt")
+
+
+class TestStreamNdjson:
+    @pytest.mark.asyncio
+    async def test_junta_linhas_quebradas_entre_blocos(self):
+        response = _FakeResponse(chunks=[
+            # "á" (2 bytes em UTF-8) dividido entre dois blocos
+            b'{"type": "delta", "content": "Ol\xc3',
+            b'\xa1"}\n{"type": "done"',
+            b', "content": "Ol\xc3\xa1"}\n',
+        ])
+        session = _session_with(post=[response])
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            events = [e async for e in http_client.stream_ndjson("http://x/answer/stream", {}, timeout=5)]
+
+        assert events == [
+            {"type": "delta", "content": "Olá"},
+            {"type": "done", "content": "Olá"},
+        ]
+
+
+class TestRequestTimeout:
+    @pytest.mark.asyncio
+    async def test_total_da_requisicao_mantem_sock_connect_da_sessao(self):
+        session = _session_with(post=[_FakeResponse(chunks=[b'{"type": "done"}\n'])])
+
+        with patch.object(http_client, "get_http_session", return_value=session):
+            [_ async for _ in http_client.stream_ndjson("http://x/answer/stream", {}, timeout=5)]
+
+        timeout = session.post.call_args.kwargs["timeout"]
+        assert timeout.total == 5
+        assert timeout.sock_connect == http_client.HTTP_CONNECT_TIMEOUT
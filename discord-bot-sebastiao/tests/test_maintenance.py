@@ -0,0 +1,59 @@
+"""
+    Testes da manutenção periódica do banco (limpeza em lotes, optimize, vacuum incremental).
+"""
+import pytest
+
+from utils import database
+from utils.maintenance import Maintenance
+from utils.thread_cache import thread_cache
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    database.close_connection()
+    monkeypatch.setattr(database, "DB_FILE", tmp_path / "threads.db")
+    thread_cache.clear()
+    database.init_database()
+    yield database
+    thread_cache.clear()
+    database.close_connection()
+
+
+def _close_days_ago(db, thread_id, days):
+    db.save_thread(thread_id, 1, 100)
+    with db.get_connection() as conn:
+        conn.execute(
+            "UPDATE threads SET status = 'closed', closed_at = julianday('now', ?) WHERE thread_id = ?",
+            (f"-{days} days", thread_id),
+        )
+
+
+def test_lote_apaga_por_intervalo_de_rowid(db):
+    for i in range(5):
+        _close_days_ago(db, str(i), 40)
+
+    where = "status = 'closed' AND closed_at < julianday('now', '-30 days')"
+
+    assert db.purge_batch("threads", where, (), 0, 3) == (3, 3)
+    assert db.purge_batch("threads", where, (), 3, 3) == (2, 5)
+    assert db.purge_batch("threads", where, (), 5, 3) == (0, None)
+
+
+@pytest.mark.asyncio
+async def test_execucao_registra_estatisticas(db):
+    for i in range(7):
+        _close_days_ago(db, str(i), 40)
+    _close_days_ago(db, "recente", 1)
+    db.save_thread("aberta", 1, 100)
+
+    maintenance = Maintenance(retention_days=30, batch_size=3, batch_pause=0)
+    last_run = await maintenance.run_once()
+
+    assert last_run["deleted"] == {"threads": 7, "jobs": 0}
+    assert last_run["batches"] == 3
+    assert db.get_thread("recente") is not None
+    assert db.get_thread("aberta") is not None
+    assert maintenance.snapshot()["runs"] == 1
+
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL (migração)
@@ -0,0 +1,143 @@
+"""
+    Testes da fila durável de perguntas (execução e retomada dos jobs).
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+import pytest
+
+from bot_events.handlers import question_jobs
+
+JOB = {"job_id": 7, "thread_id": "111", "message_id": 999, "user_id": 12345,
+       "kind": "orchestrator", "attempts": 0}
+
+
+@pytest.fixture
+def bot(mock_thread):
+    fake = MagicMock()
+    fake.get_channel = MagicMock(return_value=mock_thread)
+    return fake
+
+
+@pytest.fixture
+def repo():
+    """Repositório de jobs simulado; o lease sempre é concedido."""
+    with (
+        patch.object(question_jobs, "lease_job", new=AsyncMock(return_value=True)) as lease,
+        patch.object(question_jobs, "complete_job", new_callable=AsyncMock) as complete,
+        patch.object(question_jobs, "fail_job", new_callable=AsyncMock) as fail,
+        patch.object(question_jobs, "mark_job_failed", new_callable=AsyncMock) as mark_failed,
+        patch.object(question_jobs, "get_thread", new=AsyncMock(return_value=None)),
+    ):
+        yield MagicMock(lease=lease, complete=complete, fail=fail, mark_failed=mark_failed)
+
+
+class TestRunQuestionJob:
+    @pytest.mark.asyncio
+    async def test_job_retomado_busca_a_pergunta_e_conclui(
+        self, bot, mock_thread, mock_message, repo, monkeypatch
+    ):
+        monkeypatch.setenv("ORCHESTRATOR_URL", "http://orchestrator.local")
+        mock_thread.fetch_message = AsyncMock(return_value=mock_message)
+
+        with patch.object(question_jobs, "handle_with_orchestrator", new_callable=AsyncMock) as handle:
+            await question_jobs.run_question_job(bot, JOB)
+
+        mock_thread.fetch_message.assert_awaited_once_with(999)
+        handle.assert_awaited_once_with(
+            bot, mock_thread, mock_message, "http://orchestrator.local", None)
+        repo.complete.assert_awaited_once_with(7)
+
+    @pytest.mark.asyncio
+    async def test_job_ja_reservado_nao_executa(self, bot, mock_message, repo):
+        repo.lease.return_value = False
+
+        with patch.object(question_jobs, "handle_with_orchestrator", new_callable=AsyncMock) as handle:
+            await question_jobs.run_question_job(bot, JOB, mock_message)
+
+        handle.assert_not_called()
+        repo.complete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ultima_falha_avisa_e_desbloqueia(
+        self, bot, mock_thread, mock_message, repo, monkeypatch
+    ):
+        monkeypatch.setenv("ORCHESTRATOR_URL", "http://orchestrator.local")
+        repo.fail.return_value = "failed"
+
+        with patch.object(
+            question_jobs, "handle_with_orchestrator", new=AsyncMock(side_effect=RuntimeError("boom"))
+        ):
+            await question_jobs.run_question_job(bot, JOB, mock_message)
+
+        repo.complete.assert_not_called()
+        assert "Não foi possível" in mock_thread.send.call_args.args[0]
+        mock_thread.edit.assert_awaited_once_with(locked=False)
+
+    @pytest.mark.asyncio
+    async def test_nova_tentativa_com_fila_cheia_falha_o_job(
+        self, bot, mock_thread, mock_message, repo, monkeypatch
+    ):
+        monkeypatch.setenv("ORCHESTRATOR_URL", "http://orchestrator.local")
+        repo.fail.return_value = "queued"
+        scheduler = MagicMock()
+        scheduler.submit.return_value = None
+
+        with (
+            patch.object(question_jobs, "question_scheduler", new=scheduler),
+            patch.object(
+                question_jobs, "handle_with_orchestrator", new=AsyncMock(side_effect=RuntimeError("boom"))
+            ),
+        ):
+            await question_jobs.run_question_job(bot, JOB, mock_message)
+
+        repo.mark_failed.assert_awaited_once_with(7, "fila cheia na nova tentativa")
+        mock_thread.edit.assert_awaited_once_with(locked=False)
+
+    @pytest.mark.asyncio
+    async def test_thread_apagada_descarta_o_job(self, bot, repo):
+        bot.get_channel.return_value = None
+        bot.fetch_channel = AsyncMock(side_effect=discord.NotFound(MagicMock(status=404), "apagada"))
+
+        await question_jobs.run_question_job(bot, JOB)
+
+        repo.complete.assert_awaited_once_with(7)
+
+
+class TestResumeJobs:
+    @pytest.fixture(autouse=True)
+    def _primeiro_on_ready(self, monkeypatch):
+        monkeypatch.setattr(question_jobs, "_resumed", False)
+
+    @pytest.mark.asyncio
+    async def test_retoma_pendentes_e_desiste_dos_esgotados(self, bot, mock_thread):
+        exhausted = {**JOB, "job_id": 8, "attempts": question_jobs.JOB_MAX_ATTEMPTS}
+        scheduler = MagicMock()
+        scheduler.submit.return_value = 1
+
+        with (
+            patch.object(question_jobs, "get_resumable_jobs", new=AsyncMock(return_value=[JOB, exhausted])),
+            patch.object(question_jobs, "mark_job_failed", new_callable=AsyncMock) as mark_failed,
+            patch.object(question_jobs, "question_scheduler", new=scheduler),
+        ):
+            resumed = await question_jobs.resume_jobs(bot)
+
+        assert resumed == 1
+        assert scheduler.submit.call_args.args[:2] == ("111", 12345)
+        mark_failed.assert_awaited_once_with(8, "tentativas esgotadas")
+        mock_thread.edit.assert_awaited_once_with(locked=False)
+
+    @pytest.mark.asyncio
+    async def test_reconexao_nao_retoma_de_novo(self, bot):
+        scheduler = MagicMock()
+        scheduler.submit.return_value = 0
+
+        with (
+            patch.object(question_jobs, "get_resumable_jobs", new=AsyncMock(return_value=[JOB])) as get_jobs,
+            patch.object(question_jobs, "question_scheduler", new=scheduler),
+        ):
+            assert await question_jobs.resume_jobs(bot) == 1
+            assert await question_jobs.resume_jobs(bot) == 0
+
+        get_jobs.assert_awaited_once()
+        scheduler.submit.assert_called_once()
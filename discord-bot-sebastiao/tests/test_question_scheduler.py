@@ -0,0 +1,82 @@
+"""
+    Testes da fila de perguntas (limite global, uma por thread, rodízio entre usuários).
+"""
+import asyncio
+
+import pytest
+
+from utils.question_scheduler import QuestionScheduler
+
+
+def _job(log, name, gate):
+    async def run():
+        log.append(f"start {name}")
+        await gate.wait()
+        log.append(f"end {name}")
+    return run
+
+
+class TestQuestionScheduler:
+    @pytest.mark.asyncio
+    async def test_limite_global_e_posicao_na_fila(self):
+        scheduler = QuestionScheduler(concurrency=2, max_queued=10)
+        gate, log = asyncio.Event(), []
+
+        assert scheduler.submit(1, "a", _job(log, "1", gate)) == 0
+        assert scheduler.submit(2, "b", _job(log, "2", gate)) == 0
+        assert scheduler.submit(3, "c", _job(log, "3", gate)) == 1
+        assert scheduler.submit(4, "d", _job(log, "4", gate)) == 2
+        assert (scheduler.running, scheduler.queued) == (2, 2)
+
+        gate.set()
+        await asyncio.sleep(0.01)
+
+        assert sorted(log) == sorted(f"{e} {i}" for i in "1234" for e in ("start", "end"))
+        assert (scheduler.running, scheduler.queued) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_rodizio_entre_usuarios(self):
+        """Usuário com três perguntas na fila não passa na frente de quem chegou depois."""
+        scheduler = QuestionScheduler(concurrency=1, max_queued=10)
+        gate, log = asyncio.Event(), []
+
+        scheduler.submit(0, "x", _job(log, "x0", gate))
+        assert scheduler.submit(1, "a", _job(log, "a1", gate)) == 1
+        assert scheduler.submit(2, "a", _job(log, "a2", gate)) == 2
+        assert scheduler.submit(3, "a", _job(log, "a3", gate)) == 3
+        assert scheduler.submit(4, "b", _job(log, "b4", gate)) == 2
+
+        gate.set()
+        await asyncio.sleep(0.01)
+
+        starts = [entry.split()[1] for entry in log if entry.startswith("start")]
+        assert starts == ["x0", "a1", "b4", "a2", "a3"]
+
+    @pytest.mark.asyncio
+    async def test_uma_pergunta_por_thread(self):
+        scheduler = QuestionScheduler(concurrency=4, max_queued=10)
+        gate, log = asyncio.Event(), []
+
+        assert scheduler.submit(1, "a", _job(log, "first", gate)) == 0
+        assert scheduler.submit(1, "a", _job(log, "second", gate)) == 1
+        await asyncio.sleep(0)
+        assert log == ["start first"]
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert log == ["start first", "end first", "start second", "end second"]
+
+    @pytest.mark.asyncio
+    async def test_fila_cheia_recusa_e_stop_cancela(self):
+        scheduler = QuestionScheduler(concurrency=1, max_queued=1)
+        gate, log = asyncio.Event(), []
+
+        assert scheduler.submit(1, "a", _job(log, "1", gate)) == 0
+        assert scheduler.submit(2, "b", _job(log, "2", gate)) == 1
+        assert scheduler.submit(3, "c", _job(log, "3", gate)) is None
+
+        await asyncio.sleep(0)
+        await scheduler.stop()
+
+        assert log == ["start 1"]
+        assert (scheduler.running, scheduler.queued) == (0, 0)
@@ -0,0 +1,114 @@
+"""
+    Testes do cache de threads (LRU com __slots__) e da consistência write-through do repository.
+"""
+import pytest
+
+from utils import database, repository
+from utils.thread_history import thread_history
+from utils.thread_cache import ThreadCache, ThreadRecord, prompt_index, thread_cache
+
+
+def _row(thread_id, status="pending"):
+    return {"thread_id": thread_id, "user_id": 1, "message_id": 10,
+            "iteration_count": 0, "status": status, "closed_message_id": None}
+
+
+def test_registro_usa_slots():
+    record = ThreadRecord.from_row(_row("1"))
+
+    assert not hasattr(record, "__dict__")
+    assert record.as_dict() == _row("1")
+
+
+def test_lru_descarta_a_menos_usada():
+    cache = ThreadCache(max_entries=2)
+    cache.put(_row("1"))
+    cache.put(_row("2"))
+    cache.get(1)  # chave int e str são a mesma thread
+    cache.put(_row("3"))
+
+    assert cache.get("2") is None
+    assert cache.get("1") is not None
+    assert cache.snapshot()["evictions"] == 1
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    database.close_connection()
+    monkeypatch.setattr(database, "DB_FILE", tmp_path / "threads.db")
+    thread_cache.clear()
+    prompt_index.clear()
+    thread_history.clear()
+    database.init_database()
+    yield repository
+    thread_cache.clear()
+    prompt_index.clear()
+    thread_history.clear()
+    database.close_connection()
+
+
+@pytest.mark.asyncio
+async def test_escritas_mantem_cache_igual_ao_banco(repo):
+    await repo.save_thread("111", 12345, 999)
+    hits = thread_cache.stats["hits"]
+
+    assert await repo.get_thread(111) == database.get_thread("111")
+    assert thread_cache.stats["hits"] == hits + 1
+
+    await repo.update_thread("111", 1000, "pending_support")
+    assert await repo.get_thread("111") == database.get_thread("111")
+    assert (await repo.get_thread("111"))["iteration_count"] == 1
+
+    await repo.close_thread("111")
+    assert (await repo.get_thread("111"))["status"] == "closed"
+
+    await repo.delete_thread("111")
+    assert await repo.get_thread("111") is None
+
+
+@pytest.mark.asyncio
+async def test_warm_carrega_threads_em_aberto(repo):
+    database.save_thread("1", 1, 10)
+    database.save_thread("2", 1, 20)
+    database.close_thread("2")
+
+    assert await repo.warm_thread_cache() == 1
+    assert thread_cache.get("1") is not None
+    assert thread_cache.get("2") is None
+
+
+@pytest.mark.asyncio
+async def test_indice_de_prompts_acompanha_as_escritas(repo):
+    database.save_thread("1", 1, 10)
+    database.save_thread("2", 1, 20)
+    database.close_thread("2")
+
+    assert await repo.load_prompt_index() == 1
+    assert prompt_index.thread_for(10) == "1"
+    assert prompt_index.thread_for(20) is None
+
+    await repo.update_thread("1", 11)
+    assert prompt_index.thread_for(10) is None
+    assert prompt_index.thread_for(11) == "1"
+
+    await repo.close_thread("1")
+    assert len(prompt_index) == 0
+
+
+@pytest.mark.asyncio
+async def test_historico_fica_limitado_e_persistido(repo):
+    database.save_thread("1", 1, 10)
+    history = []
+
+    for i in range(3):
+        history = await repo.record_exchange("1", history, f"pergunta {i}", f"resposta {i}")
+
+    # Só as últimas HISTORY_MAX_EXCHANGES (2) trocas
+    assert [m["content"] for m in history] == [
+        "pergunta 1", "resposta 1", "pergunta 2", "resposta 2"]
+    assert database.get_thread_history("1") == history
+
+    # Sem a memória, vem do banco
+    thread_history.clear()
+    assert await repo.get_thread_history(1) == history
+    assert await repo.get_thread_history("2") is None
@@ -1,48 +1,77 @@
 from pathlib import Path
+import json
 import os
 import sqlite3
+import threading
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 import contextlib
 
+from utils.migrations import migrate
+
 DB_FILE = Path(os.getenv("BOT_DB_PATH", "threads.db"))
 DB_TIMEOUT = 5.0  # Timeout de 5 segundos para evitar locks
+DB_STATEMENT_CACHE = 64  # Statements preparados mantidos pela conexão
+
+# Conexão única do processo (aberta no primeiro uso); o lock garante um único escritor por vez
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.RLock()
+
+def _open_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        DB_FILE,
+        timeout=DB_TIMEOUT,
+        check_same_thread=False,
+        cached_statements=DB_STATEMENT_CACHE,
+    )
+    conn.row_factory = sqlite3.Row
+    # WAL: leituras não bloqueiam a escrita; NORMAL só faz fsync no checkpoint
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
 
 @contextlib.contextmanager
 def get_connection():
     """
-    Context manager que garante fechamento da conexão mesmo em caso de erro.
-    Faz commit automático em caso de sucesso e rollback em caso de exceção.
+    Context manager sobre a conexão persistente (WAL, synchronous=NORMAL).
+    Serializa o acesso entre threads, faz commit automático em caso de sucesso
+    e rollback em caso de exceção. A conexão não é fechada ao sair.
     """
-    conn = sqlite3.connect(DB_FILE, timeout=DB_TIMEOUT)
-    try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+    global _conn
+
+    with _lock:
+        if _conn is None:
+            _conn = _open_connection()
+
+        try:
+            yield _conn
+            _conn.commit()
+        except Exception:
+            _conn.rollback()
+            raise
+
+def close_connection() -> None:
+    """
+      Fecha a conexão persistente (chamado no encerramento do bot).
+    """
+    global _conn
+
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
 
 def init_database() -> None:
     """
-      Inicializa o banco de dados criando as tabelas se não existirem.
-      Deve ser chamado no evento on_ready.
+      Inicializa o banco de dados aplicando as migrações pendentes (utils.migrations),
+      sem perder os dados existentes. Deve ser chamado no evento on_ready.
     """
     try:
         with get_connection() as conn:
-            # Tabela para threads de ajuda
-            conn.execute("""
-              CREATE TABLE IF NOT EXISTS threads (
-                thread_id TEXT PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                message_id INTEGER NOT NULL,
-                iteration_count INTEGER NOT NULL,
-                status TEXT DEFAULT 'pending',
-                closed_at REAL
-              )
-            """)
+            previous, current = migrate(conn)
 
+        if previous != current:
+            print(f"[DATABASE] schema migrado da versão {previous} para {current}")
         print(f"[DATABASE] banco de dados inicializado: {DB_FILE}")
 
     except Exception as e:
@@ -60,9 +89,9 @@ def get_thread(thread_id: str) -> Optional[Dict]:
     """
     try:
         with get_connection() as conn:
-            conn.row_factory = sqlite3.Row
             cursor = conn.execute(
-                "SELECT thread_id, user_id, message_id, iteration_count, status FROM threads WHERE thread_id = ?",
+                """SELECT thread_id, user_id, message_id, iteration_count, status, closed_message_id
+                   FROM threads WHERE thread_id = ?""",
                 (thread_id,)
             )
             row = cursor.fetchone()
@@ -73,7 +102,8 @@ def get_thread(thread_id: str) -> Optional[Dict]:
                     "user_id": row["user_id"],
                     "message_id": row["message_id"],
                     "iteration_count": row["iteration_count"],
-                    "status": row["status"]
+                    "status": row["status"],
+                    "closed_message_id": row["closed_message_id"]
                 }
             return None
 
@@ -122,14 +152,15 @@ def save_thread(thread_id: str, user_id: int, message_id: int) -> bool:
         with get_connection() as conn:
             cursor = conn.execute(
                 """INSERT OR IGNORE INTO threads
-                   (thread_id, user_id, message_id, iteration_count, status, closed_at)
-                   VALUES (?, ?, ?, 0, 'pending', NULL)""",
+                   (thread_id, user_id, message_id, iteration_count, status, closed_at, created_at, updated_at)
+                   VALUES (?, ?, ?, 0, 'pending', NULL, julianday('now'), julianday('now'))""",
                 (str(thread_id), user_id, message_id),
             )
             if cursor.rowcount == 0:
                 conn.execute(
                     """UPDATE threads
-                       SET message_id = ?, iteration_count = iteration_count + 1, status = 'pending'
+                       SET message_id = ?, iteration_count = iteration_count + 1, status = 'pending',
+                           updated_at = julianday('now')
                        WHERE thread_id = ?""",
                     (message_id, str(thread_id)),
                 )
@@ -162,7 +193,8 @@ def update_thread(thread_id: str, message_id: int, status: str = "pending") -> b
             cursor = conn.execute(
                 """
                     UPDATE threads
-                    SET status = ?, message_id = ?, iteration_count = iteration_count + 1
+                    SET status = ?, message_id = ?, iteration_count = iteration_count + 1,
+                        updated_at = julianday('now')
                     WHERE thread_id = ?""",
                 (status, message_id, thread_id)
             )
@@ -173,13 +205,13 @@ def update_thread(thread_id: str, message_id: int, status: str = "pending") -> b
         print(f"[DATABASE ERROR] Erro ao atualizar a thread: {e}")
         return False
 
-def close_thread(thread_id: str) -> bool:
+def close_thread(thread_id: str, closed_message_id: Optional[int] = None) -> bool:
     """
-      Atualiza uma thread.
+      Fecha uma thread (status 'closed').
 
       Args:
           thread_id: ID da thread
-          status: Status da solicitação ('pending', 'closed', 'pending_support').
+          closed_message_id: ID da mensagem "Atendimento encerrado" fixada na thread, se enviada
 
       Returns:
           True se atualizou com sucesso, False caso contrário
@@ -189,9 +221,12 @@ def close_thread(thread_id: str) -> bool:
             cursor = conn.execute(
                 """
                     UPDATE threads
-                    SET status = 'closed', closed_at = julianday('now')
+                    SET status = 'closed',
+                        closed_at = julianday('now'),
+                        closed_message_id = COALESCE(?, closed_message_id),
+                        updated_at = julianday('now')
                     WHERE thread_id = ?""",
-                (thread_id,)
+                (closed_message_id, thread_id)
             )
             return cursor.rowcount > 0
 
@@ -199,6 +234,67 @@ def close_thread(thread_id: str) -> bool:
         print(f"[DATABASE ERROR] Erro ao fechar a thread: {e}")
         return False
 
+def get_threads(thread_ids: list[str]) -> list[Dict]:
+    """
+      Busca várias threads numa consulta só (lotes de arquivamento).
+
+      Args:
+          thread_ids: IDs das threads
+
+      Returns:
+          Linhas encontradas, no mesmo formato de get_thread
+    """
+    if not thread_ids:
+        return []
+
+    try:
+        with get_connection() as conn:
+            placeholders = ','.join(['?' for _ in thread_ids])
+            cursor = conn.execute(
+                f"""
+                  SELECT thread_id, user_id, message_id, iteration_count, status, closed_message_id
+                  FROM threads
+                  WHERE thread_id IN ({placeholders})""",
+                [str(t) for t in thread_ids]
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao buscar threads: {e}")
+        return []
+
+def close_threads(closings: list[tuple[str, Optional[int]]]) -> list[Dict]:
+    """
+      Fecha várias threads numa transação só (lotes de arquivamento).
+
+      Args:
+          closings: Pares (thread_id, closed_message_id)
+
+      Returns:
+          As linhas atualizadas, no mesmo formato de get_thread
+    """
+    if not closings:
+        return []
+
+    try:
+        with get_connection() as conn:
+            conn.executemany(
+                """
+                    UPDATE threads
+                    SET status = 'closed',
+                        closed_at = julianday('now'),
+                        closed_message_id = COALESCE(?, closed_message_id),
+                        updated_at = julianday('now')
+                    WHERE thread_id = ?""",
+                [(message_id, str(thread_id)) for thread_id, message_id in closings]
+            )
+
+        return get_threads([thread_id for thread_id, _ in closings])
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao fechar threads: {e}")
+        return []
+
 def cleanup_old_threads(days: int = 30, status_list: list[str] = None) -> int:
     """
       Remove threads antigas do banco de dados.
@@ -292,4 +388,307 @@ def get_pending_threads_count() -> int:
 
     except Exception as e:
         print(f"[DATABASE ERROR] Erro ao contar as threads: {e}")
-        return 0
\ No newline at end of file
+        return 0
+
+def get_active_threads(limit: int) -> list[Dict]:
+    """
+      Busca as threads em aberto ('pending' ou 'pending_support'), mais recentes primeiro.
+      Usado para aquecer o cache de threads na subida do bot.
+
+      Args:
+          limit: Número máximo de threads retornadas
+
+      Returns:
+          Lista de dicionários no mesmo formato de get_thread
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute(
+                """
+                  SELECT thread_id, user_id, message_id, iteration_count, status, closed_message_id
+                  FROM threads
+                  WHERE status IN ('pending', 'pending_support')
+                  ORDER BY rowid DESC
+                  LIMIT ?""",
+                (limit,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao buscar threads em aberto: {e}")
+        return []
+
+
+def get_active_prompt_ids() -> list[tuple[int, str]]:
+    """
+      Retorna (message_id, thread_id) de todas as threads não fechadas: a mensagem
+      que aguarda reação de cada uma. Usado para montar o índice de reações na subida do bot.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT message_id, thread_id FROM threads WHERE status != 'closed'"
+            )
+            return [(row["message_id"], row["thread_id"]) for row in cursor.fetchall()]
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao buscar mensagens aguardando reação: {e}")
+        return []
+
+
+def get_thread_history(thread_id: str) -> Optional[list[Dict]]:
+    """
+      Busca o histórico recente (mensagens user/assistant) salvo junto da thread.
+
+      Args:
+          thread_id: ID da thread
+
+      Returns:
+          Lista de mensagens, ou None se a thread não existe ou ainda não tem histórico
+    """
+    try:
+        with get_connection() as conn:
+            row = conn.execute(
+                "SELECT history FROM threads WHERE thread_id = ?",
+                (thread_id,)
+            ).fetchone()
+
+            if row is None or row["history"] is None:
+                return None
+            return json.loads(row["history"])
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao buscar histórico da thread: {e}")
+        return None
+
+
+def set_thread_history(thread_id: str, history: list[Dict]) -> bool:
+    """
+      Grava o histórico recente da thread (substitui o anterior).
+
+      Args:
+          thread_id: ID da thread
+          history: Mensagens user/assistant, da mais antiga para a mais recente
+
+      Returns:
+          True se a thread existe e foi atualizada, False caso contrário
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute(
+                "UPDATE threads SET history = ?, updated_at = julianday('now') WHERE thread_id = ?",
+                (json.dumps(history, ensure_ascii=False), thread_id)
+            )
+            return cursor.rowcount > 0
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao salvar histórico da thread: {e}")
+        return False
+
+
+def enqueue_job(thread_id: str, message_id: int, user_id: int, kind: str) -> Optional[Dict]:
+    """
+      Registra uma pergunta na fila durável (status 'queued').
+
+      Args:
+          thread_id: ID da thread
+          message_id: ID da mensagem do usuário com a pergunta
+          user_id: ID do autor da pergunta
+          kind: Fluxo que responde ('orchestrator' ou 'n8n')
+
+      Returns:
+          O job criado, ou None em caso de erro
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (thread_id, message_id, user_id, kind) VALUES (?, ?, ?, ?)",
+                (str(thread_id), message_id, user_id, kind)
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (cursor.lastrowid,)
+            ).fetchone()
+            return dict(row)
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao enfileirar a pergunta: {e}")
+        return None
+
+
+def lease_job(job_id: int, owner: str, lease_seconds: float, max_attempts: int) -> bool:
+    """
+      Reserva o job para este processo: vale para jobs na fila ou em execução com lease
+      vencido ou de outro processo (bot reiniciado). Cada reserva conta uma tentativa.
+
+      Args:
+          job_id: ID do job
+          owner: Identificador do processo que vai executar
+          lease_seconds: Duração da reserva
+          max_attempts: Tentativas permitidas; esgotadas, o job não é mais reservado
+
+      Returns:
+          True se reservou, False se o job não está disponível
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute(
+                """
+                  UPDATE jobs
+                  SET status = 'running', attempts = attempts + 1, lease_owner = ?,
+                      lease_until = julianday('now', '+' || ? || ' seconds')
+                  WHERE job_id = ?
+                  AND attempts < ?
+                  AND (
+                    status = 'queued'
+                    OR (status = 'running' AND (lease_owner != ? OR lease_until < julianday('now')))
+                  )""",
+                (owner, lease_seconds, job_id, max_attempts, owner)
+            )
+            return cursor.rowcount > 0
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao reservar o job: {e}")
+        return False
+
+
+def complete_job(job_id: int) -> bool:
+    """
+      Remove o job concluído da fila.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            return cursor.rowcount > 0
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao concluir o job: {e}")
+        return False
+
+
+def fail_job(job_id: int, error: str, max_attempts: int) -> Optional[str]:
+    """
+      Registra a falha de uma tentativa: volta para a fila ou, sem tentativas restantes, vira 'failed'.
+
+      Returns:
+          Novo status ('queued' ou 'failed'), ou None se o job não existe
+    """
+    try:
+        with get_connection() as conn:
+            conn.execute(
+                """
+                  UPDATE jobs
+                  SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END,
+                      lease_owner = NULL, lease_until = NULL, last_error = ?
+                  WHERE job_id = ?""",
+                (max_attempts, error, job_id)
+            )
+            row = conn.execute(
+                "SELECT status FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            return row["status"] if row else None
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao registrar falha do job: {e}")
+        return None
+
+
+def get_resumable_jobs(owner: str) -> list[Dict]:
+    """
+      Jobs que ficaram para trás (na fila ou em execução por outro processo ou com lease vencido),
+      na ordem de chegada. Usado para retomar as perguntas no on_ready.
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute(
+                """
+                  SELECT * FROM jobs
+                  WHERE status = 'queued'
+                  OR (status = 'running' AND (lease_owner != ? OR lease_until < julianday('now')))
+                  ORDER BY job_id""",
+                (owner,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao buscar jobs pendentes: {e}")
+        return []
+
+
+def mark_job_failed(job_id: int, error: str) -> bool:
+    """
+      Marca o job como 'failed' sem nova tentativa (ex.: tentativas esgotadas em restarts seguidos).
+    """
+    try:
+        with get_connection() as conn:
+            cursor = conn.execute(
+                """
+                  UPDATE jobs
+                  SET status = 'failed', lease_owner = NULL, lease_until = NULL, last_error = ?
+                  WHERE job_id = ?""",
+                (error, job_id)
+            )
+            return cursor.rowcount > 0
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao marcar o job como falho: {e}")
+        return False
+
+
+def purge_batch(table: str, where: str, params: tuple, after_rowid: int, limit: int) -> tuple[int, Optional[int]]:
+    """
+      Remove um lote da limpeza periódica: as próximas `limit` linhas de `table` (rowid > after_rowid)
+      que atendem `where`, apagadas por intervalo de rowid numa transação curta.
+
+      Args:
+          table: Tabela a limpar
+          where: Condição SQL das linhas a remover (com placeholders)
+          params: Valores dos placeholders de `where`
+          after_rowid: Último rowid do lote anterior (0 no primeiro)
+          limit: Tamanho do lote
+
+      Returns:
+          (linhas removidas, último rowid do lote); rowid None quando não há mais o que remover
+    """
+    try:
+        with get_connection() as conn:
+            rowids = [row[0] for row in conn.execute(
+                f"SELECT rowid FROM {table} WHERE rowid > ? AND ({where}) ORDER BY rowid LIMIT ?",
+                (after_rowid, *params, limit)
+            )]
+
+            if not rowids:
+                return 0, None
+
+            cursor = conn.execute(
+                f"DELETE FROM {table} WHERE rowid BETWEEN ? AND ? AND ({where})",
+                (rowids[0], rowids[-1], *params)
+            )
+            return cursor.rowcount, rowids[-1]
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro na limpeza de {table}: {e}")
+        return 0, None
+
+
+def optimize_database(vacuum_pages: int) -> Dict[str, int]:
+    """
+      PRAGMA optimize e devolução de até `vacuum_pages` páginas livres ao disco (incremental_vacuum).
+      O auto_vacuum=INCREMENTAL é ativado pela migração _enable_incremental_vacuum; sem ele
+      o incremental_vacuum não faz nada (nunca há VACUUM completo aqui).
+
+      Returns:
+          Páginas livres antes e depois do incremental_vacuum
+    """
+    try:
+        with get_connection() as conn:
+            conn.execute("PRAGMA optimize")
+
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            conn.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})").fetchall()
+            after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+            return {"freelist_before": before, "freelist_after": after}
+
+    except Exception as e:
+        print(f"[DATABASE ERROR] Erro ao otimizar o banco: {e}")
+        return {}
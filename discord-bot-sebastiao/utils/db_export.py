@@ -11,7 +11,7 @@ from pathlib import Path
 from utils.database import DB_FILE, get_connection
 
 TABLES = ("threads",)
-DATE_COLUMNS = ("closed_at",)
+DATE_COLUMNS = ("closed_at", "created_at", "updated_at")
 
 
 def _get_columns(conn: sqlite3.Connection, table: str) -> list[str]:
@@ -44,7 +44,6 @@ def get_export_data() -> dict[str, list] | None:
     if not DB_FILE.exists():
         return None
     with get_connection() as conn:
-        conn.row_factory = sqlite3.Row
         data = {}
         for table in TABLES:
             try:
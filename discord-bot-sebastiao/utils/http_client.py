@@ -0,0 +1,185 @@
+"""
+    Cliente HTTP assíncrono compartilhado (aiohttp) usado pelos handlers do bot.
+    Mantém um único pool de conexões com keep-alive para não bloquear o event loop do discord.py.
+"""
+import asyncio
+import json
+import os
+import tempfile
+from typing import Any, AsyncIterator
+
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Limites do pool de conexões (configuráveis via .env)
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+
+# Timeouts (segundos)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+ORCHESTRATOR_TIMEOUT = float(os.getenv("ORCHESTRATOR_TIMEOUT", "120"))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+DOWNLOAD_TIMEOUT = float(os.getenv("DOWNLOAD_TIMEOUT", "30"))
+
+# Retentativas do webhook (falha de conexão ou 502/503/504), com backoff exponencial
+WEBHOOK_RETRIES = int(os.getenv("WEBHOOK_RETRIES", "2"))
+WEBHOOK_BACKOFF = float(os.getenv("WEBHOOK_BACKOFF", "0.5"))
+_RETRY_STATUSES = (502, 503, 504)
+
+# Downloads acima desse tamanho vão para arquivo temporário em disco
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+_session: aiohttp.ClientSession | None = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+        Retorna a sessão HTTP compartilhada, criando-a na primeira chamada.
+        Deve ser chamada dentro do event loop do bot.
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(sock_connect=HTTP_CONNECT_TIMEOUT),
+        )
+
+    return _session
+
+
+async def close_http_session() -> None:
+    """
+        Fecha a sessão compartilhada (chamado no encerramento do bot).
+    """
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+    _session = None
+
+
+def _request_timeout(session: aiohttp.ClientSession, total: float) -> aiohttp.ClientTimeout:
+    """
+        Timeout de uma requisição: o da sessão (sock_connect etc.) com outro total.
+        Um ClientTimeout(total=...) avulso substituiria o da sessão inteiro.
+    """
+    base = session.timeout
+    return aiohttp.ClientTimeout(
+        total=total,
+        connect=base.connect,
+        sock_read=base.sock_read,
+        sock_connect=base.sock_connect,
+        ceil_threshold=base.ceil_threshold,
+    )
+
+
+async def post_json(url: str, data: dict[str, Any], timeout: float) -> dict[str, Any]:
+    """
+        Faz POST com corpo JSON e devolve a resposta decodificada.
+        Levanta asyncio.TimeoutError em timeout e aiohttp.ClientError em erro HTTP/conexão.
+    """
+    session = get_http_session()
+
+    async with session.post(
+        url, json=data, timeout=_request_timeout(session, timeout)
+    ) as response:
+        response.raise_for_status()
+        return await response.json()
+
+
+async def stream_ndjson(
+    url: str, data: dict[str, Any], timeout: float
+) -> AsyncIterator[dict[str, Any]]:
+    """
+        Faz POST com corpo JSON e gera cada linha da resposta NDJSON (um JSON por linha)
+        assim que chega. Mesmas exceções de post_json; o timeout vale para o stream inteiro.
+    """
+    session = get_http_session()
+
+    async with session.post(
+        url, json=data, timeout=_request_timeout(session, timeout)
+    ) as response:
+        response.raise_for_status()
+        buffer = b""
+
+        async for chunk in response.content.iter_any():
+            buffer += chunk
+
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+
+                if line.strip():
+                    yield json.loads(line)
+
+        if buffer.strip():
+            yield json.loads(buffer)
+
+
+async def post_webhook(
+    url: str,
+    data: dict[str, Any],
+    timeout: float = WEBHOOK_TIMEOUT,
+    retries: int = WEBHOOK_RETRIES,
+) -> int:
+    """
+        Faz POST com corpo JSON no webhook e devolve o status HTTP.
+        Repete em falha de conexão ou 502/503/504 com backoff exponencial.
+        Timeout não é repetido (o webhook pode já ter recebido a mensagem).
+    """
+    session = get_http_session()
+    attempt = 0
+
+    while True:
+        try:
+            async with session.post(
+                url, json=data, timeout=_request_timeout(session, timeout)
+            ) as response:
+                if response.status not in _RETRY_STATUSES or attempt >= retries:
+                    return response.status
+
+        except asyncio.TimeoutError:
+            raise
+        except aiohttp.ClientConnectionError:
+            if attempt >= retries:
+                raise
+
+        await asyncio.sleep(WEBHOOK_BACKOFF * (2 ** attempt))
+        attempt += 1
+
+
+async def download_to_file(url: str, timeout: float = DOWNLOAD_TIMEOUT):
+    """
+        Baixa a URL em blocos para um arquivo temporário (em memória até
+        DOWNLOAD_SPOOL_MAX_SIZE, depois em disco) e devolve o arquivo posicionado no início,
+        pronto para ser usado como fp de discord.File. Quem chama fecha o arquivo após o envio
+        (discord.File não fecha objetos de arquivo).
+    """
+    session = get_http_session()
+    buffer = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_SIZE)
+
+    try:
+        async with session.get(
+            url, timeout=_request_timeout(session, timeout)
+        ) as response:
+            response.raise_for_status()
+
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+
+    except BaseException:
+        buffer.close()
+        raise
+
+    buffer.seek(0)
+    return buffer
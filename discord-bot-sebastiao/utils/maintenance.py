@@ -0,0 +1,116 @@
+"""
+    Manutenção periódica do banco (substitui a limpeza que só rodava no on_ready):
+    a cada MAINTENANCE_INTERVAL segundos remove em lotes as threads fechadas há mais de
+    MAINTENANCE_RETENTION_DAYS dias (e os jobs falhos), roda PRAGMA optimize e devolve
+    páginas livres ao disco (incremental_vacuum). Guarda as estatísticas da última execução.
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import suppress
+from typing import Any
+
+from utils.repository import optimize_database, purge_in_batches
+
+MAINTENANCE_INTERVAL = float(os.getenv("MAINTENANCE_INTERVAL", str(6 * 3600)))  # 6 horas
+MAINTENANCE_RETENTION_DAYS = int(os.getenv("MAINTENANCE_RETENTION_DAYS", "30"))
+MAINTENANCE_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "500"))
+# Pausa (s) entre lotes: as operações dos eventos passam na fila do banco entre um lote e outro
+MAINTENANCE_BATCH_PAUSE = float(os.getenv("MAINTENANCE_BATCH_PAUSE", "0.05"))
+MAINTENANCE_VACUUM_PAGES = int(os.getenv("MAINTENANCE_VACUUM_PAGES", "1000"))
+
+
+def purge_rules(days: int) -> list[tuple[str, str, tuple]]:
+    """
+        (tabela, condição, parâmetros) das linhas removidas pela manutenção.
+    """
+    return [
+        (
+            "threads",
+            "status = 'closed' AND closed_at IS NOT NULL AND closed_at < julianday('now', '-' || ? || ' days')",
+            (days,),
+        ),
+        (
+            "jobs",
+            "status = 'failed' AND created_at < julianday('now', '-' || ? || ' days')",
+            (days,),
+        ),
+    ]
+
+
+class Maintenance:
+    """
+        Uso: maintenance.start() no on_ready (idempotente; reconexões não disparam outra limpeza).
+    """
+
+    def __init__(
+        self,
+        interval: float = MAINTENANCE_INTERVAL,
+        retention_days: int = MAINTENANCE_RETENTION_DAYS,
+        batch_size: int = MAINTENANCE_BATCH_SIZE,
+        batch_pause: float = MAINTENANCE_BATCH_PAUSE,
+        vacuum_pages: int = MAINTENANCE_VACUUM_PAGES,
+    ) -> None:
+        self.interval = interval
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.vacuum_pages = vacuum_pages
+        self.runs = 0
+        self.last_run: dict[str, Any] | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logging.getLogger(__name__).exception("Erro na manutenção do banco: %s", e)
+
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> dict[str, Any]:
+        started_at = time.time()
+        started = time.perf_counter()
+        deleted: dict[str, int] = {}
+        batches = 0
+
+        for table, where, params in purge_rules(self.retention_days):
+            removed, table_batches = await purge_in_batches(
+                table, where, params, self.batch_size, self.batch_pause)
+            deleted[table] = removed
+            batches += table_batches
+
+        optimize = await optimize_database(self.vacuum_pages)
+
+        self.runs += 1
+        self.last_run = {
+            "started_at": started_at,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "deleted": deleted,
+            "batches": batches,
+            **optimize,
+        }
+
+        if any(deleted.values()):
+            print(f"[DATABASE] Manutenção: removidos {deleted} em {batches} lote(s)")
+
+        return self.last_run
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"runs": self.runs, "interval": self.interval, "last_run": self.last_run}
+
+
+maintenance = Maintenance()
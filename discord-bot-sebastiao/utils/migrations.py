@@ -0,0 +1,129 @@
+"""
+    Migrações do schema do banco de threads, versionadas por PRAGMA user_version.
+    Cada migração roda uma vez, na sua própria transação junto com a troca de versão;
+    para mudar o schema, acrescente uma função ao fim de MIGRATIONS (nunca altere as antigas).
+    Bancos anteriores ao versionamento (user_version 0) passam por todas; por isso as
+    migrações usam IF NOT EXISTS e conferem as colunas antes de criá-las.
+"""
+import sqlite3
+from typing import Callable
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, declaration: str) -> None:
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def _outside_transaction(migration: Callable[[sqlite3.Connection], None]) -> Callable[[sqlite3.Connection], None]:
+    # Para migrações com VACUUM (não roda dentro de transação); a versão só é gravada depois
+    migration.outside_transaction = True
+    return migration
+
+
+def _create_threads(conn: sqlite3.Connection) -> None:
+    # Tabela para threads de ajuda
+    conn.execute("""
+      CREATE TABLE IF NOT EXISTS threads (
+        thread_id TEXT PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        message_id INTEGER NOT NULL,
+        iteration_count INTEGER NOT NULL,
+        status TEXT DEFAULT 'pending',
+        closed_at REAL
+      )
+    """)
+
+
+def _add_history(conn: sqlite3.Connection) -> None:
+    # Histórico recente da conversa, em JSON
+    _add_column(conn, "threads", "history", "TEXT")
+
+
+def _add_closed_message_id(conn: sqlite3.Connection) -> None:
+    # Mensagem "Atendimento encerrado" fixada na thread
+    _add_column(conn, "threads", "closed_message_id", "INTEGER")
+
+
+def _create_jobs(conn: sqlite3.Connection) -> None:
+    # Fila durável das perguntas (chamadas ao orquestrador/N8N): sobrevive a um restart
+    conn.execute("""
+      CREATE TABLE IF NOT EXISTS jobs (
+        job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        thread_id TEXT NOT NULL,
+        message_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        lease_owner TEXT,
+        lease_until REAL,
+        last_error TEXT,
+        created_at REAL NOT NULL DEFAULT (julianday('now'))
+      )
+    """)
+
+
+def _add_timestamps_and_indexes(conn: sqlite3.Connection) -> None:
+    # ALTER TABLE não aceita default não constante: linhas antigas recebem o fechamento ou agora
+    _add_column(conn, "threads", "created_at", "REAL")
+    _add_column(conn, "threads", "updated_at", "REAL")
+    conn.execute("""
+      UPDATE threads
+      SET created_at = COALESCE(created_at, closed_at, julianday('now')),
+          updated_at = COALESCE(updated_at, closed_at, julianday('now'))
+    """)
+
+    # (status, closed_at): contagem de pendentes, threads em aberto e limpeza por idade
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_threads_status_closed_at ON threads (status, closed_at)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_threads_message_id ON threads (message_id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+
+
+@_outside_transaction
+def _enable_incremental_vacuum(conn: sqlite3.Connection) -> None:
+    # auto_vacuum=INCREMENTAL só vale após um VACUUM completo: feito uma vez aqui, na inicialização,
+    # e não na manutenção periódica (que só roda o incremental_vacuum com o bot atendendo)
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+
+
+MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _create_threads,
+    _add_history,
+    _add_closed_message_id,
+    _create_jobs,
+    _add_timestamps_and_indexes,
+    _enable_incremental_vacuum,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn: sqlite3.Connection) -> tuple[int, int]:
+    """
+        Aplica as migrações pendentes. Retorna (versão anterior, versão atual).
+    """
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for version in range(current + 1, SCHEMA_VERSION + 1):
+        migration = MIGRATIONS[version - 1]
+
+        if getattr(migration, "outside_transaction", False):
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+        else:
+            conn.execute("BEGIN")
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+
+        conn.commit()
+
+    return current, max(current, SCHEMA_VERSION)
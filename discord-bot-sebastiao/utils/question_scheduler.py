@@ -0,0 +1,136 @@
+"""
+    Fila das perguntas enviadas nas threads: no máximo QUESTION_CONCURRENCY perguntas sendo
+    respondidas ao mesmo tempo (chamadas ao orquestrador/N8N), uma por thread de cada vez e
+    rodízio entre usuários (quem tem várias threads não passa na frente dos outros).
+    Com mais de QUESTION_QUEUE_SIZE perguntas esperando, novas perguntas são recusadas.
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable
+
+QUESTION_CONCURRENCY = int(os.getenv("QUESTION_CONCURRENCY", "4"))
+QUESTION_QUEUE_SIZE = int(os.getenv("QUESTION_QUEUE_SIZE", "50"))
+
+
+class _Job:
+    __slots__ = ("thread_id", "user_id", "run")
+
+    def __init__(self, thread_id: str, user_id: str, run: Callable[[], Awaitable[None]]) -> None:
+        self.thread_id = thread_id
+        self.user_id = user_id
+        self.run = run
+
+
+class QuestionScheduler:
+    """
+        Uso: position = question_scheduler.submit(thread.id, author.id, coroutine_factory).
+        0 = começou agora; N = posição na fila; None = fila cheia (pergunta não aceita).
+    """
+
+    def __init__(self, concurrency: int = QUESTION_CONCURRENCY, max_queued: int = QUESTION_QUEUE_SIZE) -> None:
+        self.concurrency = max(1, concurrency)
+        self.max_queued = max_queued
+        # Uma fila por usuário; a ordem das chaves é o rodízio
+        self._pending: OrderedDict[str, deque[_Job]] = OrderedDict()
+        self._busy_threads: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._queued = 0
+
+    @property
+    def running(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def submit(self, thread_id, user_id, run: Callable[[], Awaitable[None]]) -> int | None:
+        thread_id, user_id = str(thread_id), str(user_id)
+
+        if self._queued >= self.max_queued:
+            return None
+
+        job = _Job(thread_id, user_id, run)
+        jobs = self._pending.setdefault(user_id, deque())
+        jobs.append(job)
+        self._queued += 1
+        self._dispatch()
+
+        if job not in jobs:
+            return 0
+
+        return self._position(user_id, jobs.index(job))
+
+    def _position(self, user_id: str, k: int) -> int:
+        """
+            Posição da k-ésima pergunta do usuário no rodízio: cada usuário à frente dele
+            na rotação é atendido k + 1 vezes antes dela; os que vêm depois, k vezes.
+        """
+        ahead, before = k, True
+
+        for other, jobs in self._pending.items():
+            if other == user_id:
+                before = False
+                continue
+            ahead += min(len(jobs), k + 1 if before else k)
+
+        return ahead + 1
+
+    def _next_job(self) -> _Job | None:
+        for user_id, jobs in self._pending.items():
+            for job in jobs:
+                if job.thread_id in self._busy_threads:
+                    continue
+
+                jobs.remove(job)
+                # Usuário atendido vai para o fim do rodízio
+                del self._pending[user_id]
+                if jobs:
+                    self._pending[user_id] = jobs
+
+                return job
+
+        return None
+
+    def _dispatch(self) -> None:
+        while len(self._tasks) < self.concurrency:
+            job = self._next_job()
+
+            if job is None:
+                return
+
+            self._queued -= 1
+            self._busy_threads.add(job.thread_id)
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+
+    async def _run(self, job: _Job) -> None:
+        try:
+            await job.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.getLogger(__name__).exception(
+                "Erro ao responder a thread %s: %s", job.thread_id, e)
+        finally:
+            self._tasks.discard(asyncio.current_task())
+            self._busy_threads.discard(job.thread_id)
+            self._dispatch()
+
+    async def stop(self) -> None:
+        """
+            Descarta as perguntas na fila e cancela as que estão em andamento (encerramento do bot).
+        """
+        self._pending.clear()
+        self._queued = 0
+        tasks = list(self._tasks)
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+question_scheduler = QuestionScheduler()
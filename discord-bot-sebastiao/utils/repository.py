@@ -0,0 +1,254 @@
+"""
+    API assíncrona do banco de threads usada pelos eventos e comandos do bot.
+    Cada função executa a equivalente de utils.database na thread do DbWorker,
+    então um banco travado não bloqueia o event loop do discord.py.
+    get_thread é servido pelo cache de threads; as escritas atualizam o cache (write-through)
+    e o índice de mensagens que aguardam reação (prompt_index). O histórico recente de cada
+    thread também fica em memória e é gravado na coluna threads.history.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from utils import database, db_export
+from utils.db_worker import db_worker
+from utils.thread_cache import prompt_index, thread_cache
+from utils.thread_history import thread_history
+
+
+async def init_database() -> None:
+    await db_worker.call(database.init_database)
+
+
+async def warm_thread_cache() -> int:
+    """
+        Carrega as threads em aberto no cache (chamado no on_ready). Retorna quantas entraram.
+    """
+    rows = await db_worker.call(database.get_active_threads, thread_cache.max_entries)
+
+    # Mais antigas primeiro, para as recentes ficarem no fim do LRU
+    for row in reversed(rows):
+        thread_cache.put(row)
+
+    return len(rows)
+
+
+async def load_prompt_index() -> int:
+    """
+        Monta o índice de mensagens que aguardam reação a partir do banco (on_ready e após limpezas).
+    """
+    pairs = await db_worker.call(database.get_active_prompt_ids)
+    prompt_index.load(pairs)
+    return len(pairs)
+
+
+def _reloading(write: Callable[..., bool]) -> Callable[..., tuple[bool, Optional[Dict]]]:
+    """
+        Envolve uma escrita para rodar na thread do banco e reler a linha na mesma ida à fila.
+        Mantém o nome da escrita nas estatísticas do DbWorker.
+    """
+    def op(thread_id: str, *args: Any) -> tuple[bool, Optional[Dict]]:
+        ok = write(thread_id, *args)
+        return ok, database.get_thread(thread_id) if ok else None
+
+    op.__name__ = write.__name__
+    return op
+
+
+async def _write_through(write: Callable[..., bool], thread_id: str, *args: Any) -> bool:
+    ok, row = await db_worker.call(_reloading(write), thread_id, *args)
+
+    if row is not None:
+        thread_cache.put(row)
+        prompt_index.update_from_row(row)
+    else:
+        # Escrita falhou ou a linha sumiu: o próximo get_thread vai ao banco
+        thread_cache.discard(thread_id)
+
+    return ok
+
+
+async def get_thread(thread_id: str) -> Optional[Dict]:
+    record = thread_cache.get(thread_id)
+
+    if record is not None:
+        return record.as_dict()
+
+    row = await db_worker.call(database.get_thread, thread_id)
+
+    if row is not None:
+        thread_cache.put(row)
+
+    return row
+
+
+async def save_thread(thread_id: str, user_id: int, message_id: int) -> bool:
+    return await _write_through(database.save_thread, thread_id, user_id, message_id)
+
+
+async def update_thread(thread_id: str, message_id: int, status: str = "pending") -> bool:
+    return await _write_through(database.update_thread, thread_id, message_id, status)
+
+
+async def close_thread(thread_id: str, closed_message_id: Optional[int] = None) -> bool:
+    return await _write_through(database.close_thread, thread_id, closed_message_id)
+
+
+async def get_threads(thread_ids: list[str]) -> Dict[str, Dict]:
+    """
+        Várias threads por id (chave str): as do cache direto, as demais numa consulta só.
+    """
+    found: Dict[str, Dict] = {}
+    missing: list[str] = []
+
+    for thread_id in map(str, thread_ids):
+        record = thread_cache.get(thread_id)
+
+        if record is not None:
+            found[thread_id] = record.as_dict()
+        else:
+            missing.append(thread_id)
+
+    if missing:
+        for row in await db_worker.call(database.get_threads, missing):
+            thread_cache.put(row)
+            found[str(row["thread_id"])] = row
+
+    return found
+
+
+async def close_threads(closings: list[tuple[str, Optional[int]]]) -> int:
+    """
+        Fecha várias threads numa transação só; pares (thread_id, closed_message_id).
+    """
+    rows = await db_worker.call(database.close_threads, closings)
+
+    for row in rows:
+        thread_cache.put(row)
+        prompt_index.update_from_row(row)
+
+    return len(rows)
+
+
+async def delete_thread(thread_id: str) -> bool:
+    deleted = await db_worker.call(database.delete_thread, thread_id)
+    thread_cache.discard(thread_id)
+    prompt_index.remove_thread(thread_id)
+    thread_history.discard(thread_id)
+    return deleted
+
+
+async def cleanup_old_threads(days: int = 30, status_list: list[str] = None) -> int:
+    deleted = await db_worker.call(database.cleanup_old_threads, days, status_list)
+
+    # Não sabemos quais linhas saíram: esvazia o cache e deixa recarregar sob demanda
+    if deleted:
+        thread_cache.clear()
+        thread_history.clear()
+        await load_prompt_index()
+
+    return deleted
+
+
+async def purge_in_batches(
+    table: str, where: str, params: tuple, batch_size: int, pause: float
+) -> tuple[int, int]:
+    """
+        Limpeza periódica em lotes (database.purge_batch), com pausa entre eles para
+        as demais operações do bot passarem na fila do banco. Retorna (removidas, lotes).
+    """
+    deleted, batches, after_rowid = 0, 0, 0
+
+    while True:
+        removed, after_rowid = await db_worker.call(
+            database.purge_batch, table, where, params, after_rowid, batch_size)
+
+        if after_rowid is None:
+            break
+
+        deleted += removed
+        batches += 1
+        await asyncio.sleep(pause)
+
+    # Mesmo tratamento de cleanup_old_threads: o cache volta a ser preenchido sob demanda
+    if table == "threads" and deleted:
+        thread_cache.clear()
+        thread_history.clear()
+        await load_prompt_index()
+
+    return deleted, batches
+
+
+async def optimize_database(vacuum_pages: int) -> Dict[str, int]:
+    return await db_worker.call(database.optimize_database, vacuum_pages)
+
+
+async def get_thread_history(thread_id: str) -> Optional[list[Dict]]:
+    """
+        Histórico recente da thread: memória, depois banco. None se não houver em nenhum
+        (quem chama remonta a partir das mensagens do Discord).
+    """
+    history = thread_history.get(thread_id)
+
+    if history is not None:
+        return history
+
+    history = await db_worker.call(database.get_thread_history, str(thread_id))
+
+    if history is None:
+        return None
+
+    return thread_history.set(thread_id, history)
+
+
+async def record_exchange(thread_id: str, history: list[Dict], question: str, answer: str) -> list[Dict]:
+    """
+        Acrescenta pergunta e resposta ao histórico usado nesta pergunta, mantém só as últimas
+        trocas e grava junto da thread (a linha precisa existir: chamar depois de save_thread).
+    """
+    messages = thread_history.set(thread_id, [
+        *history,
+        {"role": "user", "content": question},
+        {"role": "assistant", "content": answer},
+    ])
+    await db_worker.call(database.set_thread_history, str(thread_id), messages)
+    return messages
+
+
+async def enqueue_job(thread_id: str, message_id: int, user_id: int, kind: str) -> Optional[Dict]:
+    return await db_worker.call(database.enqueue_job, thread_id, message_id, user_id, kind)
+
+
+async def lease_job(job_id: int, owner: str, lease_seconds: float, max_attempts: int) -> bool:
+    return await db_worker.call(database.lease_job, job_id, owner, lease_seconds, max_attempts)
+
+
+async def complete_job(job_id: int) -> bool:
+    return await db_worker.call(database.complete_job, job_id)
+
+
+async def fail_job(job_id: int, error: str, max_attempts: int) -> Optional[str]:
+    return await db_worker.call(database.fail_job, job_id, error, max_attempts)
+
+
+async def mark_job_failed(job_id: int, error: str) -> bool:
+    return await db_worker.call(database.mark_job_failed, job_id, error)
+
+
+async def get_resumable_jobs(owner: str) -> list[Dict]:
+    return await db_worker.call(database.get_resumable_jobs, owner)
+
+
+async def get_pending_threads_count() -> int:
+    return await db_worker.call(database.get_pending_threads_count)
+
+
+async def get_export_data() -> dict[str, list] | None:
+    return await db_worker.call(db_export.get_export_data)
+
+
+def db_stats() -> dict[str, Any]:
+    """
+        Profundidade da fila do banco e latência por operação (ver DbWorker.snapshot),
+        mais acertos/erros do cache de threads.
+    """
+    return {**db_worker.snapshot(), "thread_cache": thread_cache.snapshot()}
@@ -0,0 +1,157 @@
+"""
+    Cache em memória da tabela threads (write-through): os eventos consultam a thread aqui
+    antes de ir ao SQLite. utils.repository mantém o cache igual ao banco a cada escrita.
+    PromptIndex: ids das mensagens de confirmação ativas, para filtrar reações sem ir ao banco.
+"""
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+THREAD_CACHE_SIZE = int(os.getenv("THREAD_CACHE_SIZE", "1000"))
+
+
+class ThreadRecord:
+    """
+        Linha da tabela threads (mesmos campos devolvidos por database.get_thread).
+    """
+
+    __slots__ = ("thread_id", "user_id", "message_id", "iteration_count", "status", "closed_message_id")
+
+    def __init__(
+        self,
+        thread_id: str,
+        user_id: int,
+        message_id: int,
+        iteration_count: int,
+        status: str,
+        closed_message_id: Optional[int] = None,
+    ) -> None:
+        self.thread_id = thread_id
+        self.user_id = user_id
+        self.message_id = message_id
+        self.iteration_count = iteration_count
+        self.status = status
+        self.closed_message_id = closed_message_id
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "ThreadRecord":
+        return cls(
+            str(row["thread_id"]),
+            row["user_id"],
+            row["message_id"],
+            row["iteration_count"],
+            row["status"],
+            row.get("closed_message_id"),
+        )
+
+    def as_dict(self) -> Dict:
+        return {
+            "thread_id": self.thread_id,
+            "user_id": self.user_id,
+            "message_id": self.message_id,
+            "iteration_count": self.iteration_count,
+            "status": self.status,
+            "closed_message_id": self.closed_message_id,
+        }
+
+
+class ThreadCache:
+    """
+        LRU limitado a max_entries, chaveado pelo id da thread (como string).
+        Usado apenas no event loop do bot, por isso sem lock.
+    """
+
+    def __init__(self, max_entries: int = THREAD_CACHE_SIZE) -> None:
+        self.max_entries = max(1, max_entries)
+        self._records: OrderedDict[str, ThreadRecord] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, thread_id: Any) -> Optional[ThreadRecord]:
+        key = str(thread_id)
+        record = self._records.get(key)
+
+        if record is None:
+            self.stats["misses"] += 1
+            return None
+
+        self._records.move_to_end(key)
+        self.stats["hits"] += 1
+        return record
+
+    def put(self, row: Dict) -> ThreadRecord:
+        record = ThreadRecord.from_row(row)
+        self._records[record.thread_id] = record
+        self._records.move_to_end(record.thread_id)
+
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+            self.stats["evictions"] += 1
+
+        return record
+
+    def discard(self, thread_id: Any) -> None:
+        self._records.pop(str(thread_id), None)
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**self.stats, "entries": len(self._records), "max_entries": self.max_entries}
+
+
+thread_cache = ThreadCache()
+
+
+class PromptIndex:
+    """
+        message_id da mensagem "Isso resolveu seu problema?" -> thread_id, só de threads não fechadas.
+        Permite descartar reações em qualquer outra mensagem com um lookup O(1).
+    """
+
+    def __init__(self) -> None:
+        self._threads_by_message: dict[int, str] = {}
+        self._message_by_thread: dict[str, int] = {}
+
+    def set(self, thread_id: Any, message_id: int) -> None:
+        thread_id = str(thread_id)
+        self.remove_thread(thread_id)
+        self._threads_by_message[int(message_id)] = thread_id
+        self._message_by_thread[thread_id] = int(message_id)
+
+    def remove_thread(self, thread_id: Any) -> None:
+        message_id = self._message_by_thread.pop(str(thread_id), None)
+
+        if message_id is not None:
+            self._threads_by_message.pop(message_id, None)
+
+    def update_from_row(self, row: Dict) -> None:
+        if row["status"] == "closed":
+            self.remove_thread(row["thread_id"])
+        else:
+            self.set(row["thread_id"], row["message_id"])
+
+    def thread_for(self, message_id: int) -> Optional[str]:
+        return self._threads_by_message.get(message_id)
+
+    def load(self, pairs: list[tuple[int, str]]) -> None:
+        self.clear()
+
+        for message_id, thread_id in pairs:
+            self.set(thread_id, message_id)
+
+    def clear(self) -> None:
+        self._threads_by_message.clear()
+        self._message_by_thread.clear()
+
+    def __len__(self) -> int:
+        return len(self._threads_by_message)
+
+
+prompt_index = PromptIndex()
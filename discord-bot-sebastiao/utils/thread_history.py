@@ -0,0 +1,57 @@
+"""
+    Histórico recente de cada thread (últimas trocas user/assistant) para os follow-ups do orquestrador.
+    Fica em memória (LRU) e é gravado na coluna threads.history; só é remontado a partir das
+    mensagens do Discord quando não está nem em memória nem no banco.
+"""
+import os
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from utils.thread_cache import THREAD_CACHE_SIZE
+
+load_dotenv()
+
+# Trocas (pergunta + resposta) mantidas por thread
+HISTORY_MAX_EXCHANGES = int(os.getenv("HISTORY_MAX_EXCHANGES", "2"))
+
+
+class ThreadHistory:
+    """
+        Buffer circular de mensagens por thread (2 * max_exchanges), com LRU entre threads.
+    """
+
+    def __init__(self, max_threads: int = THREAD_CACHE_SIZE, max_exchanges: int = HISTORY_MAX_EXCHANGES) -> None:
+        self.max_threads = max(1, max_threads)
+        self.max_messages = max(1, max_exchanges) * 2
+        self._buffers: OrderedDict[str, deque] = OrderedDict()
+
+    def get(self, thread_id: Any) -> Optional[list[Dict]]:
+        key = str(thread_id)
+        buffer = self._buffers.get(key)
+
+        if buffer is None:
+            return None
+
+        self._buffers.move_to_end(key)
+        return list(buffer)
+
+    def set(self, thread_id: Any, messages: list[Dict]) -> list[Dict]:
+        key = str(thread_id)
+        self._buffers[key] = deque(messages, maxlen=self.max_messages)
+        self._buffers.move_to_end(key)
+
+        while len(self._buffers) > self.max_threads:
+            self._buffers.popitem(last=False)
+
+        return list(self._buffers[key])
+
+    def discard(self, thread_id: Any) -> None:
+        self._buffers.pop(str(thread_id), None)
+
+    def clear(self) -> None:
+        self._buffers.clear()
+
+
+thread_history = ThreadHistory()
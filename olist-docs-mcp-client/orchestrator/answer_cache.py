@@ -0,0 +1,197 @@
+"""
+    Cache de respostas do /answer, chaveado pela pergunta normalizada + fingerprint do histórico.
+    TTL, despejo LRU e limite de entradas; invalidado quando o MCP Server avisa que a doc mudou.
+    Modo opcional de similaridade: perguntas parecidas (embeddings OpenAI) reaproveitam a resposta.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from dotenv import load_dotenv
+from openai import OpenAIError
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_ENABLED = os.environ.get(
+    "ANSWER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+ANSWER_CACHE_TTL = float(os.environ.get("ANSWER_CACHE_TTL", "21600"))  # 6 horas
+ANSWER_CACHE_MAX_ENTRIES = int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", "500"))
+# Similaridade mínima (cosseno) para reaproveitar resposta de pergunta parecida; 0 desliga o modo
+ANSWER_CACHE_SIMILARITY = float(os.environ.get("ANSWER_CACHE_SIMILARITY", "0"))
+ANSWER_CACHE_EMBEDDING_MODEL = os.environ.get(
+    "ANSWER_CACHE_EMBEDDING_MODEL", "text-embedding-3-small")
+
+
+def normalize_question(text: str) -> str:
+    """
+        Minúsculas, sem acentos, espaços colapsados e sem pontuação final.
+    """
+
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"\s+", " ", text).strip()
+
+    return text.rstrip("?!. ")
+
+
+def history_fingerprint(history: list[dict[str, Any]] | None) -> str:
+    """
+        Hash do histórico (role + conteúdo normalizado); vazio quando não há histórico.
+    """
+
+    if not history:
+        return ""
+
+    items = [(h.get("role"), normalize_question(str(h.get("content", ""))))
+             for h in history]
+
+    return hashlib.sha1(json.dumps(items, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    key: str
+    question: str
+    fingerprint: str
+
+
+@dataclass
+class _Entry:
+    content: str
+    fingerprint: str
+    created_at: float
+    embedding: list[float] | None = None
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+
+    return dot / norm if norm else 0.0
+
+
+class AnswerCache:
+    """
+        Cache LRU em memória. Uso no /answer: make_key -> get (-> get_similar) -> put.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl: float = ANSWER_CACHE_TTL,
+        similarity: float = ANSWER_CACHE_SIMILARITY,
+        embedding_model: str = ANSWER_CACHE_EMBEDDING_MODEL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self.embedding_model = embedding_model
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.stats = {"hits": 0, "similar_hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def similarity_enabled(self) -> bool:
+        return self.similarity > 0
+
+    def make_key(self, message: str, history: list[dict[str, Any]] | None) -> CacheKey:
+        question = normalize_question(message)
+        fingerprint = history_fingerprint(history)
+        key = hashlib.sha1(
+            f"{question}\x1f{fingerprint}".encode("utf-8")).hexdigest()
+
+        return CacheKey(key=key, question=question, fingerprint=fingerprint)
+
+    def get(self, ck: CacheKey) -> str | None:
+        entry = self._entries.get(ck.key)
+
+        if entry is None or self._expired(entry):
+            if entry is not None:
+                del self._entries[ck.key]
+
+            return None
+
+        self._entries.move_to_end(ck.key)
+        self.stats["hits"] += 1
+
+        return entry.content
+
+    async def get_similar(self, ck: CacheKey, client) -> tuple[str | None, list[float] | None]:
+        """
+            Busca resposta de pergunta parecida (mesmo histórico). Devolve (conteúdo, embedding da pergunta);
+            o embedding é reaproveitado no put para não calcular duas vezes.
+            Se a API de embeddings falhar, conta como miss: devolve (None, None).
+        """
+
+        try:
+            response = await client.embeddings.create(model=self.embedding_model, input=ck.question)
+
+        except (OpenAIError, httpx.HTTPError) as e:
+            logger.warning("Embeddings indisponíveis, cache por similaridade ignorado: %s", e)
+            return None, None
+
+        embedding = list(response.data[0].embedding)
+        best_key, best_score = None, 0.0
+
+        for key, entry in self._entries.items():
+            if entry.embedding is None or entry.fingerprint != ck.fingerprint or self._expired(entry):
+                continue
+
+            score = _cosine(embedding, entry.embedding)
+
+            if score > best_score:
+                best_key, best_score = key, score
+
+        if best_key is not None and best_score >= self.similarity:
+            self._entries.move_to_end(best_key)
+            self.stats["similar_hits"] += 1
+            return self._entries[best_key].content, embedding
+
+        return None, embedding
+
+    def put(self, ck: CacheKey, content: str, embedding: list[float] | None = None) -> None:
+        self._entries[ck.key] = _Entry(
+            content=content,
+            fingerprint=ck.fingerprint,
+            created_at=time.monotonic(),
+            embedding=embedding,
+        )
+        self._entries.move_to_end(ck.key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record_miss(self) -> None:
+        self.stats["misses"] += 1
+
+    def invalidate(self) -> int:
+        """
+            Remove todas as entradas (ex.: a documentação mudou). Retorna quantas foram removidas.
+        """
+
+        removed = len(self._entries)
+        self._entries.clear()
+        self.stats["invalidations"] += 1
+
+        return removed
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "similarity": self.similarity,
+        }
+
+    def _expired(self, entry: _Entry) -> bool:
+        return (time.monotonic() - entry.created_at) >= self.ttl
@@ -1,15 +1,24 @@
 """
     FastAPI app: rota POST /answer recebe payload do bot e devolve resposta (content, attachment_content, guardrail_triggered).
+    POST /answer/stream: mesma entrada, resposta em NDJSON com os trechos do texto conforme são gerados.
     Habilita/desabilita: o bot usa este serviço apenas se ORCHESTRATOR_URL estiver definida.
     - attachment_content: quando a resposta tem > 2000 caracteres, content vira preview (500 chars) e o texto completo vai em attachment_content (bot envia como anexo).
     - guardrail_triggered: quando a mensagem do usuário é sinalizada pela moderação (OpenAI Moderation), retornamos True e uma mensagem de bloqueio.
 """
-from orchestrator.llm import answer_with_mcp
+from orchestrator.answer_cache import ANSWER_CACHE_ENABLED, AnswerCache, CacheKey
+from orchestrator.llm import INCOMPLETE_ANSWER_MESSAGE, STREAM_RESET, answer_with_mcp, stream_answer_with_mcp
+from orchestrator.mcp_pool import McpSessionPool
+from orchestrator.openai_client import create_openai_client, openai_pool_stats
+from openai import AsyncOpenAI
 from pydantic import BaseModel
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
 import logging
 import os
-from typing import Any, Literal
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Literal
 
 from dotenv import load_dotenv
 
@@ -20,6 +29,11 @@ logger = logging.getLogger(__name__)
 # Limite do Discord para mensagem em texto; acima disso enviamos preview + anexo (igual N8N)
 MAX_MESSAGE_LENGTH = 2000
 PREVIEW_LENGTH = 500
+# Moderação em paralelo com a resposta (cancela a resposta se a mensagem for sinalizada)
+SPECULATIVE_GUARDRAILS = os.environ.get(
+    "SPECULATIVE_GUARDRAILS", "true").lower() in ("1", "true", "yes")
+# Token exigido no POST /cache/invalidate; sem ele a rota fica desabilitada
+CACHE_INVALIDATE_TOKEN = os.environ.get("CACHE_INVALIDATE_TOKEN")
 GUARDRAIL_MESSAGE = (
     "Sua mensagem foi bloqueada pelos guardrails de segurança. "
     "Revise o conteúdo e tente novamente com uma pergunta relacionada à documentação da plataforma."
@@ -44,16 +58,14 @@ def _prepare_content_and_attachment(full_content: str) -> tuple[str, str | None]
     return preview + suffix, full_content
 
 
-async def _check_guardrails(user_message: str) -> bool:
+async def _check_guardrails(user_message: str, client: AsyncOpenAI | None = None) -> bool:
     """
         Verifica a mensagem do usuário com OpenAI Moderation API.
         Retorna True se algum critério for sinalizado (mensagem deve ser bloqueada).
     """
 
     try:
-        from openai import AsyncOpenAI
-
-        client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        client = client or AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
         mod = await client.moderations.create(input=user_message)
 
         if mod.results and len(mod.results) > 0:
@@ -86,7 +98,34 @@ def _format_exception(e: BaseException) -> str:
     return repr(e)
 
 
-app = FastAPI(title="Olist Docs MCP Orchestrator", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+        Abre o pool de sessões MCP e o cliente OpenAI na subida e fecha ambos no desligamento.
+    """
+
+    mcp_url = os.environ.get("MCP_SERVER_URL", "http://localhost:8000/mcp")
+    pool = McpSessionPool(mcp_url)
+    await pool.start()
+    app.state.mcp_pool = pool
+    app.state.answer_cache = AnswerCache() if ANSWER_CACHE_ENABLED else None
+    # Sem chave o app sobe mesmo assim; /answer responde 500 explicando a configuração
+    app.state.openai_client = (
+        create_openai_client() if os.environ.get("OPENAI_API_KEY") else None
+    )
+
+    try:
+        yield
+
+    finally:
+        await pool.close()
+
+        if app.state.openai_client is not None:
+            await app.state.openai_client.close()
+
+
+app = FastAPI(title="Olist Docs MCP Orchestrator",
+              version="0.1.0", lifespan=lifespan)
 
 
 class HistoryMessage(BaseModel):
@@ -120,62 +159,289 @@ class AnswerResponse(BaseModel):
     guardrail_triggered: bool = False
 
 
+def _history_dicts(payload: DiscordPayload) -> list[dict[str, str]]:
+    return [{"role": m.role, "content": m.content} for m in (payload.history or [])]
+
+
+async def _answer_question(payload: DiscordPayload) -> str:
+    """
+        Roda o loop LLM + MCP com uma sessão do pool e devolve o texto completo da resposta.
+    """
+
+    async with app.state.mcp_pool.acquire() as session:
+        return await answer_with_mcp(
+            payload.message, session, history=_history_dicts(payload), client=app.state.openai_client)
+
+
+async def _moderated_answer(payload: DiscordPayload) -> str | None:
+    """
+        Executa moderação e resposta. Retorna None se a mensagem for bloqueada pelos guardrails.
+        No modo especulativo as duas rodam juntas e a resposta é cancelada se a moderação sinalizar;
+        senão a moderação roda antes (modo sequencial).
+    """
+
+    if not SPECULATIVE_GUARDRAILS:
+        if await _check_guardrails(payload.message, app.state.openai_client):
+            return None
+
+        return await _answer_question(payload)
+
+    answer_task = asyncio.create_task(_answer_question(payload))
+
+    try:
+        flagged = await _check_guardrails(payload.message, app.state.openai_client)
+
+    except BaseException:
+        answer_task.cancel()
+        raise
+
+    if flagged:
+        answer_task.cancel()
+
+        with suppress(asyncio.CancelledError, Exception):
+            await answer_task
+
+        return None
+
+    return await answer_task
+
+
+async def _lookup_cache(payload: DiscordPayload) -> tuple[CacheKey | None, list[float] | None, str | None]:
+    """
+        Consulta o cache de respostas (exata e, se habilitada, por similaridade).
+        Retorna (chave, embedding da pergunta, resposta em cache ou None); registra o miss.
+    """
+
+    cache: AnswerCache | None = app.state.answer_cache
+
+    if cache is None:
+        return None, None, None
+
+    cache_key = cache.make_key(payload.message, _history_dicts(payload))
+    embedding = None
+    full_content = cache.get(cache_key)
+
+    if full_content is None and cache.similarity_enabled and app.state.openai_client is not None:
+        full_content, embedding = await cache.get_similar(cache_key, app.state.openai_client)
+
+        # A resposta é de outra pergunta: esta ainda não passou pela moderação. Se sinalizada,
+        # segue como miss e o fluxo normal devolve o bloqueio
+        if full_content is not None and await _check_guardrails(payload.message, app.state.openai_client):
+            full_content = None
+
+    if full_content is None:
+        cache.record_miss()
+
+    return cache_key, embedding, full_content
+
+
+def _store_answer(cache_key: CacheKey | None, full_content: str, embedding: list[float] | None) -> None:
+    cache: AnswerCache | None = app.state.answer_cache
+
+    # Só respostas completas vão para o cache (nunca bloqueios ou o fallback de erro)
+    if cache is not None and cache_key is not None and full_content and full_content != INCOMPLETE_ANSWER_MESSAGE:
+        cache.put(cache_key, full_content, embedding)
+
+
+def _final_response(full_content: str) -> AnswerResponse:
+    # Preview + anexo quando > 2000 caracteres (Discord limita mensagem; igual N8N)
+    content, attachment_content = _prepare_content_and_attachment(
+        full_content)
+    return AnswerResponse(
+        content=content,
+        attachment_content=attachment_content,
+        guardrail_triggered=False,
+    )
+
+
+def _guardrail_response() -> AnswerResponse:
+    return AnswerResponse(
+        content=GUARDRAIL_MESSAGE,
+        attachment_content=None,
+        guardrail_triggered=True,
+    )
+
+
 @app.post("/answer", response_model=AnswerResponse)
 async def answer(payload: DiscordPayload) -> AnswerResponse:
     """
-        Recebe a pergunta do bot (mesmo payload do N8N), conecta ao MCP Server,
-        usa OpenAI com as tools do MCP e devolve a resposta.
+        Recebe a pergunta do bot (mesmo payload do N8N), usa uma sessão do pool MCP
+        e OpenAI com as tools do MCP e devolve a resposta.
     """
 
-    mcp_url = os.environ.get("MCP_SERVER_URL", "http://localhost:8000/mcp")
-
     if not os.environ.get("OPENAI_API_KEY"):
         raise HTTPException(
             status_code=500, detail="OPENAI_API_KEY não configurada")
 
     try:
-        from mcp.client.session import ClientSession
-        from mcp.client.streamable_http import streamable_http_client
+        cache_key, embedding, full_content = await _lookup_cache(payload)
+
+        if full_content is None:
+            # Guardrails: moderação da mensagem do usuário (equivalente ao nó Guardrails do N8N)
+            full_content = await _moderated_answer(payload)
 
-    except ImportError as e:
+            if full_content is None:
+                return _guardrail_response()
+
+            _store_answer(cache_key, full_content, embedding)
+
+    except Exception as e:
+        msg = _format_exception(e)
+        logger.exception("Erro ao usar MCP ou OpenAI: %s", msg)
         raise HTTPException(
-            status_code=500,
-            detail=f"Dependência MCP client não disponível: {e}. Instale com: uv sync",
-        ) from e
-
-    # Guardrails: moderação da mensagem do usuário (equivalente ao nó Guardrails do N8N)
-    if await _check_guardrails(payload.message):
-        return AnswerResponse(
-            content=GUARDRAIL_MESSAGE,
-            attachment_content=None,
-            guardrail_triggered=True,
-        )
+            status_code=502, detail=f"Erro ao usar MCP ou OpenAI: {msg}") from e
+
+    return _final_response(full_content)
+
+
+def _ndjson(event_type: str, **data: Any) -> str:
+    return json.dumps({"type": event_type, **data}, ensure_ascii=False) + "\n"
+
+
+async def _produce_deltas(payload: DiscordPayload, queue: asyncio.Queue) -> None:
+    """
+        Gera a resposta em streaming com uma sessão do pool e põe os trechos na fila.
+        Fim: None; erro: a exceção.
+    """
+
+    try:
+        async with app.state.mcp_pool.acquire() as session:
+            async for text in stream_answer_with_mcp(
+                    payload.message, session, history=_history_dicts(payload), client=app.state.openai_client):
+                queue.put_nowait(text)
+
+        queue.put_nowait(None)
+
+    except Exception as e:
+        queue.put_nowait(e)
+
+
+async def _stream_events(
+    payload: DiscordPayload,
+    cache_key: CacheKey | None,
+    embedding: list[float] | None,
+) -> AsyncIterator[str]:
+    """
+        Eventos NDJSON do /answer/stream: "delta" com cada trecho do texto, "reset" quando o texto
+        já enviado deve ser descartado (a rodada virou tool call) e um "done" final
+        (mesmos campos do AnswerResponse) ou "error". A moderação segue SPECULATIVE_GUARDRAILS:
+        no modo especulativo os trechos ficam na fila até a moderação liberar.
+    """
+
+    if not SPECULATIVE_GUARDRAILS and await _check_guardrails(payload.message, app.state.openai_client):
+        yield _ndjson("done", **_guardrail_response().model_dump())
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    producer = asyncio.create_task(_produce_deltas(payload, queue))
 
     try:
-        async with streamable_http_client(mcp_url) as (read_stream, write_stream, _):
-            async with ClientSession(read_stream, write_stream) as session:
-                await session.initialize()
-                history = [{"role": m.role, "content": m.content}
-                           for m in (payload.history or [])]
-                full_content = await answer_with_mcp(payload.message, session, history=history)
-
-                # Preview + anexo quando > 2000 caracteres (Discord limita mensagem; igual N8N)
-                content, attachment_content = _prepare_content_and_attachment(
-                    full_content)
-                return AnswerResponse(
-                    content=content,
-                    attachment_content=attachment_content,
-                    guardrail_triggered=False,
-                )
+        if SPECULATIVE_GUARDRAILS and await _check_guardrails(payload.message, app.state.openai_client):
+            yield _ndjson("done", **_guardrail_response().model_dump())
+            return
+
+        parts: list[str] = []
+
+        while (item := await queue.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+
+            if item is STREAM_RESET:
+                parts.clear()
+                yield _ndjson("reset")
+                continue
+
+            parts.append(item)
+            yield _ndjson("delta", content=item)
+
+        full_content = "".join(parts).rstrip()
+        _store_answer(cache_key, full_content, embedding)
+        yield _ndjson("done", **_final_response(full_content).model_dump())
 
     except Exception as e:
         msg = _format_exception(e)
-        logger.exception("Erro ao usar MCP ou OpenAI: %s", msg)
+        logger.exception("Erro ao usar MCP ou OpenAI (stream): %s", msg)
+        yield _ndjson("error", detail=f"Erro ao usar MCP ou OpenAI: {msg}")
+
+    finally:
+        # Cliente desconectou, guardrail ou erro: não deixa a resposta rodando sozinha
+        producer.cancel()
+
+        with suppress(asyncio.CancelledError, Exception):
+            await producer
+
+
+@app.post("/answer/stream")
+async def answer_stream(payload: DiscordPayload) -> StreamingResponse:
+    """
+        Variante do /answer em NDJSON (uma linha JSON por evento): repassa os trechos da resposta
+        da OpenAI assim que chegam, para o bot ir editando a mensagem.
+        Resposta em cache sai como um único "delta" seguido do "done".
+    """
+
+    if not os.environ.get("OPENAI_API_KEY"):
+        raise HTTPException(
+            status_code=500, detail="OPENAI_API_KEY não configurada")
+
+    try:
+        cache_key, embedding, full_content = await _lookup_cache(payload)
+
+    except Exception as e:
+        msg = _format_exception(e)
+        logger.exception("Erro ao consultar cache: %s", msg)
         raise HTTPException(
             status_code=502, detail=f"Erro ao usar MCP ou OpenAI: {msg}") from e
 
+    if full_content is not None:
+        async def cached_events() -> AsyncIterator[str]:
+            yield _ndjson("delta", content=full_content)
+            yield _ndjson("done", **_final_response(full_content).model_dump())
+
+        events = cached_events()
+
+    else:
+        events = _stream_events(payload, cache_key, embedding)
+
+    return StreamingResponse(events, media_type="application/x-ndjson")
+
 
 @app.get("/health")
 async def health() -> dict[str, str]:
     """Health check para o Shard Cloud."""
     return {"status": "ok"}
+
+
+@app.get("/metrics")
+async def metrics() -> dict[str, Any]:
+    """Estatísticas dos pools (conexões OpenAI e sessões MCP)."""
+    return {
+        "openai": (
+            openai_pool_stats(app.state.openai_client)
+            if app.state.openai_client is not None else None
+        ),
+        "mcp_pool": app.state.mcp_pool.stats(),
+        "answer_cache": (
+            app.state.answer_cache.snapshot()
+            if app.state.answer_cache is not None else None
+        ),
+    }
+
+
+@app.post("/cache/invalidate")
+async def invalidate_cache(x_cache_token: str | None = Header(default=None)) -> dict[str, int]:
+    """
+        Limpa o cache de respostas. Chamado pelo MCP Server quando a documentação muda
+        (DOCS_REFRESH_WEBHOOK_URL) ou manualmente. Exige CACHE_INVALIDATE_TOKEN no header X-Cache-Token.
+    """
+
+    if not CACHE_INVALIDATE_TOKEN:
+        raise HTTPException(
+            status_code=404, detail="Invalidação desabilitada (CACHE_INVALIDATE_TOKEN não configurado)")
+
+    if x_cache_token != CACHE_INVALIDATE_TOKEN:
+        raise HTTPException(status_code=403, detail="Token inválido")
+
+    if app.state.answer_cache is None:
+        return {"removed": 0}
+
+    return {"removed": app.state.answer_cache.invalidate()}
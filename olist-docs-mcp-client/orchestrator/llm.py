@@ -2,14 +2,28 @@
     Integração OpenAI + MCP: obtém contexto via tools do MCP e gera resposta com ChatGPT.
     Uma única responsabilidade: orquestrar chamadas ao LLM e ao MCP.
 """
+import asyncio
 import json
 import os
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
 
+from mcp.shared.exceptions import McpError
 from openai import AsyncOpenAI
 
 from orchestrator.prompts import SYSTEM_PROMPT
 
+INCOMPLETE_ANSWER_MESSAGE = (
+    "Não foi possível obter uma resposta completa. Tente reformular a pergunta ou contate o suporte."
+)
+
+# Gerado por stream_answer_with_mcp quando uma rodada já repassada vira tool call:
+# o texto gerado até ali não é a resposta e deve ser descartado
+STREAM_RESET = object()
+
+# Máximo de tool calls de uma mesma rodada executadas ao mesmo tempo
+MAX_PARALLEL_TOOL_CALLS = int(os.environ.get("MAX_PARALLEL_TOOL_CALLS", "4"))
+
 # Schemas das tools em formato OpenAI (espelhando o MCP Server)
 OPENAI_TOOLS = [
     {
@@ -41,6 +55,8 @@ OPENAI_TOOLS = [
 async def call_mcp_tool(mcp_session, name: str, arguments: dict[str, Any]) -> str:
     """
         Chama uma tool no MCP Server e retorna o conteúdo como string para o LLM.
+        Erro devolvido pelo servidor (McpError) vira texto de erro para o modelo; erros de
+        transporte/sessão são repassados, para o pool descartar a sessão.
     """
 
     try:
@@ -60,10 +76,25 @@ async def call_mcp_tool(mcp_session, name: str, arguments: dict[str, Any]) -> st
 
         return "\n\n".join(parts) if parts else json.dumps({"message": "Nenhum conteúdo retornado"})
 
-    except Exception as e:
+    except McpError as e:
         return json.dumps({"error": str(e)})
 
 
+async def _run_tool_call(mcp_session, tc, semaphore: asyncio.Semaphore) -> str:
+    """
+        Executa uma tool call do modelo respeitando o limite de chamadas simultâneas.
+    """
+
+    try:
+        args = json.loads(tc.function.arguments or "{}")
+
+    except json.JSONDecodeError:
+        args = {}
+
+    async with semaphore:
+        return await call_mcp_tool(mcp_session, tc.function.name, args)
+
+
 def _build_history_messages(history: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
     """
         Inclui apenas role e content, em ordem; ignora entradas inválidas.
@@ -84,6 +115,52 @@ def _build_history_messages(history: list[dict[str, Any]] | None) -> list[dict[s
     return out
 
 
+def _initial_messages(user_message: str, history: list[dict[str, Any]] | None) -> list[dict[str, Any]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        *_build_history_messages(history),
+        {"role": "user", "content": user_message},
+    ]
+
+
+async def _run_tool_round(
+    messages: list[dict[str, Any]],
+    mcp_session,
+    content: str | None,
+    tool_calls: list,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    """
+        Registra o turno do assistente com as tool calls da rodada e anexa as respostas do MCP.
+    """
+
+    # Um único turno do assistente com todas as tool calls da rodada
+    messages.append({
+        "role": "assistant",
+        "content": content or None,
+        "tool_calls": [
+            {
+                "id": tc.id,
+                "type": "function",
+                "function": {"name": tc.function.name, "arguments": tc.function.arguments or "{}"},
+            }
+            for tc in tool_calls
+        ],
+    })
+
+    # Executa as tool calls da rodada em paralelo (limitado); a ordem das respostas é preservada
+    contents = await asyncio.gather(*(
+        _run_tool_call(mcp_session, tc, semaphore) for tc in tool_calls
+    ))
+
+    for tc, result in zip(tool_calls, contents):
+        messages.append({
+            "role": "tool",
+            "tool_call_id": tc.id,
+            "content": result,
+        })
+
+
 async def answer_with_mcp(
     user_message: str,
     mcp_session,
@@ -91,20 +168,19 @@ async def answer_with_mcp(
     history: list[dict[str, Any]] | None = None,
     model: str | None = None,
     max_tool_rounds: int = 5,
+    client: AsyncOpenAI | None = None,
 ) -> str:
     """
         Envia a pergunta ao ChatGPT com as tools disponíveis; quando o modelo
         pedir tool call, chama o MCP e repassa o resultado até o modelo responder em texto.
         history: mensagens anteriores da thread (user/assistant) para follow-ups.
+        client: cliente compartilhado do app; se omitido, cria um avulso.
     """
 
-    client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    client = client or AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
     model = model or os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
-    messages: list[dict[str, Any]] = [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        *_build_history_messages(history),
-        {"role": "user", "content": user_message},
-    ]
+    messages = _initial_messages(user_message, history)
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOL_CALLS)
 
     for _ in range(max_tool_rounds):
         response = await client.chat.completions.create(
@@ -120,32 +196,99 @@ async def answer_with_mcp(
         if not getattr(msg, "tool_calls", None):
             return (msg.content or "").strip()
 
-        for tc in msg.tool_calls:
-            name = tc.function.name
-
-            try:
-                args = json.loads(tc.function.arguments or "{}")
-
-            except json.JSONDecodeError:
-                args = {}
-
-            content = await call_mcp_tool(mcp_session, name, args)
-            messages.append({
-                "role": "assistant",
-                "content": msg.content or None,
-                "tool_calls": [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {"name": name, "arguments": tc.function.arguments or "{}"},
-                    }
-                ],
-            })
-
-            messages.append({
-                "role": "tool",
-                "tool_call_id": tc.id,
-                "content": content,
-            })
-
-    return "Não foi possível obter uma resposta completa. Tente reformular a pergunta ou contate o suporte."
+        await _run_tool_round(messages, mcp_session, msg.content, msg.tool_calls, semaphore)
+
+    return INCOMPLETE_ANSWER_MESSAGE
+
+
+def _merge_tool_call_deltas(pending: dict[int, SimpleNamespace], deltas) -> None:
+    """
+        Acumula os fragmentos de tool calls do stream (id/nome chegam uma vez, argumentos em partes).
+    """
+
+    for d in deltas:
+        tc = pending.setdefault(d.index, SimpleNamespace(
+            id=None, function=SimpleNamespace(name="", arguments="")))
+
+        if d.id:
+            tc.id = d.id
+
+        fn = getattr(d, "function", None)
+
+        if fn is not None:
+            tc.function.name += fn.name or ""
+            tc.function.arguments += fn.arguments or ""
+
+
+async def stream_answer_with_mcp(
+    user_message: str,
+    mcp_session,
+    *,
+    history: list[dict[str, Any]] | None = None,
+    model: str | None = None,
+    max_tool_rounds: int = 5,
+    client: AsyncOpenAI | None = None,
+) -> AsyncIterator[str | object]:
+    """
+        Igual a answer_with_mcp, mas lê cada rodada em stream da OpenAI e gera os trechos de
+        texto assim que chegam. Se uma rodada que já gerou texto pede tool calls, gera STREAM_RESET
+        (o texto era raciocínio intermediário); depois do primeiro fragmento de tool call o resto
+        do texto da rodada não é repassado. Se as rodadas se esgotarem, gera INCOMPLETE_ANSWER_MESSAGE.
+    """
+
+    client = client or AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    model = model or os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+    messages = _initial_messages(user_message, history)
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOL_CALLS)
+
+    for _ in range(max_tool_rounds):
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            tools=OPENAI_TOOLS,
+            tool_choice="auto",
+            max_tokens=8192,
+            stream=True,
+        )
+        content_parts: list[str] = []
+        pending: dict[int, SimpleNamespace] = {}
+        streamed = False
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+
+            delta = chunk.choices[0].delta
+
+            if getattr(delta, "tool_calls", None):
+                if streamed and not pending:
+                    yield STREAM_RESET
+                _merge_tool_call_deltas(pending, delta.tool_calls)
+
+            text = getattr(delta, "content", None)
+
+            if not text:
+                continue
+
+            content_parts.append(text)
+
+            if pending:
+                continue
+
+            # Ignora espaços iniciais (answer_with_mcp devolve o texto com strip)
+            if not streamed:
+                text = text.lstrip()
+
+                if not text:
+                    continue
+
+            streamed = True
+            yield text
+
+        if not pending:
+            return
+
+        tool_calls = [pending[i] for i in sorted(pending)]
+        await _run_tool_round(messages, mcp_session, "".join(content_parts), tool_calls, semaphore)
+
+    yield INCOMPLETE_ANSWER_MESSAGE
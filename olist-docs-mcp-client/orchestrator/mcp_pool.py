@@ -0,0 +1,221 @@
+"""
+    Pool de sessões MCP (ClientSession) reaproveitadas entre requisições do /answer.
+    Cada sessão vive numa task própria (os context managers do MCP/anyio precisam abrir e fechar
+    na mesma task) e é reconectada quando cai ou falha no health check (ping). Tool call que falha
+    no transporte descarta a sessão e é repetida numa nova (PooledClientSession).
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from dotenv import load_dotenv
+from mcp.client.session import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+from mcp.shared.exceptions import McpError
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+MCP_POOL_SIZE = int(os.environ.get("MCP_POOL_SIZE", "4"))
+# Sessões ociosas há mais que isso recebem um ping antes de serem usadas (segundos)
+MCP_HEALTH_CHECK_INTERVAL = float(os.environ.get("MCP_HEALTH_CHECK_INTERVAL", "30"))
+MCP_CONNECT_TIMEOUT = float(os.environ.get("MCP_CONNECT_TIMEOUT", "15"))
+MCP_PING_TIMEOUT = float(os.environ.get("MCP_PING_TIMEOUT", "5"))
+
+
+class _PooledSession:
+    """
+        Uma conexão MCP do pool. connect() abre a sessão numa task dedicada; close() encerra.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.session: ClientSession | None = None
+        self.last_used = 0.0
+        self.suspect = False
+        self._task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: BaseException | None = None
+        # Várias tool calls em paralelo podem ver a mesma sessão cair: só uma reconecta
+        self.lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def connect(self) -> None:
+        await self.close()
+
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._run())
+
+        try:
+            await asyncio.wait_for(self._ready.wait(), MCP_CONNECT_TIMEOUT)
+
+        except asyncio.TimeoutError:
+            await self.close()
+            raise
+
+        if self._error is not None:
+            raise self._error
+
+        self.last_used = time.monotonic()
+        self.suspect = False
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+
+        self._closing.set()
+
+        try:
+            await asyncio.wait_for(self._task, MCP_CONNECT_TIMEOUT)
+
+        except asyncio.TimeoutError:
+            self._task.cancel()
+
+        self._task = None
+        self.session = None
+
+    async def _run(self) -> None:
+        try:
+            async with streamable_http_client(self.url) as (read_stream, write_stream, _):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+
+        except Exception as e:
+            self._error = e
+            logger.warning("Sessão MCP encerrada com erro: %r", e)
+
+        finally:
+            self.session = None
+            self._ready.set()
+
+
+class PooledClientSession:
+    """
+        O que acquire() entrega: repassa tudo à ClientSession do slot. call_tool que falha no
+        transporte (qualquer erro que não seja McpError, a resposta de erro do próprio servidor)
+        reconecta o slot e é repetida uma vez na sessão nova.
+    """
+
+    def __init__(self, pool: "McpSessionPool", slot: _PooledSession) -> None:
+        self._pool = pool
+        self._slot = slot
+
+    def __getattr__(self, name: str):
+        return getattr(self._slot.session, name)
+
+    async def call_tool(self, name: str, arguments: dict | None = None, **kwargs):
+        session = self._slot.session
+
+        try:
+            return await session.call_tool(name, arguments=arguments, **kwargs)
+
+        except McpError:
+            raise
+
+        except Exception as e:
+            logger.warning("MCP pool: tool %s falhou no transporte, reconectando: %r", name, e)
+            await self._pool._replace(self._slot, session)
+
+        return await self._slot.session.call_tool(name, arguments=arguments, **kwargs)
+
+
+class McpSessionPool:
+    """
+        Pool de tamanho fixo. acquire() entrega uma sessão saudável (reconectando se preciso)
+        e a devolve ao pool no final; erro durante o uso marca a sessão para novo health check.
+    """
+
+    def __init__(self, url: str, size: int = MCP_POOL_SIZE) -> None:
+        self.url = url
+        self.size = max(1, size)
+        self._slots = [_PooledSession(url) for _ in range(self.size)]
+        self._idle: asyncio.Queue[_PooledSession] = asyncio.Queue()
+        self.reconnects = 0
+
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+
+    async def start(self) -> None:
+        """
+            Abre as sessões em paralelo. Falhas não impedem a subida: o slot conecta no primeiro uso.
+        """
+        results = await asyncio.gather(
+            *(slot.connect() for slot in self._slots), return_exceptions=True)
+
+        failed = sum(1 for r in results if isinstance(r, BaseException))
+
+        if failed:
+            logger.warning(
+                "MCP pool: %d de %d sessões não conectaram na subida", failed, self.size)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(slot.close() for slot in self._slots), return_exceptions=True)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ClientSession]:
+        slot = await self._idle.get()
+
+        try:
+            await self._ensure_healthy(slot)
+
+            try:
+                yield PooledClientSession(self, slot)
+
+            except Exception:
+                slot.suspect = True
+                raise
+
+            slot.last_used = time.monotonic()
+
+        finally:
+            self._idle.put_nowait(slot)
+
+    async def _ensure_healthy(self, slot: _PooledSession) -> None:
+        if slot.alive:
+            idle_for = time.monotonic() - slot.last_used
+
+            if not slot.suspect and idle_for < MCP_HEALTH_CHECK_INTERVAL:
+                return
+
+            try:
+                await asyncio.wait_for(slot.session.send_ping(), MCP_PING_TIMEOUT)
+                slot.suspect = False
+                return
+
+            except Exception as e:
+                logger.warning("MCP pool: ping falhou, reconectando: %r", e)
+
+        self.reconnects += 1
+        await slot.connect()
+
+    async def _replace(self, slot: _PooledSession, failed: ClientSession | None) -> None:
+        """
+            Reconecta o slot cuja sessão `failed` caiu, a não ser que outra chamada já o tenha feito.
+        """
+        async with slot.lock:
+            if slot.alive and slot.session is not failed:
+                return
+
+            self.reconnects += 1
+            await slot.connect()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "alive": sum(1 for slot in self._slots if slot.alive),
+            "reconnects": self.reconnects,
+        }
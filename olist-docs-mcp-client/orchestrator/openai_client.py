@@ -0,0 +1,92 @@
+"""
+    Cliente AsyncOpenAI único do app, com pool de conexões HTTP configurável e HTTP/2
+    (as requisições simultâneas são multiplexadas nas mesmas conexões).
+    Criado no startup (lifespan) e fechado no shutdown; chat e moderação compartilham as conexões.
+"""
+import os
+from typing import Any
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+load_dotenv()
+
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE = int(os.environ.get("OPENAI_MAX_KEEPALIVE", "20"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "60"))
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", "120"))
+OPENAI_CONNECT_TIMEOUT = float(os.environ.get("OPENAI_CONNECT_TIMEOUT", "10"))
+
+
+class _RequestCounter:
+    """
+        Contadores alimentados pelos event hooks do httpx.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.responses = 0
+        self.http2_responses = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+
+    async def on_response(self, response: httpx.Response) -> None:
+        self.responses += 1
+
+        if response.http_version == "HTTP/2":
+            self.http2_responses += 1
+
+
+def create_openai_client() -> AsyncOpenAI:
+    """
+        Cria o AsyncOpenAI com um httpx.AsyncClient próprio (HTTP/2, limites e timeouts do .env).
+    """
+
+    counter = _RequestCounter()
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+        event_hooks={"request": [counter.on_request],
+                     "response": [counter.on_response]},
+    )
+    http_client.request_counter = counter
+
+    return AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), http_client=http_client)
+
+
+def openai_pool_stats(client: AsyncOpenAI) -> dict[str, Any]:
+    """
+        Estatísticas do pool HTTP do cliente: limites e os contadores próprios de requisições.
+        As conexões abertas/ociosas vêm do httpcore (API interna): só entram se a leitura funcionar.
+    """
+
+    http_client = client._client
+    counter: _RequestCounter | None = getattr(http_client, "request_counter", None)
+    stats: dict[str, Any] = {
+        "max_connections": OPENAI_MAX_CONNECTIONS,
+        "max_keepalive_connections": OPENAI_MAX_KEEPALIVE,
+    }
+
+    if counter is not None:
+        stats["requests_total"] = counter.requests
+        stats["awaiting_response"] = counter.requests - counter.responses
+        stats["http2_responses"] = counter.http2_responses
+
+    try:
+        connections = list(http_client._transport._pool.connections)
+        idle = sum(1 for c in connections if c.is_idle())
+
+    except Exception:
+        return stats
+
+    stats["connections"] = len(connections)
+    stats["idle_connections"] = idle
+
+    return stats
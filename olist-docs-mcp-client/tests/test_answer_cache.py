@@ -0,0 +1,91 @@
+"""
+    Testes do cache de respostas (normalização, TTL, LRU, invalidação e similaridade).
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+
+from orchestrator import answer_cache
+from orchestrator.answer_cache import AnswerCache, normalize_question
+
+
+def test_normaliza_caixa_acentos_espacos_e_pontuacao():
+    assert normalize_question("  Como  CONFIGURO o cálculo de frete?? ") == \
+        "como configuro o calculo de frete"
+
+
+def test_mesma_pergunta_normalizada_e_hit():
+    cache = AnswerCache(max_entries=10, ttl=60)
+    cache.put(cache.make_key("Como uso load_banners?", None), "Resposta")
+
+    assert cache.get(cache.make_key("como uso LOAD_BANNERS", None)) == "Resposta"
+    assert cache.stats["hits"] == 1
+
+
+def test_historico_diferente_nao_compartilha_resposta():
+    cache = AnswerCache(max_entries=10, ttl=60)
+    history = [{"role": "user", "content": "Pergunta anterior"}]
+    cache.put(cache.make_key("não entendi", history), "Resposta com contexto")
+
+    assert cache.get(cache.make_key("não entendi", None)) is None
+    assert cache.get(cache.make_key("não entendi", history)) == "Resposta com contexto"
+
+
+def test_entrada_expirada_nao_e_servida():
+    cache = AnswerCache(max_entries=10, ttl=60)
+    key = cache.make_key("pergunta", None)
+    cache.put(key, "Resposta")
+
+    with patch.object(answer_cache.time, "monotonic", return_value=10**9):
+        assert cache.get(key) is None
+
+
+def test_lru_respeita_limite_de_entradas():
+    cache = AnswerCache(max_entries=2, ttl=60)
+    a, b, c = (cache.make_key(q, None) for q in ("a", "b", "c"))
+    cache.put(a, "A")
+    cache.put(b, "B")
+    cache.get(a)  # "a" passa a ser o mais recente
+    cache.put(c, "C")
+
+    assert cache.get(b) is None
+    assert cache.get(a) == "A"
+    assert cache.get(c) == "C"
+
+
+def test_invalidate_limpa_tudo():
+    cache = AnswerCache(max_entries=10, ttl=60)
+    cache.put(cache.make_key("a", None), "A")
+
+    assert cache.invalidate() == 1
+    assert cache.get(cache.make_key("a", None)) is None
+
+
+def test_similaridade_reaproveita_pergunta_parecida():
+    cache = AnswerCache(max_entries=10, ttl=60, similarity=0.9)
+    client = MagicMock()
+    client.embeddings.create = AsyncMock(side_effect=[
+        SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, 0.0])]),
+        SimpleNamespace(data=[SimpleNamespace(embedding=[0.99, 0.05])]),
+    ])
+
+    first = cache.make_key("como uso banners", None)
+    content, embedding = asyncio.run(cache.get_similar(first, client))
+    assert content is None
+    cache.put(first, "Resposta banners", embedding)
+
+    second = cache.make_key("de que forma uso os banners", None)
+    content, _ = asyncio.run(cache.get_similar(second, client))
+
+    assert content == "Resposta banners"
+    assert cache.stats["similar_hits"] == 1
+
+
+def test_falha_nos_embeddings_conta_como_miss():
+    cache = AnswerCache(max_entries=10, ttl=60, similarity=0.9)
+    client = MagicMock()
+    client.embeddings.create = AsyncMock(side_effect=httpx.ConnectTimeout("timeout"))
+
+    assert asyncio.run(cache.get_similar(cache.make_key("a", None), client)) == (None, None)
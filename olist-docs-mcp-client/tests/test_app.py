@@ -0,0 +1,264 @@
+"""
+    Testes das rotas /answer e /answer/stream (moderação especulativa, cache, streaming NDJSON).
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from orchestrator import app as app_module
+from orchestrator.answer_cache import AnswerCache
+
+PAYLOAD = {
+    "message": "Como uso load_banners?",
+    "discord": {"thread_id": "111", "channel_id": "222", "message_id": "999"},
+    "author": {"id": "1", "username": "u", "display_name": "U"},
+}
+
+
+class FakePool:
+    @asynccontextmanager
+    async def acquire(self):
+        yield object()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-teste")
+    app_module.app.state.mcp_pool = FakePool()
+    app_module.app.state.openai_client = None
+    app_module.app.state.answer_cache = None
+    # Sem "with": não executa o lifespan (não abre MCP nem OpenAI de verdade)
+    return TestClient(app_module.app)
+
+
+def test_resposta_normal_com_moderacao_em_paralelo(client):
+    started = asyncio.Event()
+
+    async def fake_answer(message, session, **kwargs):
+        started.set()
+        return "Resposta"
+
+    async def fake_guardrails(message, openai_client=None):
+        # A resposta já começou antes da moderação terminar
+        await asyncio.wait_for(started.wait(), 1)
+        return False
+
+    with (
+        patch.object(app_module, "SPECULATIVE_GUARDRAILS", True),
+        patch.object(app_module, "answer_with_mcp", fake_answer),
+        patch.object(app_module, "_check_guardrails", fake_guardrails),
+    ):
+        response = client.post("/answer", json=PAYLOAD)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "content": "Resposta",
+        "attachment_content": None,
+        "guardrail_triggered": False,
+    }
+
+
+def test_moderacao_sinalizada_cancela_resposta(client):
+    cancelled = []
+
+    async def slow_answer(message, session, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "não deveria chegar aqui"
+
+    async def flagged(message, openai_client=None):
+        await asyncio.sleep(0.01)
+        return True
+
+    with (
+        patch.object(app_module, "SPECULATIVE_GUARDRAILS", True),
+        patch.object(app_module, "answer_with_mcp", slow_answer),
+        patch.object(app_module, "_check_guardrails", flagged),
+    ):
+        response = client.post("/answer", json=PAYLOAD)
+
+    assert response.json()["guardrail_triggered"] is True
+    assert response.json()["content"] == app_module.GUARDRAIL_MESSAGE
+    assert cancelled == [True]
+
+
+def test_modo_sequencial_nao_chama_llm_quando_sinalizada(client):
+    called = []
+
+    async def fake_answer(message, session, **kwargs):
+        called.append(True)
+        return "Resposta"
+
+    async def flagged(message, openai_client=None):
+        return True
+
+    with (
+        patch.object(app_module, "SPECULATIVE_GUARDRAILS", False),
+        patch.object(app_module, "answer_with_mcp", fake_answer),
+        patch.object(app_module, "_check_guardrails", flagged),
+    ):
+        response = client.post("/answer", json=PAYLOAD)
+
+    assert response.json()["guardrail_triggered"] is True
+    assert called == []
+
+
+def test_pergunta_repetida_e_servida_do_cache(client):
+    calls = []
+
+    async def fake_answer(message, session, **kwargs):
+        calls.append(message)
+        return "Resposta"
+
+    async def benign(message, openai_client=None):
+        return False
+
+    app_module.app.state.answer_cache = AnswerCache(max_entries=10, ttl=60)
+
+    with (
+        patch.object(app_module, "answer_with_mcp", fake_answer),
+        patch.object(app_module, "_check_guardrails", benign),
+    ):
+        first = client.post("/answer", json=PAYLOAD)
+        second = client.post(
+            "/answer", json={**PAYLOAD, "message": "como uso LOAD_BANNERS"})
+
+    assert first.json() == second.json()
+    assert len(calls) == 1
+
+    assert client.post("/cache/invalidate").status_code == 404
+
+    with patch.object(app_module, "CACHE_INVALIDATE_TOKEN", "segredo"):
+        assert client.post("/cache/invalidate", headers={"X-Cache-Token": "x"}).status_code == 403
+        assert client.post(
+            "/cache/invalidate", headers={"X-Cache-Token": "segredo"}).json() == {"removed": 1}
+
+
+def test_resposta_parecida_passa_pela_moderacao(client):
+    async def fake_answer(message, session, **kwargs):
+        return "Resposta"
+
+    async def flagged(message, openai_client=None):
+        return True
+
+    cache = AnswerCache(max_entries=10, ttl=60, similarity=0.9)
+    cache.put(cache.make_key("outra pergunta", None), "Resposta em cache", [1.0, 0.0])
+
+    async def similar(ck, openai_client):
+        return "Resposta em cache", [1.0, 0.0]
+
+    cache.get_similar = similar
+    app_module.app.state.answer_cache = cache
+    app_module.app.state.openai_client = object()
+
+    with (
+        patch.object(app_module, "SPECULATIVE_GUARDRAILS", False),
+        patch.object(app_module, "answer_with_mcp", fake_answer),
+        patch.object(app_module, "_check_guardrails", flagged),
+    ):
+        response = client.post("/answer", json=PAYLOAD)
+
+    assert response.json()["guardrail_triggered"] is True
+
+
+def _events(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_stream_repassa_trechos_e_envia_done(client):
+    async def fake_stream(message, session, **kwargs):
+        for part in ("Olá", ", ", "mundo"):
+            yield part
+
+    async def benign(message, openai_client=None):
+        return False
+
+    app_module.app.state.answer_cache = AnswerCache(max_entries=10, ttl=60)
+
+    with (
+        patch.object(app_module, "stream_answer_with_mcp", fake_stream),
+        patch.object(app_module, "_check_guardrails", benign),
+    ):
+        response = client.post("/answer/stream", json=PAYLOAD)
+        cached = client.post("/answer/stream", json=PAYLOAD)
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = _events(response)
+    assert [e["content"] for e in events if e["type"] == "delta"] == ["Olá", ", ", "mundo"]
+    assert events[-1] == {
+        "type": "done",
+        "content": "Olá, mundo",
+        "attachment_content": None,
+        "guardrail_triggered": False,
+    }
+    assert _events(cached) == [
+        {"type": "delta", "content": "Olá, mundo"},
+        events[-1],
+    ]
+
+
+def test_stream_reset_descarta_trechos_anteriores(client):
+    async def fake_stream(message, session, **kwargs):
+        for part in ("Vou consultar.", app_module.STREAM_RESET, "Resposta", " final"):
+            yield part
+
+    async def benign(message, openai_client=None):
+        return False
+
+    with (
+        patch.object(app_module, "stream_answer_with_mcp", fake_stream),
+        patch.object(app_module, "_check_guardrails", benign),
+    ):
+        response = client.post("/answer/stream", json=PAYLOAD)
+
+    events = _events(response)
+    assert [e["type"] for e in events] == ["delta", "reset", "delta", "delta", "done"]
+    assert events[-1]["content"] == "Resposta final"
+
+
+def test_stream_bloqueado_nao_envia_trechos(client):
+    async def fake_stream(message, session, **kwargs):
+        yield "não deveria sair"
+
+    async def flagged(message, openai_client=None):
+        await asyncio.sleep(0.01)
+        return True
+
+    with (
+        patch.object(app_module, "SPECULATIVE_GUARDRAILS", True),
+        patch.object(app_module, "stream_answer_with_mcp", fake_stream),
+        patch.object(app_module, "_check_guardrails", flagged),
+    ):
+        response = client.post("/answer/stream", json=PAYLOAD)
+
+    events = _events(response)
+    assert len(events) == 1
+    assert events[0]["type"] == "done"
+    assert events[0]["guardrail_triggered"] is True
+
+
+def test_stream_erro_vira_evento_error(client):
+    async def broken_stream(message, session, **kwargs):
+        yield "parcial"
+        raise RuntimeError("OpenAI caiu")
+
+    async def benign(message, openai_client=None):
+        return False
+
+    with (
+        patch.object(app_module, "stream_answer_with_mcp", broken_stream),
+        patch.object(app_module, "_check_guardrails", benign),
+    ):
+        response = client.post("/answer/stream", json=PAYLOAD)
+
+    events = _events(response)
+    assert events[0] == {"type": "delta", "content": "parcial"}
+    assert events[-1]["type"] == "error"
+    assert "OpenAI caiu" in events[-1]["detail"]
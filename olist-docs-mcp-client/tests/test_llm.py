@@ -0,0 +1,163 @@
+"""
+    Testes do loop de tool calls (answer_with_mcp e stream_answer_with_mcp).
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from orchestrator.llm import STREAM_RESET, answer_with_mcp, call_mcp_tool, stream_answer_with_mcp
+
+
+def _tool_call(call_id: str, name: str, arguments: dict) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=json.dumps(arguments)),
+    )
+
+
+def _completion(content=None, tool_calls=None) -> SimpleNamespace:
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class SlowSession:
+    """Sessão MCP falsa que registra quantas tools rodam ao mesmo tempo."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def call_tool(self, name, arguments=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return SimpleNamespace(isError=False, content=[SimpleNamespace(text=f"{name}:{arguments['query']}")])
+
+
+def _client_with(*completions) -> MagicMock:
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=list(completions))
+    return client
+
+
+def test_tool_calls_da_rodada_rodam_em_paralelo_com_um_turno_do_assistente():
+    client = _client_with(
+        _completion(tool_calls=[
+            _tool_call("c1", "get_olist_docs_context", {"query": "frete"}),
+            _tool_call("c2", "get_olist_docs_context", {"query": "banners"}),
+        ]),
+        _completion(content=" Resposta final "),
+    )
+    session = SlowSession()
+
+    result = asyncio.run(answer_with_mcp("pergunta", session, client=client))
+
+    assert result == "Resposta final"
+    assert session.peak == 2
+
+    messages = client.chat.completions.create.call_args_list[1].kwargs["messages"]
+    assistant_turns = [m for m in messages if m["role"] == "assistant"]
+    tool_messages = [m for m in messages if m["role"] == "tool"]
+
+    assert len(assistant_turns) == 1
+    assert [tc["id"] for tc in assistant_turns[0]["tool_calls"]] == ["c1", "c2"]
+    assert [m["tool_call_id"] for m in tool_messages] == ["c1", "c2"]
+    assert tool_messages[1]["content"] == "get_olist_docs_context:banners"
+
+
+class _Stream:
+    """Stream falso da OpenAI (async iterável de chunks)."""
+
+    def __init__(self, deltas):
+        self._chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=d)]) for d in deltas]
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _delta(content=None, tool_calls=None) -> SimpleNamespace:
+    return SimpleNamespace(content=content, tool_calls=tool_calls)
+
+
+def _tool_call_delta(index, call_id=None, name=None, arguments=None) -> SimpleNamespace:
+    return SimpleNamespace(
+        index=index,
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+def test_stream_executa_tools_e_descarta_o_texto_da_rodada_com_tools():
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=[
+        _Stream([
+            _delta(content="Vou consultar a documentação."),
+            _delta(tool_calls=[_tool_call_delta(0, "c1", "get_olist_docs_context", '{"que')]),
+            _delta(tool_calls=[_tool_call_delta(0, arguments='ry": "frete"}')]),
+        ]),
+        _Stream([_delta(content="  Resposta"), _delta(content=" em partes")]),
+    ])
+    session = SlowSession()
+
+    async def collect():
+        return [part async for part in stream_answer_with_mcp("pergunta", session, client=client)]
+
+    parts = asyncio.run(collect())
+
+    assert parts == ["Vou consultar a documentação.", STREAM_RESET, "Resposta", " em partes"]
+    assert client.chat.completions.create.call_args_list[0].kwargs["stream"] is True
+
+    messages = client.chat.completions.create.call_args_list[1].kwargs["messages"]
+    assistant = next(m for m in messages if m["role"] == "assistant")
+    tool = next(m for m in messages if m["role"] == "tool")
+
+    assert assistant["content"] == "Vou consultar a documentação."
+    assert assistant["tool_calls"][0]["function"] == {
+        "name": "get_olist_docs_context", "arguments": '{"query": "frete"}'}
+    assert tool == {"role": "tool", "tool_call_id": "c1",
+                    "content": "get_olist_docs_context:frete"}
+
+
+def test_stream_repassa_a_resposta_final_em_varios_trechos():
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=[
+        _Stream([
+            _delta(tool_calls=[_tool_call_delta(0, "c1", "get_olist_docs_context", '{"query": "frete"}')]),
+            _delta(content="não repassado"),
+        ]),
+        _Stream([_delta(content=" "), _delta(content="Para"), _delta(content=" configurar"),
+                 _delta(content=" o frete")]),
+    ])
+
+    async def collect():
+        return [part async for part in stream_answer_with_mcp("pergunta", SlowSession(), client=client)]
+
+    parts = asyncio.run(collect())
+
+    # Sem tool call antes do texto: nada de reset, cada trecho sai assim que chega
+    assert parts == ["Para", " configurar", " o frete"]
+
+
+def test_erro_do_servidor_vira_texto_e_erro_de_transporte_e_repassado():
+    session = MagicMock()
+    session.call_tool = AsyncMock(side_effect=[
+        McpError(ErrorData(code=-32602, message="argumento inválido")),
+        ConnectionError("sessão caiu"),
+    ])
+
+    result = asyncio.run(call_mcp_tool(session, "get_olist_docs_context", {"query": "frete"}))
+
+    assert json.loads(result) == {"error": "argumento inválido"}
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(call_mcp_tool(session, "get_olist_docs_context", {"query": "frete"}))
@@ -0,0 +1,148 @@
+"""
+    Testes do pool de sessões MCP (reaproveitamento, health check e reconexão).
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+
+from orchestrator import mcp_pool
+from orchestrator.mcp_pool import McpSessionPool
+
+
+class FakeSession:
+    """ClientSession falsa: conta initialize/ping e pode falhar no ping ou na tool call."""
+
+    instances: list["FakeSession"] = []
+
+    def __init__(self, read_stream, write_stream):
+        self.initialized = 0
+        self.pings = 0
+        self.ping_fails = False
+        self.call_fails = False
+        FakeSession.instances.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def initialize(self):
+        self.initialized += 1
+
+    async def call_tool(self, name, arguments=None):
+        if self.call_fails:
+            raise ConnectionError("sessão caiu")
+        return f"{name}:{id(self)}"
+
+    async def send_ping(self):
+        self.pings += 1
+        if self.ping_fails:
+            raise ConnectionError("ping falhou")
+
+
+@asynccontextmanager
+async def fake_transport(url):
+    yield (None, None, lambda: None)
+
+
+@pytest.fixture(autouse=True)
+def fake_mcp():
+    FakeSession.instances = []
+    with (
+        patch.object(mcp_pool, "streamable_http_client", fake_transport),
+        patch.object(mcp_pool, "ClientSession", FakeSession),
+    ):
+        yield
+
+
+def test_sessoes_sao_reaproveitadas():
+    async def run():
+        pool = McpSessionPool("http://mcp", size=2)
+        await pool.start()
+
+        seen = []
+        for _ in range(5):
+            async with pool.acquire() as session:
+                seen.append(session._slot.session)
+
+        await pool.close()
+        return seen
+
+    seen = asyncio.run(run())
+
+    assert len(FakeSession.instances) == 2
+    assert set(map(id, seen)) <= set(map(id, FakeSession.instances))
+
+
+def test_erro_durante_uso_dispara_ping_e_reconecta_se_falhar():
+    async def run():
+        pool = McpSessionPool("http://mcp", size=1)
+        await pool.start()
+        first = FakeSession.instances[0]
+
+        with pytest.raises(RuntimeError):
+            async with pool.acquire():
+                raise RuntimeError("falha no uso")
+
+        first.ping_fails = True
+
+        async with pool.acquire() as session:
+            pass
+
+        stats = pool.stats()
+        await pool.close()
+        return first, session, stats
+
+    first, session, stats = asyncio.run(run())
+
+    assert first.pings == 1
+    assert session is not first
+    assert stats["reconnects"] == 1
+
+
+def test_concorrencia_limitada_ao_tamanho_do_pool():
+    async def run():
+        pool = McpSessionPool("http://mcp", size=2)
+        await pool.start()
+        active = 0
+        peak = 0
+
+        async def worker():
+            nonlocal active, peak
+            async with pool.acquire():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(worker() for _ in range(6)))
+        await pool.close()
+        return peak
+
+    assert asyncio.run(run()) == 2
+
+
+def test_tool_call_com_sessao_caida_reconecta_e_repete():
+    async def run():
+        pool = McpSessionPool("http://mcp", size=1)
+        await pool.start()
+        first = FakeSession.instances[0]
+        first.call_fails = True
+
+        async with pool.acquire() as session:
+            # Duas chamadas em paralelo veem a sessão cair: uma reconexão só
+            results = await asyncio.gather(
+                session.call_tool("a", arguments={}), session.call_tool("b", arguments={}))
+
+        stats = pool.stats()
+        await pool.close()
+        return first, results, stats
+
+    first, results, stats = asyncio.run(run())
+
+    [_, second] = FakeSession.instances
+    assert results == [f"a:{id(second)}", f"b:{id(second)}"]
+    assert stats["reconnects"] == 1
@@ -0,0 +1,53 @@
+"""
+    Testes do cliente OpenAI compartilhado (limites do pool e estatísticas).
+"""
+import asyncio
+
+import httpx
+
+from orchestrator import openai_client
+from orchestrator.openai_client import create_openai_client, openai_pool_stats
+
+
+def test_cliente_usa_limites_configurados(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-teste")
+    client = create_openai_client()
+
+    try:
+        assert isinstance(client._client, httpx.AsyncClient)
+        assert client._client.timeout.connect == openai_client.OPENAI_CONNECT_TIMEOUT
+        assert client._client._transport._pool._http2
+    finally:
+        asyncio.run(client.close())
+
+
+def test_stats_do_pool_sem_requisicoes(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-teste")
+    client = create_openai_client()
+
+    try:
+        stats = openai_pool_stats(client)
+    finally:
+        asyncio.run(client.close())
+
+    assert stats["max_connections"] == openai_client.OPENAI_MAX_CONNECTIONS
+    assert stats["requests_total"] == 0
+    assert stats["awaiting_response"] == 0
+    assert stats["http2_responses"] == 0
+    assert stats["connections"] == 0
+
+
+def test_stats_sem_o_pool_interno_ficam_so_com_os_contadores(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-teste")
+    client = create_openai_client()
+    transport = client._client._transport
+    client._client._transport = object()
+
+    try:
+        stats = openai_pool_stats(client)
+    finally:
+        client._client._transport = transport
+        asyncio.run(client.close())
+
+    assert stats["requests_total"] == 0
+    assert "connections" not in stats
@@ -0,0 +1,31 @@
+"""
+    Reconstrói o índice full-text da documentação (SQLite FTS5).
+    Uso: uv run python -m olist_docs_mcp_server.build_index [--output docs_index.db]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from olist_docs_mcp_server.tools.doc_index import DOC_INDEX_PATH, build_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Reconstrói o índice full-text da documentação developers.vnda.com.br")
+    parser.add_argument(
+        "--output", "-o",
+        type=Path,
+        default=DOC_INDEX_PATH,
+        help=f"Arquivo do índice (padrão: {DOC_INDEX_PATH}; ou DOC_INDEX_PATH)",
+    )
+    args = parser.parse_args()
+
+    total = build_index(args.output)
+
+    if total == 0:
+        print("[INDEX] Nenhuma página indexada.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
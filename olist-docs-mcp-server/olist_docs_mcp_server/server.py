@@ -2,8 +2,11 @@
     MCP Server: ponto de criação do FastMCP e registro das tools.
 """
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from olist_docs_mcp_server.tools import register_tools
+from olist_docs_mcp_server.tools.page_cache import get_page_cache_stats
 
 mcp = FastMCP(
     "Olist Docs",
@@ -11,3 +14,9 @@ mcp = FastMCP(
 )
 
 register_tools(mcp)
+
+
+@mcp.custom_route("/stats", methods=["GET"])
+async def stats(request: Request) -> JSONResponse:
+    """Contadores do cache de páginas (hits, misses, revalidações)."""
+    return JSONResponse({"page_cache": get_page_cache_stats()})
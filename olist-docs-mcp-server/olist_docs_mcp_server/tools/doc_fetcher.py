@@ -2,14 +2,19 @@
     Fetch e extração de texto do site developers.vnda.com.br.
     Funções auxiliares usadas pelas tools; sem lógica de MCP.
     Inclui crawler da navegação para descobrir páginas dinamicamente.
+    Páginas já extraídas ficam no page_cache e são revalidadas com GET condicional.
 """
+import os
 import re
+import threading
 import time
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
+from olist_docs_mcp_server.tools.page_cache import CachedPage, page_cache
+
 BASE_URL = "https://developers.vnda.com.br"
 
 # Página com sidebar completa
@@ -19,6 +24,13 @@ CRAWL_CACHE_TTL = 3600  # 1 hora em segundos
 _crawl_cache: list[dict[str, str]] | None = None
 _crawl_cache_time: float = 0
 
+# Sessão HTTP reaproveitada entre fetches (keep-alive com o mesmo host)
+_http = requests.Session()
+
+# Avisado (POST) quando a doc muda, ex.: POST /cache/invalidate do orquestrador
+DOCS_REFRESH_WEBHOOK_URL = os.getenv("DOCS_REFRESH_WEBHOOK_URL")
+DOCS_REFRESH_WEBHOOK_TOKEN = os.getenv("DOCS_REFRESH_WEBHOOK_TOKEN")
+
 # Fallback quando o crawler falha
 DOC_SECTIONS = [
     {"title": "Home", "url": "/", "category": "Geral"},
@@ -73,6 +85,35 @@ DOC_SECTIONS = [
 ]
 
 
+def notify_docs_refresh(reason: str, wait: bool = False) -> None:
+    """
+        Avisa DOCS_REFRESH_WEBHOOK_URL (se configurada) que a documentação mudou.
+        Roda em thread separada (wait=True envia na hora, ex.: no CLI que termina em seguida);
+        falhas são ignoradas (o cache do orquestrador também expira por TTL).
+    """
+
+    if not DOCS_REFRESH_WEBHOOK_URL:
+        return
+
+    headers = {"User-Agent": "OlistDocsMCP/1.0"}
+
+    if DOCS_REFRESH_WEBHOOK_TOKEN:
+        headers["X-Cache-Token"] = DOCS_REFRESH_WEBHOOK_TOKEN
+
+    def send() -> None:
+        try:
+            _http.post(DOCS_REFRESH_WEBHOOK_URL, json={
+                       "reason": reason}, headers=headers, timeout=5)
+
+        except Exception:
+            pass
+
+    if wait:
+        send()
+    else:
+        threading.Thread(target=send, daemon=True).start()
+
+
 def _crawl_docs_index(timeout: int = 15) -> list[dict[str, str]]:
     """
         Faz fetch da página de docs e extrai links do sidebar (href começando com /docs/).
@@ -83,8 +124,8 @@ def _crawl_docs_index(timeout: int = 15) -> list[dict[str, str]]:
     seen_paths: set[str] = set()
 
     try:
-        resp = requests.get(CRAWL_URL, timeout=timeout, headers={
-                            "User-Agent": "OlistDocsMCP/1.0"})
+        resp = _http.get(CRAWL_URL, timeout=timeout, headers={
+                         "User-Agent": "OlistDocsMCP/1.0"})
 
         resp.raise_for_status()
 
@@ -146,6 +187,9 @@ def get_doc_sections() -> list[dict[str, str]]:
     crawled = _crawl_docs_index()
 
     if crawled:
+        if _crawl_cache is not None and crawled != _crawl_cache:
+            notify_docs_refresh("sections")
+
         _crawl_cache = crawled
         _crawl_cache_time = now
         return crawled
@@ -154,20 +198,13 @@ def get_doc_sections() -> list[dict[str, str]]:
     return DOC_SECTIONS
 
 
-def fetch_page_text(url: str, timeout: int = 15) -> tuple[str, str]:
+def _extract_text(html: str) -> str:
     """
-        Faz GET na URL, extrai texto do HTML (conteúdo principal) e retorna (texto_limpo, url_final).
+        Extrai o texto do conteúdo principal do HTML.
         Usa seletores semânticos (main, article) para reduzir quebra se o layout mudar.
     """
 
-    full_url = url if url.startswith("http") else urljoin(BASE_URL, url)
-
-    resp = requests.get(full_url, timeout=timeout, headers={
-                        "User-Agent": "OlistDocsMCP/1.0"})
-
-    resp.raise_for_status()
-
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
 
     for tag in soup(["script", "style", "nav", "header", "footer"]):
         tag.decompose()
@@ -178,12 +215,57 @@ def fetch_page_text(url: str, timeout: int = 15) -> tuple[str, str]:
         parts = [soup.body] if soup.body else []
 
     if not parts:
-        return "", full_url
+        return ""
 
     text = "\n\n".join(p.get_text(separator="\n", strip=True)
                        for p in parts if p)
 
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+
+def fetch_page_text(url: str, timeout: int = 15) -> tuple[str, str]:
+    """
+        Faz GET na URL, extrai texto do HTML (conteúdo principal) e retorna (texto_limpo, url_final).
+        Entradas frescas do cache não tocam a rede; entradas expiradas são revalidadas com
+        If-None-Match / If-Modified-Since (304 reaproveita o texto sem novo parse).
+    """
+
+    full_url = url if url.startswith("http") else urljoin(BASE_URL, url)
+    cached = page_cache.get(full_url)
+
+    if cached is not None and cached.is_fresh(page_cache.ttl):
+        page_cache.record("hits")
+        return cached.text, cached.final_url
+
+    headers = {"User-Agent": "OlistDocsMCP/1.0"}
+
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    resp = _http.get(full_url, timeout=timeout, headers=headers)
+
+    if resp.status_code == 304 and cached is not None:
+        page_cache.record("revalidations")
+        page_cache.touch(full_url)
+        return cached.text, cached.final_url
+
+    resp.raise_for_status()
+    page_cache.record("misses")
+
+    text = _extract_text(resp.text)
+
+    if cached is not None and cached.text != text:
+        notify_docs_refresh("page")
+    page_cache.put(full_url, CachedPage(
+        text=text,
+        final_url=full_url,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+        fetched_at=time.time(),
+    ))
 
     return text, full_url
 
@@ -221,18 +303,12 @@ def _looks_like_code(paragraph: str) -> bool:
     return any(pat in first_line or pat in stripped[:200] for pat in _CODE_LIKE_PATTERNS)
 
 
-def relevant_sections(text: str, query: str, max_chars: int = 12000) -> str:
+def split_into_blocks(text: str) -> list[str]:
     """
-    Filtra trechos que contenham termos da query e limita tamanho.
-    Preserva blocos de código inteiros (evita retornar apenas import/export sem o corpo).
+    Divide o texto em blocos por parágrafo, agrupando parágrafos consecutivos
+    que parecem código (evita fragmentar blocos de código). Parágrafos curtos são descartados.
     """
 
-    query_lower = query.lower()
-    terms = [t.strip() for t in query_lower.split() if len(t.strip()) > 2]
-
-    if not terms:
-        return text[:max_chars] + ("..." if len(text) > max_chars else "")
-
     paragraphs = text.split("\n\n")
     # Agrupa parágrafos consecutivos que parecem código em blocos (evita fragmentar)
     blocks: list[str] = []
@@ -256,6 +332,22 @@ def relevant_sections(text: str, query: str, max_chars: int = 12000) -> str:
     if current_block:
         blocks.append("\n\n".join(current_block))
 
+    return blocks
+
+
+def relevant_sections(text: str, query: str, max_chars: int = 12000) -> str:
+    """
+    Filtra trechos que contenham termos da query e limita tamanho.
+    Preserva blocos de código inteiros (evita retornar apenas import/export sem o corpo).
+    """
+
+    query_lower = query.lower()
+    terms = [t.strip() for t in query_lower.split() if len(t.strip()) > 2]
+
+    if not terms:
+        return text[:max_chars] + ("..." if len(text) > max_chars else "")
+
+    blocks = split_into_blocks(text)
     scored = []
     for block in blocks:
         block_lower = block.lower()
@@ -0,0 +1,201 @@
+"""
+    Índice full-text (SQLite FTS5, ranking BM25) das páginas da doc developers.vnda.com.br.
+    Construído offline (python -m olist_docs_mcp_server.build_index) e consultado pela tool
+    get_olist_docs_context; sem o arquivo do índice a tool volta ao fetch ao vivo.
+"""
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urljoin
+
+from olist_docs_mcp_server.tools.doc_fetcher import (
+    BASE_URL,
+    DOC_SECTIONS,
+    fetch_page_text,
+    get_doc_sections,
+    notify_docs_refresh,
+    split_into_blocks,
+)
+
+DOC_INDEX_PATH = Path(os.getenv("DOC_INDEX_PATH", "docs_index.db"))
+
+# Pesos do BM25 por coluna (title, url, content): título pesa mais que o corpo
+_BM25_WEIGHTS = (4.0, 0.0, 1.0)
+# Quantidade de chunks lidos do índice antes de agrupar por página
+_CHUNK_LIMIT = 200
+
+
+def _collect_sections() -> list[dict[str, str]]:
+    """
+        Seções do crawler + lista estática (garante as páginas de tags mesmo se o crawler não as listar).
+    """
+
+    sections: list[dict[str, str]] = []
+    seen: set[str] = set()
+
+    for s in get_doc_sections() + DOC_SECTIONS:
+        url = s["url"].rstrip("/") or "/"
+
+        if url not in seen:
+            seen.add(url)
+            sections.append({**s, "url": url})
+
+    return sections
+
+
+def build_index(path: Path | None = None, workers: int = 8) -> int:
+    """
+        Busca todas as seções, divide em blocos (mesma regra de relevant_sections) e grava o índice.
+        Escreve em arquivo temporário e troca no final, para o server nunca ler um índice pela metade.
+        Retorna o número de chunks indexados.
+    """
+
+    path = Path(path or DOC_INDEX_PATH)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    sections = _collect_sections()
+
+    def fetch(section: dict[str, str]) -> tuple[dict[str, str], str]:
+        try:
+            text, _ = fetch_page_text(section["url"])
+            return section, text
+
+        except Exception as e:
+            print(f"[INDEX] Falha ao buscar {section['url']}: {e}")
+            return section, ""
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages = list(pool.map(fetch, sections))
+
+    conn = sqlite3.connect(tmp_path)
+    total = 0
+
+    try:
+        conn.execute("""
+          CREATE VIRTUAL TABLE chunks USING fts5(
+            title,
+            url UNINDEXED,
+            content,
+            tokenize = 'unicode61 remove_diacritics 2'
+          )
+        """)
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        for section, text in pages:
+            if not text.strip():
+                continue
+
+            blocks = split_into_blocks(text)
+            conn.executemany(
+                "INSERT INTO chunks (title, url, content) VALUES (?, ?, ?)",
+                [(section["title"], section["url"], block) for block in blocks],
+            )
+            total += len(blocks)
+
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('built_at', ?)", (str(time.time()),))
+        conn.commit()
+
+    finally:
+        conn.close()
+
+    if total == 0:
+        # Não sobrescreve um índice bom com um vazio (ex.: site fora do ar)
+        tmp_path.unlink(missing_ok=True)
+        return 0
+
+    os.replace(tmp_path, path)
+    notify_docs_refresh("index", wait=True)
+    print(f"[INDEX] {total} chunks de {len(sections)} páginas gravados em {path}")
+
+    return total
+
+
+def _match_expression(query: str) -> str | None:
+    """
+        Converte a query em expressão FTS5: termos (> 2 chars) entre aspas unidos por OR.
+    """
+
+    terms = [t.strip() for t in query.lower().split() if len(t.strip()) > 2]
+    terms = list(dict.fromkeys(terms))
+
+    if not terms:
+        return None
+
+    return " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def search_index(
+    query: str,
+    max_pages: int = 5,
+    *,
+    priority_urls: tuple[str, ...] = (),
+    max_chars: int = 12000,
+    path: Path | None = None,
+) -> list[dict[str, str]] | None:
+    """
+        Consulta o índice e devolve até max_pages páginas no formato da tool ({title, content, source}).
+        Os chunks de cada página vêm na ordem do BM25; páginas em priority_urls vêm primeiro.
+        Retorna None se o índice não existir (quem chama deve fazer o fetch ao vivo).
+    """
+
+    path = Path(path or DOC_INDEX_PATH)
+
+    if not path.exists():
+        return None
+
+    match = _match_expression(query)
+
+    if match is None:
+        return []
+
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+        try:
+            rows = conn.execute(
+                f"""
+                  SELECT title, url, content
+                  FROM chunks
+                  WHERE chunks MATCH ?
+                  ORDER BY bm25(chunks, {', '.join(map(str, _BM25_WEIGHTS))})
+                  LIMIT ?
+                """,
+                (match, _CHUNK_LIMIT),
+            ).fetchall()
+
+        finally:
+            conn.close()
+
+    except sqlite3.Error as e:
+        print(f"[INDEX] Erro ao consultar índice: {e}")
+        return None
+
+    # Agrupa por página mantendo a ordem do melhor chunk de cada uma
+    pages: dict[str, dict] = {}
+
+    for title, url, content in rows:
+        page = pages.setdefault(url, {"title": title, "chunks": [], "size": 0})
+
+        if page["size"] + len(content) > max_chars:
+            continue
+
+        page["chunks"].append(content)
+        page["size"] += len(content)
+
+    ordered = sorted(
+        ((url, page) for url, page in pages.items() if page["chunks"]),
+        key=lambda item: 0 if item[0] in priority_urls else 1,
+    )
+
+    return [
+        {
+            "title": page["title"],
+            "content": "\n\n".join(page["chunks"]),
+            "source": urljoin(BASE_URL, url),
+        }
+        for url, page in ordered[:max_pages]
+    ]
@@ -2,7 +2,10 @@
     Tools MCP de acesso à documentação developers.vnda.com.br.
     Apenas as funções das tools e o registro; lógica de fetch em doc_fetcher.
 """
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from urllib.parse import urljoin
 
@@ -12,6 +15,14 @@ from olist_docs_mcp_server.tools.doc_fetcher import (
     get_doc_sections,
     relevant_sections,
 )
+from olist_docs_mcp_server.tools.doc_index import search_index
+
+# Busca paralela das páginas: limite de threads e prazo total por chamada (segundos)
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "6"))
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "20"))
+
+_fetch_pool = ThreadPoolExecutor(
+    max_workers=FETCH_CONCURRENCY, thread_name_prefix="doc-fetch")
 
 # Padrão para extrair slugs de doc da query (ex.: load_banners em "{% load_banners %}")
 DOC_SLUG_PATTERN = re.compile(
@@ -65,49 +76,49 @@ def list_docs_sections() -> list[dict[str, Any]]:
     ]
 
 
-def get_olist_docs_context(query: str, max_pages: int = 5) -> list[dict[str, Any]]:
+def _fetch_snippet(url: str, query: str) -> tuple[str, str, str]:
     """
-        Busca contexto na documentação Olist para responder à pergunta.
-        Faz fetch direto ao site developers.vnda.com.br, extrai texto das páginas
-        relevantes e retorna snippets com URL de fonte. Resposta apenas com esse contexto.
-        (Equivalente ao Get Context do Context7.)
+        Busca a página e calcula o snippet relevante (roda nas threads do pool).
+        Retorna (texto, url_final, snippet).
     """
 
-    results = []
-    seen_urls = set()
+    text, full_url = fetch_page_text(url)
 
-    # 1) Se a query mencionar um slug de doc (ex.: load_banners, getparam), buscar essa página primeiro
-    for slug in _extract_doc_slugs(query):
-        doc_url = f"/docs/{slug}"
+    if not text.strip():
+        return text, full_url, ""
 
-        if doc_url in seen_urls:
-            continue
+    return text, full_url, relevant_sections(text, query)
 
-        try:
-            text, full_url = fetch_page_text(doc_url)
 
-            if text.strip():
-                snippet = relevant_sections(text, query)
+def get_olist_docs_context(query: str, max_pages: int = 5) -> list[dict[str, Any]]:
+    """
+        Busca contexto na documentação Olist para responder à pergunta.
+        Faz fetch direto ao site developers.vnda.com.br, extrai texto das páginas
+        relevantes e retorna snippets com URL de fonte. Resposta apenas com esse contexto.
+        (Equivalente ao Get Context do Context7.)
+        Usa o índice full-text quando disponível; senão (ou sem resultados) busca as páginas
+        ao vivo, em paralelo, mantendo a ordem do ranking.
+    """
 
-                if not snippet.strip():
-                    snippet = text[:12000] + \
-                        ("..." if len(text) > 12000 else "")
+    slugs = _extract_doc_slugs(query)
+    indexed = search_index(
+        query, max_pages, priority_urls=tuple(f"/docs/{slug}" for slug in slugs))
 
-                results.append({
-                    "title": slug,
-                    "content": snippet,
-                    "source": full_url,
-                })
+    if indexed:
+        return indexed
 
-                seen_urls.add(doc_url)
+    # 1) Se a query mencionar um slug de doc (ex.: load_banners, getparam), essas páginas vêm primeiro
+    candidates: list[tuple[str, str, bool]] = []  # (título, url, é slug)
+    seen_urls: set[str] = set()
 
-                if len(results) >= max_pages:
-                    return results
+    for slug in slugs:
+        doc_url = f"/docs/{slug}"
 
-        except Exception:
-            continue
+        if doc_url not in seen_urls:
+            seen_urls.add(doc_url)
+            candidates.append((slug, doc_url, True))
 
-    # 2) Buscar nas seções (crawler com fallback estático; scoring por título/URL)
+    # 2) Depois as seções (crawler com fallback estático; scoring por título/URL)
     sections = get_doc_sections()
     query_lower = query.lower()
     query_terms = [t for t in query_lower.split() if len(t.strip()) > 2]
@@ -130,38 +141,61 @@ def get_olist_docs_context(query: str, max_pages: int = 5) -> list[dict[str, Any
         to_fetch = sections[:max_pages]
 
     for section in to_fetch:
-        if len(results) >= max_pages:
-            break
+        if section["url"] not in seen_urls:
+            seen_urls.add(section["url"])
+            candidates.append((section["title"], section["url"], False))
 
-        url = section["url"]
+    # 3) Fan-out: dispara todas as buscas e consome na ordem do ranking até max_pages
+    results = []
+    deadline = time.monotonic() + FETCH_DEADLINE
+    futures = [_fetch_pool.submit(_fetch_snippet, url, query)
+               for _, url, _ in candidates]
 
-        if url in seen_urls:
-            continue
+    try:
+        for (title, _, is_slug), future in zip(candidates, futures):
+            if len(results) >= max_pages:
+                break
 
-        try:
-            text, full_url = fetch_page_text(url)
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                break
+
+            try:
+                text, full_url, snippet = future.result(timeout=remaining)
+
+            except Exception:
+                continue
 
             if not text.strip():
                 continue
 
-            snippet = relevant_sections(text, query)
+            if not snippet.strip():
+                if not is_slug:
+                    continue
 
-            if snippet.strip():
-                results.append({
-                    "title": section["title"],
-                    "content": snippet,
-                    "source": full_url,
-                })
-                seen_urls.add(url)
+                snippet = text[:12000] + ("..." if len(text) > 12000 else "")
 
-        except Exception:
-            continue
+            results.append({
+                "title": title,
+                "content": snippet,
+                "source": full_url,
+            })
+
+    finally:
+        # Cancela as buscas que ainda não começaram. As que já estão rodando não são
+        # interrompidas: terminam em segundo plano (até o timeout do fetch) ocupando o pool
+        for future in futures:
+            future.cancel()
+
+    remaining = deadline - time.monotonic()
 
-    if not results and sections:
+    # Fallback só dentro do prazo, e limitado ao que resta dele
+    if not results and sections and remaining > 0:
         s = sections[0]
 
         try:
-            text, full_url = fetch_page_text(s["url"])
+            text, full_url = fetch_page_text(s["url"], timeout=min(15, remaining))
 
             if text.strip():
                 results.append(
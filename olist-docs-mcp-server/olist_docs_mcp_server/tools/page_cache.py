@@ -0,0 +1,144 @@
+"""
+    Cache de páginas da doc (texto já extraído) com TTL e despejo LRU.
+    Fica em memória e, opcionalmente, persiste em SQLite (PAGE_CACHE_DB_PATH) para sobreviver a restarts.
+    Guarda ETag/Last-Modified para revalidar com GET condicional quando a entrada expira.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+PAGE_CACHE_TTL = int(os.getenv("PAGE_CACHE_TTL", "3600"))  # 1 hora em segundos
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "256"))
+PAGE_CACHE_DB_PATH = os.getenv("PAGE_CACHE_DB_PATH") or None
+
+
+@dataclass
+class CachedPage:
+    """
+        Página em cache: texto extraído, URL final e validadores HTTP.
+    """
+
+    text: str
+    final_url: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl: int) -> bool:
+        return (time.time() - self.fetched_at) < ttl
+
+
+class PageCache:
+    """
+        Cache LRU limitado por número de entradas. Thread-safe (as tools podem buscar páginas em paralelo).
+    """
+
+    def __init__(self, max_entries: int, ttl: int, db_path: str | None = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self.stats = {"hits": 0, "misses": 0, "revalidations": 0, "evictions": 0}
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("""
+              CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                final_url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+              )
+            """)
+            self._db.commit()
+
+    def get(self, url: str) -> CachedPage | None:
+        """
+            Retorna a entrada (fresca ou expirada) ou None. Consulta o SQLite se não estiver em memória.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT text, final_url, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            entry = CachedPage(*row)
+            self._put_locked(url, entry)
+            return entry
+
+    def put(self, url: str, entry: CachedPage) -> None:
+        with self._lock:
+            self._put_locked(url, entry)
+
+            if self._db is not None:
+                self._db.execute(
+                    """INSERT OR REPLACE INTO pages
+                       (url, text, final_url, etag, last_modified, fetched_at)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    (url, entry.text, entry.final_url, entry.etag,
+                     entry.last_modified, entry.fetched_at),
+                )
+                self._db.commit()
+
+    def touch(self, url: str) -> None:
+        """
+            Marca a entrada como revalidada (resposta 304): renova fetched_at.
+        """
+        entry = self.get(url)
+
+        if entry is not None:
+            entry.fetched_at = time.time()
+            self.put(url, entry)
+
+    def record(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+            if self._db is not None:
+                self._db.execute("DELETE FROM pages")
+                self._db.commit()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "max_entries": self.max_entries}
+
+    def _put_locked(self, url: str, entry: CachedPage) -> None:
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+
+page_cache = PageCache(PAGE_CACHE_MAX_ENTRIES, PAGE_CACHE_TTL, PAGE_CACHE_DB_PATH)
+
+
+def get_page_cache_stats() -> dict[str, int]:
+    """
+        Contadores do cache de páginas (hits, misses, revalidations, evictions, entries).
+    """
+    return page_cache.snapshot()
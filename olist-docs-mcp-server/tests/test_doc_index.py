@@ -0,0 +1,98 @@
+"""
+    Testes do índice full-text: build_index (troca atômica do arquivo) e search_index
+    (ranking BM25, prioridade de slugs, índice ausente, vazio ou inválido).
+"""
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from olist_docs_mcp_server.tools import doc_index
+from olist_docs_mcp_server.tools.doc_index import build_index, search_index
+
+PAGES = {
+    "/docs/load_banners": "Use a tag load_banners para carregar os banners da loja.\n\n"
+                          "Os banners podem ser filtrados por posição e por data.",
+    "/docs/frete": "Cálculo de frete na página de produto usando o CEP do cliente.\n\n"
+                   "O retorno traz prazo e valor para cada forma de entrega e banners promocionais.",
+}
+SECTIONS = [
+    {"title": "load_banners", "url": "/docs/load_banners", "category": "Tags"},
+    {"title": "Cálculo de frete", "url": "/docs/frete", "category": "Docs"},
+]
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """Seções fixas, páginas simuladas e aviso de mudança capturado."""
+    pages = dict(PAGES)
+    notify = MagicMock()
+    monkeypatch.setattr(doc_index, "_collect_sections", lambda: SECTIONS)
+    monkeypatch.setattr(doc_index, "fetch_page_text", lambda url: (pages[url], url))
+    monkeypatch.setattr(doc_index, "notify_docs_refresh", notify)
+    return pages, notify
+
+
+@pytest.fixture
+def index(site, tmp_path):
+    path = tmp_path / "docs_index.db"
+    assert build_index(path, workers=2) > 0
+    return path
+
+
+def test_build_grava_o_indice_e_avisa(site, index):
+    _, notify = site
+
+    with sqlite3.connect(index) as conn:
+        urls = {row[0] for row in conn.execute("SELECT url FROM chunks")}
+
+    assert urls == {"/docs/load_banners", "/docs/frete"}
+    assert not index.with_name(index.name + ".tmp").exists()
+    notify.assert_called_once_with("index", wait=True)
+
+
+def test_build_sem_paginas_mantem_o_indice_anterior(site, index):
+    pages, _ = site
+    before = index.read_bytes()
+
+    for url in pages:
+        pages[url] = ""
+
+    assert build_index(index) == 0
+    assert index.read_bytes() == before
+    assert not index.with_name(index.name + ".tmp").exists()
+
+
+def test_titulo_pesa_mais_no_ranking(index):
+    results = search_index("banners", path=index)
+
+    # As duas páginas citam banners; a que tem o termo no título vem primeiro
+    assert [r["source"] for r in results] == [
+        "https://developers.vnda.com.br/docs/load_banners",
+        "https://developers.vnda.com.br/docs/frete",
+    ]
+    assert "load_banners" in results[0]["content"]
+
+
+def test_slug_da_query_vem_primeiro(index):
+    results = search_index("banners", path=index, priority_urls=("/docs/frete",))
+
+    assert results[0]["title"] == "Cálculo de frete"
+
+
+def test_limites_de_paginas_e_de_tamanho(index):
+    assert len(search_index("banners", max_pages=1, path=index)) == 1
+
+    results = search_index("banners", max_chars=70, path=index)
+    assert all(len(r["content"]) <= 70 for r in results)
+
+
+def test_indice_ausente_vazio_ou_invalido(index, tmp_path):
+    assert search_index("banners", path=tmp_path / "nao_existe.db") is None
+    # Só termos curtos: nada a buscar
+    assert search_index("de o", path=index) == []
+    assert search_index("inexistente", path=index) == []
+
+    broken = tmp_path / "broken.db"
+    broken.write_bytes(b"isto nao e sqlite")
+    assert search_index("banners", path=broken) is None
@@ -0,0 +1,122 @@
+"""
+    Testes do fan-out de get_olist_docs_context: ordem do ranking, prazo total,
+    cancelamento das buscas restantes e resultados parciais (fetcher simulado).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from olist_docs_mcp_server.tools import olist_docs
+
+SECTIONS = [
+    {"title": f"Página {i}", "url": f"/docs/pagina-{i}", "category": "Docs"}
+    for i in range(6)
+]
+
+
+@pytest.fixture
+def docs(monkeypatch):
+    """Sem índice, seções fixas e um pool próprio; fetch_page_text de fallback simulado."""
+    pool = ThreadPoolExecutor(max_workers=6)
+    monkeypatch.setattr(olist_docs, "search_index", lambda *args, **kwargs: None)
+    monkeypatch.setattr(olist_docs, "get_doc_sections", lambda: SECTIONS)
+    monkeypatch.setattr(olist_docs, "fetch_page_text", lambda url, timeout=15: ("", url))
+    monkeypatch.setattr(olist_docs, "_fetch_pool", pool)
+    yield monkeypatch
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _stub_fetch(monkeypatch, behaviours, release=None):
+    """behaviours[url] -> segundos de espera, exceção a lançar ou None (resposta imediata)."""
+    calls = []
+
+    def fetch(url, query):
+        calls.append(url)
+        behaviour = behaviours.get(url)
+
+        if isinstance(behaviour, Exception):
+            raise behaviour
+
+        if behaviour:
+            release.wait(behaviour)
+
+        return f"texto {url}", f"https://developers.vnda.com.br{url}", f"trecho {url}"
+
+    monkeypatch.setattr(olist_docs, "_fetch_snippet", fetch)
+    return calls
+
+
+def test_mantem_a_ordem_do_ranking_mesmo_com_buscas_fora_de_ordem(docs):
+    release = threading.Event()
+    # A primeira página termina por último; o resultado continua na ordem do ranking
+    _stub_fetch(docs, {"/docs/pagina-0": 0.1}, release)
+
+    results = olist_docs.get_olist_docs_context("pagina", max_pages=3)
+
+    assert [r["title"] for r in results] == ["Página 0", "Página 1", "Página 2"]
+
+
+def test_prazo_estourado_devolve_o_que_chegou(docs):
+    release = threading.Event()
+    docs.setattr(olist_docs, "FETCH_DEADLINE", 0.2)
+    _stub_fetch(docs, {"/docs/pagina-1": 5}, release)
+
+    started = time.monotonic()
+    results = olist_docs.get_olist_docs_context("pagina", max_pages=3)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    # Página 1 não chegou no prazo: fica só o que veio antes dela, sem esperar os 5 s
+    assert elapsed < 1
+    assert [r["title"] for r in results] == ["Página 0"]
+
+
+def test_fallback_nao_roda_com_o_prazo_estourado(docs):
+    release = threading.Event()
+    fallback = []
+    docs.setattr(olist_docs, "FETCH_DEADLINE", 0.2)
+    docs.setattr(olist_docs, "fetch_page_text",
+                 lambda url, timeout=15: fallback.append(timeout) or ("texto", url))
+    _stub_fetch(docs, {s["url"]: 5 for s in SECTIONS}, release)
+
+    results = olist_docs.get_olist_docs_context("pagina", max_pages=3)
+    release.set()
+
+    assert results == []
+    assert fallback == []
+
+
+def test_fallback_usa_o_que_resta_do_prazo(docs):
+    fallback = []
+    docs.setattr(olist_docs, "FETCH_DEADLINE", 2)
+    docs.setattr(olist_docs, "fetch_page_text",
+                 lambda url, timeout=15: fallback.append(timeout) or ("texto", url))
+    _stub_fetch(docs, {s["url"]: RuntimeError("fora do ar") for s in SECTIONS})
+
+    results = olist_docs.get_olist_docs_context("pagina", max_pages=3)
+
+    assert [r["title"] for r in results] == ["Página 0"]
+    assert 0 < fallback[0] <= 2
+
+
+def test_falhas_sao_puladas(docs):
+    _stub_fetch(docs, {"/docs/pagina-0": RuntimeError("timeout"), "/docs/pagina-2": OSError("reset")})
+
+    results = olist_docs.get_olist_docs_context("pagina", max_pages=3)
+
+    assert [r["title"] for r in results] == ["Página 1", "Página 3", "Página 4"]
+
+
+def test_buscas_que_nao_comecaram_sao_canceladas(docs):
+    release = threading.Event()
+    docs.setattr(olist_docs, "_fetch_pool", ThreadPoolExecutor(max_workers=1))
+    calls = _stub_fetch(docs, {url: 0.05 for url in (s["url"] for s in SECTIONS)}, release)
+
+    results = olist_docs.get_olist_docs_context("pagina", max_pages=3)
+    olist_docs._fetch_pool.shutdown(wait=True)
+
+    # 6 candidatas; max_pages atingido na terceira: no máximo a que já estava rodando ainda executa
+    assert [r["title"] for r in results] == ["Página 0", "Página 1", "Página 2"]
+    assert len(calls) <= 4
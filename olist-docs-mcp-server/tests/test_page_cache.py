@@ -0,0 +1,118 @@
+"""
+    Testes do cache de páginas (LRU, TTL, SQLite) e da revalidação condicional em fetch_page_text.
+"""
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from olist_docs_mcp_server.tools import doc_fetcher
+from olist_docs_mcp_server.tools.page_cache import CachedPage, PageCache
+
+URL = f"{doc_fetcher.BASE_URL}/docs/load_banners"
+HTML = "<html><body><main><p>Use load_banners para listar os banners.</p></main></body></html>"
+
+
+def _page(text="texto", fetched_at=None, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT"):
+    return CachedPage(text=text, final_url=URL, etag=etag, last_modified=last_modified,
+                      fetched_at=time.time() if fetched_at is None else fetched_at)
+
+
+def _response(status_code=200, text=HTML, headers=None):
+    resp = SimpleNamespace(status_code=status_code, text=text, headers=headers or {})
+    resp.raise_for_status = MagicMock()
+    return resp
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PageCache(max_entries=10, ttl=60)
+    monkeypatch.setattr(doc_fetcher, "page_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def http(monkeypatch):
+    http = MagicMock()
+    monkeypatch.setattr(doc_fetcher, "_http", http)
+    return http
+
+
+@pytest.fixture
+def notify(monkeypatch):
+    notify = MagicMock()
+    monkeypatch.setattr(doc_fetcher, "notify_docs_refresh", notify)
+    return notify
+
+
+def test_despeja_a_menos_usada_quando_passa_do_limite():
+    cache = PageCache(max_entries=2, ttl=60)
+    cache.put("a", _page("A"))
+    cache.put("b", _page("B"))
+    cache.get("a")
+    cache.put("c", _page("C"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").text == "A"
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_entrada_expira_pelo_ttl():
+    assert _page().is_fresh(60)
+    assert not _page(fetched_at=time.time() - 61).is_fresh(60)
+
+
+def test_sqlite_sobrevive_a_outra_instancia(tmp_path):
+    db_path = str(tmp_path / "pages.db")
+    PageCache(max_entries=10, ttl=60, db_path=db_path).put(URL, _page("persistida"))
+
+    restored = PageCache(max_entries=10, ttl=60, db_path=db_path).get(URL)
+
+    assert restored.text == "persistida"
+    assert restored.etag == '"v1"'
+
+
+def test_entrada_fresca_nao_vai_a_rede(cache, http):
+    cache.put(URL, _page("em cache"))
+
+    assert doc_fetcher.fetch_page_text(URL) == ("em cache", URL)
+    http.get.assert_not_called()
+    assert cache.stats["hits"] == 1
+
+
+def test_expirada_com_304_reaproveita_o_texto_e_renova(cache, http, notify):
+    cache.put(URL, _page("em cache", fetched_at=time.time() - 120))
+    http.get.return_value = _response(status_code=304, text="")
+
+    assert doc_fetcher.fetch_page_text(URL) == ("em cache", URL)
+
+    headers = http.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.stats["revalidations"] == 1
+    assert cache.get(URL).is_fresh(cache.ttl)
+    notify.assert_not_called()
+
+
+def test_expirada_com_conteudo_novo_regrava_e_avisa(cache, http, notify):
+    cache.put(URL, _page("texto antigo", fetched_at=time.time() - 120))
+    http.get.return_value = _response(headers={"ETag": '"v2"'})
+
+    text, _ = doc_fetcher.fetch_page_text(URL)
+
+    assert text == "Use load_banners para listar os banners."
+    assert cache.get(URL).etag == '"v2"'
+    assert cache.stats["misses"] == 1
+    notify.assert_called_once_with("page")
+
+
+def test_pagina_nova_sem_validadores_nao_manda_condicional(cache, http, notify):
+    http.get.return_value = _response()
+
+    doc_fetcher.fetch_page_text("/docs/load_banners")
+
+    headers = http.get.call_args.kwargs["headers"]
+    assert "If-None-Match" not in headers and "If-Modified-Since" not in headers
+    assert cache.get(URL) is not None
+    notify.assert_not_called()